@@ -0,0 +1,4 @@
+import sys
+from shipGame.cli import main
+
+sys.exit(main())
@@ -1,20 +1,47 @@
+import os
 import sys
-from pkg_resources import resource_filename
-from shipGame.utils import (deconstructShipLocation, formatShipLocationOutput, formatShipLocationInput,
-                            formatMoveCommandInput, formatShootCommandInput, isMoveCommand, isShootCommand)
+from shipGame.board import Board, SparseBoard
+from shipGame.moves import compileMoves
+from shipGame.utils import (deconstructShipLocation, formatShipLocationOutput, tokenizeShipLocations,
+                            tokenizeCommand, isMoveCommand, isShootCommand)
 
 
 class ShipGame(object):
 
-    def __init__(self, filename):
+    def __init__(self, filename=None, stream=False, boardClass=SparseBoard, instrumentation=None, mapped=False,
+                 lines=None, binary=False):
         """
         Initialises the object by creating the compass mapping and parsing the data in the input file
         and assigning it to the relevant variables.
+        In streaming mode the input file is read lazily, and each operation is only parsed when
+        calculateGame reaches it, so operation logs of any length run in constant memory.
+        In mapped mode the input file is memory-mapped and tokenized in place, and the file name is
+        used as given rather than looked up inside the package.
+        Instead of a file name, the lines of an input file can be given directly as 'lines'.
+        In binary mode the input file is in the packed format of shipGame.binary, and is always read whole.
+        The board is a SparseBoard by default, or any other Board subclass such as ArrayBoard.
+        Passing an Instrumentation records timings from the start, including parsing.
         """
+        self.boardClass = boardClass
+        self.methodLayers = []
+        self.instrumentation = None
+        self.timeline = None
+        if instrumentation is not None:
+            self.enableInstrumentation(instrumentation)
         self.sunkenShips = []
         self.compassMapping = ['N', 'E', 'S', 'W']
-        inputFileContents = self.parseInputFile(filename)
-        self.gameInformation = self.assignGameParameters(inputFileContents)
+        if lines is not None:
+            self.gameInformation = self.assignGameParameters(lines, stream)
+        elif binary:
+            self.gameInformation = self.readBinaryFile(filename)
+        elif mapped:
+            self.gameInformation = self.mapInputFile(filename, stream)
+        else:
+            if stream:
+                inputFileContents = self.streamInputFile(filename)
+            else:
+                inputFileContents = self.parseInputFile(filename)
+            self.gameInformation = self.assignGameParameters(inputFileContents, stream)
 
         try:
             self.board = self.initialiseBoard(self.gameInformation['boardSize'])
@@ -22,18 +49,112 @@ class ShipGame(object):
         except KeyError:
             sys.exit('Initialisation failed. Data missing from input file.')
 
+    def shadowMethods(self, owner, wrappers):
+        """
+        Shadows methods on this game instance on behalf of 'owner', given as a dictionary of method names to
+        functions that take the method being wrapped and return its replacement. Wrappers from several owners
+        stack in the order they were added, each wrapping what the owners before it left in place.
+        """
+        self.methodLayers.append((owner, wrappers))
+        self.rebuildMethods(wrappers)
+
+    def unshadowMethods(self, owner):
+        """
+        Removes the wrappers added by 'owner', keeping every other owner's wrappers in place.
+        """
+        names = set()
+        for layerOwner, wrappers in self.methodLayers:
+            if layerOwner is owner:
+                names.update(wrappers)
+        self.methodLayers = [(layerOwner, wrappers) for layerOwner, wrappers in self.methodLayers
+                             if layerOwner is not owner]
+        self.rebuildMethods(names)
+
+    def rebuildMethods(self, names):
+        for name in names:
+            method = getattr(type(self), name).__get__(self)
+            layers = [wrappers[name] for owner, wrappers in self.methodLayers if name in wrappers]
+            if not layers:
+                self.__dict__.pop(name, None)
+                continue
+            for wrap in layers:
+                method = wrap(method)
+            setattr(self, name, method)
+
+    def enableInstrumentation(self, instrumentation=None):
+        """
+        Starts recording phase timers and operation statistics for this game, into a new
+        Instrumentation unless one is given, and returns it.
+        """
+        from shipGame.instrumentation import Instrumentation
+        self.disableInstrumentation()
+        self.instrumentation = instrumentation or Instrumentation()
+        self.instrumentation.attach(self)
+        return self.instrumentation
+
+    def disableInstrumentation(self):
+        """
+        Stops recording statistics, so the game runs without any instrumentation overhead.
+        Returns the Instrumentation that was in use, if any.
+        """
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            instrumentation.detach(self)
+        self.instrumentation = None
+        return instrumentation
+
+    def enableTimeline(self, timeline=None):
+        """
+        Starts recording every move and shot from the current state onwards, into a new Timeline
+        unless one is given, so that stateAt can rebuild the board after any of them. Returns the Timeline.
+        """
+        from shipGame.timeline import Timeline
+        self.disableTimeline()
+        self.timeline = timeline or Timeline()
+        self.timeline.attach(self)
+        return self.timeline
+
+    def disableTimeline(self):
+        """
+        Stops recording operations. Returns the Timeline that was in use, if any, which can still be queried.
+        """
+        timeline = self.timeline
+        if timeline is not None:
+            timeline.detach(self)
+        self.timeline = None
+        return timeline
+
+    def stateAt(self, operation):
+        """
+        Returns a new board and the sunken ships as they were after 'operation' recorded operations.
+        Example input: 2
+        Example output: (SparseBoard with {(1, 3): 'N'}, [((9, 2), 'E')])
+        """
+        if self.timeline is None:
+            raise ValueError('No timeline is being recorded. Call enableTimeline first.')
+        return self.timeline.stateAt(operation)
+
     def initialiseBoard(self, size):
         """
         Creates a game board of square 'size' x 'size', where 'size' is a positive integer.
         Each cell can be empty, or occupied by a ship. This is denoted by a 0 integer value for empty,
         or one of N, E, S, W string values to specify the orientation for a ship in an occupied cell.
+        The board is created with the game's board class, which by default only stores occupied cells.
         """
+        return self.boardClass(size)
 
-        board = {}
-        for row in range(size):
-            for column in range(size):
-                board[(row, column)] = 0
-        return board
+    @property
+    def board(self):
+        return self._board
+
+    @board.setter
+    def board(self, board):
+        """
+        Accepts either a Board or a dense dictionary of cells, which is converted to the game's board class.
+        """
+        if not isinstance(board, Board):
+            board = self.boardClass.fromMapping(board)
+        self._board = board
 
     def initialiseShipLocations(self, shipLocations):
         """
@@ -57,88 +178,33 @@ class ShipGame(object):
         Example input: (0, 0), MRMLMM
         Example result portion (if initial direction 'N'): {(0, 0): 0, (6, 5): 0, (1, 3): 'N', (9, 2): 0}
         Working with the assumption that the bottom-left cell is the origin (0, 0).
+        The move operations are compiled into a single net displacement and rotation, which is cached.
+        Returns True if the move was applied, or False if it was rejected because the destination is occupied.
         """
 
         if not moveCommands:
             raise TypeError("No move operations given.")
 
-        for moveOperation in moveCommands:
-            if moveOperation not in 'MRL':
-                raise ValueError("Invalid move operations. Must be in 'MRL'. %s was given." % moveOperation)
-
-        def getDirection(shipLocation):
-            """
-            Takes a two integer tuple coordinate and returns a string compass direction.
-            Example input: (1, 2)
-            Example output: 'N'
-            """
-            return self.board[shipLocation]
-
-        def changeDirection(initialDirection, directionToTurn):
-            """
-            Takes an initial string compass direction, and a string of L or R to denote
-            which direction to turn, and returns the new string compass direction.
-            Example input: 'N', 'L'
-            Example output: 'W'
-            """
-
-            direction = self.compassMapping.index(initialDirection)
-
-            if directionToTurn == 'R':
-                if direction != 3:
-                    direction += 1
-
-                elif direction == 3:
-                    direction = 0
-
-            elif directionToTurn == 'L':
-                if direction != 0:
-                    direction -= 1
-
-                elif direction == 0:
-                    direction = 3
-
-            return self.compassMapping[direction]
-
-        def move(initialCoordinates, direction):
-            """
-            Takes an initial two integer tuple coordinate, and a string compass direction, and
-            returns a new two integer coordinate.
-            Example input: (1, 2) 'N'
-            Example output: (1, 3)
-            """
-            x, y = initialCoordinates
-
-            if direction == 'N':
-                y += 1
-            elif direction == 'E':
-                x += 1
-            elif direction == 'S':
-                y -= 1
-            elif direction == 'W':
-                x -= 1
-
-            return (x, y)
-
-        direction = getDirection(shipLocation)
+        invalidMoveOperations = moveCommands.strip('MRL')
+        if invalidMoveOperations:
+            raise ValueError("Invalid move operations. Must be in 'MRL'. %s was given." % invalidMoveOperations[0])
+
+        direction = self.board[shipLocation]
 
         if direction == 0:
             raise ValueError("Attempting to move a ship that does not exist.")
 
-        location = shipLocation
-        initialLocation = shipLocation
+        x, y = shipLocation
+        xDisplacement, yDisplacement, direction, moved = compileMoves(direction, moveCommands)
+        location = (x + xDisplacement, y + yDisplacement)
 
-        for moveCommand in moveCommands:
-            if moveCommand == 'M':
-                location = move(location, direction)
-            elif moveCommand in ('L', 'R'):
-                direction = changeDirection(direction, moveCommand)
-
-        if 'M' not in moveCommands:
+        if not moved:
             self.board[location] = direction
         elif self.board[location] == 0:
-            self.board[initialLocation] = 0
-            self.board[location] = direction
+            self.board.relocate(shipLocation, location, direction)
+        else:
+            return False
+        return True
 
     def shootShip(self, shipLocation):
         """
@@ -151,6 +217,29 @@ class ShipGame(object):
             self.sunkenShips.append((shipLocation, self.board[shipLocation]))
             self.board[shipLocation] = 0
 
+    def shootShips(self, shipLocations):
+        """
+        Takes an iterable or array of two integer coordinates and shoots at all of them in one batched pass.
+        Ships are sunk and added to the sunken ships in the order they are hit, and a cell shot more than once
+        only sinks the ship that was there before the volley, exactly as repeated shootShip calls would.
+        If any coordinate is off the board a KeyError is raised and no ship is sunk.
+        Example input: [(9, 2), (4, 4), (9, 2)]
+        Example result: [((9, 2), 'N')]
+        """
+        self.sunkenShips.extend(self.board.sinkCells(shipLocations))
+
+    def resolveFilename(self, fileName):
+        """
+        Returns the path of a file, where relative names are found inside the shipGame package
+        and absolute paths are used as they are.
+        Example input: 'input.txt'
+        Example output: '/path/to/shipGame/input.txt'
+        """
+        if os.path.isabs(fileName):
+            return fileName
+        from pkg_resources import resource_filename
+        return resource_filename('shipGame', fileName)
+
     def parseInputFile(self, fileName):
         """
         Reads the contents of a text file and returns a list of strings representing the lines
@@ -158,97 +247,152 @@ class ShipGame(object):
         Example input: 'input.txt'
         Example output: ['10', '(0, 0, N) (9, 2, E)', '(0, 0) MRMLMM', '(9, 2)']
         """
-        file = resource_filename('shipGame', fileName)
+        file = self.resolveFilename(fileName)
         contents = open(file).read()
         return contents.splitlines()
 
-    def assignGameParameters(self, parameters):
+    def streamInputFile(self, fileName):
+        """
+        Lazily reads a text file, yielding one string per line in the file.
+        Example input: 'input.txt'
+        Example output: '10', '(0, 0, N) (9, 2, E)', '(0, 0) MRMLMM', '(9, 2)'
+        """
+        file = self.resolveFilename(fileName)
+        with open(file) as contents:
+            for line in contents:
+                yield line.rstrip('\r\n')
+
+    def mapInputFile(self, fileName, stream=False):
+        """
+        Memory-maps a text file and returns a dictionary of the game parameters, tokenizing directly over
+        the mapped bytes so that no copy of the file or its lines is made. The file name is used as given.
+        Example input: '/data/games/input.txt'
+        Example output: {'boardSize': 10,
+                         'shipLocations': [((0, 0), 'N'), ((9, 2), 'E')],
+                         'movingAndShootingCommands': [((0, 0), 'MRMLMM'), (9, 2)]}
+        """
+        from shipGame.ingest import readMappedInput
+        return readMappedInput(fileName, stream)
+
+    def readBinaryFile(self, fileName):
+        """
+        Reads a game file in the binary format of shipGame.binary and returns a dictionary of the game parameters.
+        Example input: 'input.shpg'
+        Example output: {'boardSize': 10,
+                         'shipLocations': [((0, 0), 'N'), ((9, 2), 'E')],
+                         'movingAndShootingCommands': [((0, 0), 'MRMLMM'), (9, 2)]}
+        """
+        from shipGame.binary import readBinaryInput
+        return readBinaryInput(self.resolveFilename(fileName))
+
+    def assignGameParameters(self, parameters, stream=False):
         """
         Returns a dictionary containing the game parameters from the contents of a text file.
+        When streaming, the moving and shooting commands are a generator that parses each
+        remaining line as it is consumed.
         Example input: ['10', '(0, 0, N) (9, 2, E)', '(0, 0) MRMLMM', '(9, 2)']
         Example output: {'boardSize': 10,
-                         'shipLocations': [(('0', '0'), 'N'),
-                                           (('9', '2'), 'E')],
+                         'shipLocations': [((0, 0), 'N'),
+                                           ((9, 2), 'E')],
                          'movingAndShootingCommands': [((0, 0), 'MRMLMM'),
                                                        (9, 2)]}
         """
 
-        def parseShipLocations(shipLocationsString):
-            """
-            Parses a string of ship locations and formats it into a list of tuples each
-            containing a two integer tuple location and string direction.
-            Example input: "(0, 0, N) (9, 2, E)"
-            Example output: [(('0', '0'), 'N'), (('9', '2'), 'E')]
-            """
-            return [(formatShipLocationInput(location)) for location in shipLocationsString.split(') (')]
-
-        def parseMoveOrShoot(commandString):
-            """
-            Parses a string of either a move or a shoot command and fomats it into a tuple
-            containing the relevant information.
-            Example input for move: '(0, 0) MRMLMM'
-            Example output for move: ((0, 0), 'MRMLMM')
-            Example input for shoot: '(9, 2)'
-            Example output for shoot: (9, 2)
-            """
-            if isMoveCommand(commandString):
-                coordinates, direction = formatMoveCommandInput(commandString)
-                return((coordinates, direction))
-
-            elif isShootCommand(commandString):
-                coordinates = formatShootCommandInput(commandString)
-                return((coordinates))
-
         gameInformation = {}
-        movingAndShootingCommands = []
+        parameters = iter(parameters)
 
         for index, parameter in enumerate(parameters):
             if index == 0:
                 gameInformation['boardSize'] = int(parameter)
             elif index == 1:
-                gameInformation['shipLocations'] = parseShipLocations(parameter)
-            else:
-                movingAndShootingCommands.append(parseMoveOrShoot(parameter))
+                gameInformation['shipLocations'] = tokenizeShipLocations(parameter)
+                break
+
+        if stream:
+            gameInformation['movingAndShootingCommands'] = (tokenizeCommand(parameter) for parameter in parameters)
+            return gameInformation
+
+        movingAndShootingCommands = [tokenizeCommand(parameter) for parameter in parameters]
 
         if movingAndShootingCommands:
             gameInformation['movingAndShootingCommands'] = movingAndShootingCommands
 
         return gameInformation
 
-    def writeOutput(self):
+    def optimiseCommands(self):
+        """
+        Simplifies the moving and shooting commands against the initialised board before calculateGame runs
+        them, without changing the output, and returns a report of the operations removed.
+        A streamed operation log is read into a list, as the pass needs to revisit earlier operations.
+        Example result portion: [((0, 0), 'MRLM'), (5, 5)] -> [((0, 0), 'MM')]
+        Example output: {'operations': 2, 'remainingOperations': 1, 'removedOperations': 1, ...}
+        """
+        from shipGame.optimiser import optimiseCommands
+        commands = list(self.gameInformation.get('movingAndShootingCommands', ()))
+        optimisedCommands, report = optimiseCommands(commands, self.board.occupiedCells(), self.board.inBounds)
+        if optimisedCommands:
+            self.gameInformation['movingAndShootingCommands'] = optimisedCommands
+        return report
+
+    def outputLines(self, sortedOutput=False):
+        """
+        Returns the existing ships' locations and directions followed by the sunken ships', one string per ship.
+        Existing ships come from the board's index of occupied cells, so this costs O(ships log ships) rather
+        than O(board area), and are listed row by row, as a walk over every cell would list them, whatever
+        the board backend. Sunken ships are listed in the order they sank, or with 'sortedOutput' by coordinates.
+        Example input portion: {(7, 3): 0, (6, 9): 0, (9, 6): 'W', (7, 9): 'N'}
+                               [((9, 2), 'E'), ((0, 0), 'N')]
+        Example output: ['(7, 9, N)', '(9, 6, W)', '(9, 2, E) SUNK', '(0, 0, N) SUNK']
+        """
+        ships = sorted(self.board.occupiedCells())
+        sunkenShips = self.sunkenShips
+
+        if sortedOutput:
+            sunkenShips = sorted(sunkenShips)
+
+        lines = [formatShipLocationOutput(coordinates, direction) for coordinates, direction in ships]
+        lines.extend(formatShipLocationOutput(coordinates, direction) + ' SUNK' for coordinates, direction in sunkenShips)
+        return lines
+
+    def writeOutput(self, fileName='output.txt', sortedOutput=False):
         """
-        Writes a list of existing and sunken ship's locations and directions to a text file.
+        Writes a list of existing and sunken ship's locations and directions to a text file,
+        in a single buffered write.
         Example input portion: {(7, 3): 0, (6, 9): 0, (9, 6): 'W', (7, 9): 'N'}
                                [((0, 0), 'N'), ((9, 2), 'E')]
         Example result: ['(7, 9, N)', '(9, 6, W)', '(0, 0, N) SUNK', '(9, 2, E) SUNK']
         """
-        file = resource_filename('shipGame', 'output.txt')
-        output = open(file, 'w')
+        file = self.resolveFilename(fileName)
+        lines = self.outputLines(sortedOutput)
 
-        for key, value in self.board.items():
-            if value != 0:
-                string = formatShipLocationOutput(key, value)
-                output.write(string)
+        with open(file, 'w') as output:
+            if lines:
+                output.write('\n'.join(lines))
                 output.write('\n')
 
-        for ship in self.sunkenShips:
-            string = formatShipLocationOutput(ship[0], ship[1]) + ' SUNK'
-            output.write(string)
-            output.write('\n')
-
-    def calculateGame(self):
+    def calculateGame(self, commands=None):
         """
         Runs through the move and shoot commands to alter the board based
-        on their contents.
+        on their contents. The commands can be a list or a lazily parsed stream,
+        and default to the ones read from the input file. A command that is neither
+        a move nor a shot raises a ValueError.
         """
-        if not self.gameInformation['movingAndShootingCommands']:
-            raise TypeError('No commands to calculate')
+        if commands is None:
+            commands = self.gameInformation['movingAndShootingCommands']
 
-        for command in self.gameInformation['movingAndShootingCommands']:
+        calculated = False
+
+        for command in commands:
+            calculated = True
             if isMoveCommand(command):
                 self.moveShip(command[0], command[1])
             elif isShootCommand(command):
                 self.shootShip(command)
+            else:
+                raise ValueError("Invalid command. %s was given." % (command,))
+
+        if not calculated:
+            raise TypeError('No commands to calculate')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,174 @@
+"""
+Simulates many independent game files across a pool of worker processes, writing each
+result next to its input.
+Run with: python -m shipGame.batch games/ --workers 8
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from shipGame.app import ShipGame
+from shipGame.board import SparseBoard
+
+OUTPUT_SUFFIX = '.output.txt'
+WORKER_CACHES = {}
+
+
+def findInputFiles(pattern):
+    """
+    Returns the sorted game input files in a directory, or matching a glob pattern,
+    leaving out any previously written output files.
+    Example input: 'games/'
+    Example output: ['games/001.txt', 'games/002.txt']
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '*.txt')
+    return sorted(path for path in glob.glob(pattern) if not path.endswith(OUTPUT_SUFFIX))
+
+
+def outputFilename(inputFilename):
+    """
+    Returns the file a game's result is written to, next to its input.
+    Example input: 'games/001.txt'
+    Example output: 'games/001.output.txt'
+    """
+    return os.path.splitext(inputFilename)[0] + OUTPUT_SUFFIX
+
+
+def workerCache(directory, maxBytes=None, maxAge=None):
+    """
+    Returns this process's ResultCache for a cache directory, so a worker keeps one running total of
+    the cache's size across every game it runs rather than rescanning the directory for each.
+    """
+    from shipGame.cache import MAX_BYTES, ResultCache
+    key = (directory, maxBytes, maxAge)
+    if key not in WORKER_CACHES:
+        WORKER_CACHES[key] = ResultCache(directory, MAX_BYTES if maxBytes is None else maxBytes, maxAge)
+    return WORKER_CACHES[key]
+
+
+def runGame(inputFilename, stream=False, mapped=False, cacheDirectory=None, cacheMaxBytes=None, cacheMaxAge=None):
+    """
+    Calculates a single game and writes its output. Returns the input file name, None on success or
+    a description of the error on failure, and whether the output came from the cache.
+    With a 'cacheDirectory', an output already cached there for the same input is copied instead, and
+    the cache is limited to 'cacheMaxBytes' and entries unused for 'cacheMaxAge' seconds when given.
+    Whether the output came from the cache is None when the cache was not looked up.
+    Example input: 'games/001.txt'
+    Example output: ('games/001.txt', None, None)
+    """
+    def calculate():
+        game = ShipGame(os.path.abspath(inputFilename), stream, mapped=mapped)
+        game.calculateGame()
+        return game
+
+    def outputLines():
+        return calculate().outputLines()
+
+    cache = None
+    try:
+        if cacheDirectory is None:
+            calculate().writeOutput(os.path.abspath(outputFilename(inputFilename)))
+        else:
+            from shipGame.cache import outputVariant, writeCachedOutput
+            cache = workerCache(cacheDirectory, cacheMaxBytes, cacheMaxAge)
+            hits, misses = cache.hits, cache.misses
+            writeCachedOutput(cache, inputFilename, outputFilename(inputFilename), outputLines,
+                              outputVariant(SparseBoard))
+        error = None
+    except (Exception, SystemExit) as exception:
+        error = '%s: %s' % (type(exception).__name__, exception)
+
+    cached = None
+    if cache is not None and (cache.hits, cache.misses) != (hits, misses):
+        cached = cache.hits > hits
+    return inputFilename, error, cached
+
+
+def runGameWithResults(inputFilename, **options):
+    """
+    Runs a game as runGame does, and on success also returns its final ships and sunken ships.
+    Example input: 'games/001.txt'
+    Example output: ('games/001.txt', None, None, ([((1, 3), 'N')], [((9, 2), 'E')]))
+    """
+    from shipGame.results import readOutputFile
+    inputFilename, error, cached = runGame(inputFilename, **options)
+    if error is not None:
+        return inputFilename, error, cached, None
+    return inputFilename, None, cached, readOutputFile(outputFilename(inputFilename))
+
+
+def runBatch(inputFilenames, workers=None, stream=False, chunksize=16, mapped=False, cacheDirectory=None,
+             resultsFilename=None, cacheMaxBytes=None, cacheMaxAge=None):
+    """
+    Calculates every game across a pool of 'workers' processes (one per core by default).
+    A failing game does not stop the batch. Returns a list of (input file name, error) failures, and the
+    number of cache hits and misses, which are both 0 without a 'cacheDirectory'.
+    With a 'resultsFilename', every successful game's final state is also stored in that SQLite database.
+    Example output: ([('games/003.txt', 'SystemExit: ...')], {'hits': 2, 'misses': 1})
+    """
+    failures = []
+    cacheStatistics = {'hits': 0, 'misses': 0}
+    options = {'stream': stream, 'mapped': mapped, 'cacheDirectory': cacheDirectory,
+               'cacheMaxBytes': cacheMaxBytes, 'cacheMaxAge': cacheMaxAge}
+
+    def collect(inputFilename, error, cached):
+        if error is not None:
+            failures.append((inputFilename, error))
+        if cached is not None:
+            cacheStatistics['hits' if cached else 'misses'] += 1
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if resultsFilename is None:
+            for result in executor.map(partial(runGame, **options), inputFilenames, chunksize=chunksize):
+                collect(*result)
+            return failures, cacheStatistics
+
+        from shipGame.results import ResultStore
+        with ResultStore(resultsFilename) as store:
+            for inputFilename, error, cached, state in executor.map(partial(runGameWithResults, **options),
+                                                                    inputFilenames, chunksize=chunksize):
+                collect(inputFilename, error, cached)
+                if error is None:
+                    store.add(inputFilename, *state)
+    return failures, cacheStatistics
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Calculate many ship games in parallel.')
+    parser.add_argument('inputs', help='a directory of game files, or a glob pattern matching them')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes (default: one per core)')
+    parser.add_argument('--stream', action='store_true', help='read each game file lazily')
+    parser.add_argument('--mapped', action='store_true', help='memory-map each game file')
+    parser.add_argument('--chunksize', type=int, default=16, help='games sent to a worker at a time')
+    parser.add_argument('--cache', metavar='DIRECTORY', help='reuse outputs of identical games cached in this directory')
+    parser.add_argument('--cache-max-bytes', type=int, metavar='BYTES', help='evict cached outputs beyond this size')
+    parser.add_argument('--cache-max-age', type=float, metavar='SECONDS',
+                        help='evict cached outputs unused for this long')
+    parser.add_argument('--results', metavar='DATABASE', help='also store every final state in this SQLite database')
+    arguments = parser.parse_args(arguments)
+
+    inputFilenames = findInputFiles(arguments.inputs)
+    start = time.perf_counter()
+    failures, cacheStatistics = runBatch(inputFilenames, arguments.workers, arguments.stream, arguments.chunksize,
+                                         arguments.mapped, arguments.cache, arguments.results,
+                                         arguments.cache_max_bytes, arguments.cache_max_age)
+    elapsed = time.perf_counter() - start
+
+    for inputFilename, error in failures:
+        print('FAILED %s: %s' % (inputFilename, error), file=sys.stderr)
+
+    gamesPerSecond = len(inputFilenames) / elapsed if elapsed else 0.0
+    summary = '%d games (%d failed) in %.2fs: %.1f games/s' % (len(inputFilenames), len(failures), elapsed,
+                                                               gamesPerSecond)
+    if arguments.cache:
+        summary += ', cache hits: %(hits)d, misses: %(misses)d' % cacheStatistics
+    print(summary)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Load generator for the game service. Each client creates a generated game and replays its
+operations one request at a time, recording the round trip latency of every request.
+Run with: python -m shipGame.benchmarks.latency --clients 4 --operations 10000
+     or, against a running service: python -m shipGame.benchmarks.latency --port 7878
+"""
+import argparse
+import asyncio
+import time
+from shipGame.generator import generateGame
+from shipGame.service import GameService, startServer
+
+
+async def runClient(clientNumber, host, port, unixPath, boardSize, shipCount, operationCount, seed):
+    """
+    Creates one game and replays its generated operations, returning the latency of each request in seconds.
+    """
+    if unixPath is not None:
+        reader, writer = await asyncio.open_unix_connection(unixPath)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+
+    lines = generateGame(boardSize, shipCount, operationCount, seed=seed + clientNumber)
+    gameName = 'load%d' % clientNumber
+    requests = ['CREATE %s %s %s' % (gameName, lines[0], lines[1])]
+    for line in lines[2:]:
+        requests.append(('MOVE %s %s' if ' ' in line.split(')', 1)[1] else 'SHOOT %s %s') % (gameName, line))
+
+    latencies = []
+    for request in requests:
+        start = time.perf_counter()
+        writer.write((request + '\n').encode())
+        response = await reader.readline()
+        latencies.append(time.perf_counter() - start)
+        if response.startswith(b'ERROR'):
+            raise RuntimeError('%s failed: %s' % (request, response.decode().strip()))
+
+    writer.write(('DROP %s\n' % gameName).encode())
+    await reader.readline()
+    writer.close()
+    return latencies
+
+
+def percentile(sortedValues, fraction):
+    """
+    Returns the value at 'fraction' (between 0 and 1) of a sorted list, by nearest rank.
+    Example input: [1, 2, 3, 4], 0.5
+    Example output: 2
+    """
+    index = max(0, min(len(sortedValues) - 1, int(round(fraction * len(sortedValues))) - 1))
+    return sortedValues[index]
+
+
+async def runLoad(clients, host, port, unixPath, boardSize, shipCount, operationCount, seed):
+    """
+    Runs 'clients' concurrent clients, starting an in-process service first unless a port or Unix path
+    is given. Returns the sorted latencies of every request and the total elapsed time in seconds.
+    """
+    server = None
+    if port is None and unixPath is None:
+        server = await startServer(GameService(), host, 0)
+        port = server.sockets[0].getsockname()[1]
+
+    start = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(runClient(clientNumber, host, port, unixPath, boardSize, shipCount,
+                                                   operationCount, seed) for clientNumber in range(clients)))
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+    elapsed = time.perf_counter() - start
+
+    return sorted(latency for latencies in results for latency in latencies), elapsed
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Measure game service request latency.')
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--size', type=int, default=1000, help='board size of each game')
+    parser.add_argument('--ships', type=int, default=100, help='ships in each game')
+    parser.add_argument('--operations', type=int, default=10000, help='operations sent by each client')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, help='connect to a running service on this port')
+    parser.add_argument('--unix', help='connect to a running service on this Unix socket')
+    arguments = parser.parse_args(arguments)
+
+    latencies, elapsed = asyncio.run(runLoad(arguments.clients, arguments.host, arguments.port, arguments.unix,
+                                             arguments.size, arguments.ships, arguments.operations, arguments.seed))
+
+    print('%d requests in %.2fs: %.0f requests/s' % (len(latencies), elapsed, len(latencies) / elapsed))
+    print('p50 %.3f ms  p99 %.3f ms  max %.3f ms' % (percentile(latencies, 0.5) * 1000,
+                                                     percentile(latencies, 0.99) * 1000, latencies[-1] * 1000))
+
+
+if __name__ == '__main__':
+    main()
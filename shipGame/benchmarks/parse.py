@@ -0,0 +1,78 @@
+"""
+Measures parse throughput of the single-pass tokenizer against the original
+strip-and-index parsers it replaced.
+Run with: python -m shipGame.benchmarks.parse
+"""
+import random
+import time
+from shipGame.utils import removeStringCharacters, tokenizeCommand, tokenizeShipLocations
+
+
+def legacyParseShipLocations(shipLocationsString):
+    """
+    The original ship list parser, which splits on ') (' and strips each location.
+    Only correct for single digit coordinates.
+    """
+    locations = []
+    for location in shipLocationsString.split(') ('):
+        stripped = removeStringCharacters(location)
+        locations.append(((int(stripped[0]), int(stripped[1])), stripped[2]))
+    return locations
+
+
+def legacyParseCommand(commandString):
+    """
+    The original move or shoot parser, which classifies by splitting and then strips the line.
+    Only correct for single digit coordinates.
+    """
+    parts = len(commandString.split())
+    stripped = removeStringCharacters(commandString)
+    if parts == 3:
+        return (int(stripped[0]), int(stripped[1])), stripped[2:]
+    elif parts == 2:
+        return int(stripped[0]), int(stripped[1])
+
+
+def generateLines(count, seed=0):
+    """
+    Returns a seeded list of single digit move and shoot command strings, so both parsers agree.
+    Example output: ['(3, 7) MRMLMM', '(9, 2)']
+    """
+    generator = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        coordinates = '(%d, %d)' % (generator.randrange(10), generator.randrange(10))
+        if generator.random() < 0.5:
+            moves = ''.join(generator.choice('MRL') for _ in range(generator.randint(1, 12)))
+            lines.append(coordinates + ' ' + moves)
+        else:
+            lines.append(coordinates)
+    return lines
+
+
+def measure(parser, lines):
+    """
+    Returns the number of lines per second the parser handles.
+    """
+    start = time.perf_counter()
+    for line in lines:
+        parser(line)
+    return len(lines) / (time.perf_counter() - start)
+
+
+def main(count=200000):
+    lines = generateLines(count)
+    assert [legacyParseCommand(line) for line in lines] == [tokenizeCommand(line) for line in lines]
+
+    shipLine = ' '.join('(%d, %d, %s)' % (index % 10, index // 10 % 10, 'NESW'[index % 4]) for index in range(1000))
+    shipLines = [shipLine] * (count // 1000)
+
+    results = [('commands', measure(legacyParseCommand, lines), measure(tokenizeCommand, lines)),
+               ('ship lists', measure(legacyParseShipLocations, shipLines), measure(tokenizeShipLocations, shipLines))]
+
+    for name, legacy, tokenizer in results:
+        print('%-10s legacy: %12.0f lines/s  tokenizer: %12.0f lines/s  (%.2fx)' % (name, legacy, tokenizer, tokenizer / legacy))
+
+
+if __name__ == '__main__':
+    main()
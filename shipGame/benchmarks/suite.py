@@ -0,0 +1,179 @@
+"""
+Benchmarks the parse, init, calculate and write phases of ShipGame on generated games at several
+scales, recording operations per second and peak memory for each phase.
+Also measures process startup time for a bare interpreter, importing shipGame.app and running the CLI.
+Run with: python -m shipGame.benchmarks.suite --save baseline.json
+     and: python -m shipGame.benchmarks.suite --compare baseline.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from shipGame.app import ShipGame
+from shipGame.generator import writeGame
+
+SCALES = {
+    'small': {'boardSize': 100, 'shipCount': 100, 'operationCount': 10000},
+    'medium': {'boardSize': 10000, 'shipCount': 10000, 'operationCount': 100000},
+    'large': {'boardSize': 1000000, 'shipCount': 100000, 'operationCount': 1000000},
+}
+PHASES = ('parse', 'init', 'calculateGame', 'writeOutput')
+
+
+def runPhases(inputFilename, outputFilename):
+    """
+    Yields each phase of a game in order, as the phase name, a function running it and the
+    number of items it handles (lines, ships, operations or output lines). Each phase must be run
+    before the next one is requested.
+    """
+    game = ShipGame(inputFilename)
+    lines = game.parseInputFile(inputFilename)
+    information = game.assignGameParameters(lines)
+
+    def parse():
+        game.gameInformation = game.assignGameParameters(game.parseInputFile(inputFilename))
+
+    def init():
+        game.board = game.initialiseBoard(information['boardSize'])
+        game.initialiseShipLocations(information['shipLocations'])
+
+    def calculate():
+        game.calculateGame()
+
+    def write():
+        game.writeOutput(outputFilename)
+
+    yield 'parse', parse, len(lines)
+    game.board = game.initialiseBoard(0)
+    yield 'init', init, len(information['shipLocations'])
+    yield 'calculateGame', calculate, len(information.get('movingAndShootingCommands', ()))
+    yield 'writeOutput', write, len(game.sunkenShips) + sum(1 for _ in game.board.occupiedCells())
+
+
+def measure(inputFilename, outputFilename):
+    """
+    Returns {phase: {'opsPerSecond': ..., 'peakMemory': ...}} for one game. Each phase is timed without
+    tracing, then run again on a fresh game under tracemalloc to record its peak allocation in bytes.
+    """
+    results = {}
+    for phase, run, items in runPhases(inputFilename, outputFilename):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        results[phase] = {'opsPerSecond': items / elapsed if elapsed else float('inf')}
+
+    tracemalloc.start()
+    try:
+        for phase, run, items in runPhases(inputFilename, outputFilename):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            run()
+            results[phase]['peakMemory'] = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+    return results
+
+
+def runSuite(scales, seed=0, directory=None):
+    """
+    Generates a game for each named scale and returns {scale: {phase: measurements}}.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory(dir=directory) as workingDirectory:
+        for scale in scales:
+            inputFilename = os.path.join(workingDirectory, scale + '.txt')
+            outputFilename = os.path.join(workingDirectory, scale + '.output.txt')
+            writeGame(inputFilename, seed=seed, **SCALES[scale])
+            results[scale] = measure(inputFilename, outputFilename)
+    return results
+
+
+def measureStartup(runs=10):
+    """
+    Returns {command: {'opsPerSecond': ..., 'seconds': ...}} giving the median wall time of starting a bare
+    interpreter, importing shipGame.app, and running the CLI on the bundled input, over 'runs' fresh processes.
+    """
+    packageDirectory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment = dict(os.environ, PYTHONPATH=os.path.dirname(packageDirectory))
+    commands = {'interpreter': [sys.executable, '-c', 'pass'],
+                'import': [sys.executable, '-c', 'import shipGame.app'],
+                'cli': [sys.executable, '-m', 'shipGame', os.path.join(packageDirectory, 'input.txt'), '-o', os.devnull]}
+
+    results = {}
+    for name, command in commands.items():
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(command, env=environment, check=True)
+            timings.append(time.perf_counter() - start)
+        seconds = statistics.median(timings)
+        results[name] = {'opsPerSecond': 1 / seconds, 'seconds': seconds}
+    return results
+
+
+def compareResults(results, baseline, tolerance=0.2):
+    """
+    Returns a list of regression descriptions where a phase is more than 'tolerance' slower,
+    or uses more than 'tolerance' more peak memory, than the baseline.
+    Example output: ['medium calculateGame: 81234 ops/s is below baseline 120000 ops/s']
+    """
+    regressions = []
+    for scale, phases in results.items():
+        for phase, measurements in phases.items():
+            expected = baseline.get(scale, {}).get(phase)
+            if expected is None:
+                continue
+            if measurements['opsPerSecond'] < expected['opsPerSecond'] * (1 - tolerance):
+                regressions.append('%s %s: %.0f ops/s is below baseline %.0f ops/s'
+                                   % (scale, phase, measurements['opsPerSecond'], expected['opsPerSecond']))
+            if 'peakMemory' in measurements and measurements['peakMemory'] > expected['peakMemory'] * (1 + tolerance):
+                regressions.append('%s %s: %d bytes peak memory is above baseline %d bytes'
+                                   % (scale, phase, measurements['peakMemory'], expected['peakMemory']))
+    return regressions
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Benchmark the phases of ShipGame.')
+    parser.add_argument('--scales', nargs='+', choices=sorted(SCALES), default=['small', 'medium'])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', help='write the results to this JSON file as a baseline')
+    parser.add_argument('--compare', help='compare the results against this baseline JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed fractional regression')
+    parser.add_argument('--startup-runs', type=int, default=10, help='processes started per startup measurement')
+    arguments = parser.parse_args(arguments)
+
+    results = runSuite(arguments.scales, arguments.seed)
+    if arguments.startup_runs:
+        results['startup'] = measureStartup(arguments.startup_runs)
+
+    for scale, phases in results.items():
+        for phase, measurements in phases.items():
+            if 'peakMemory' in measurements:
+                print('%-7s %-14s %14.0f ops/s %14d bytes peak'
+                      % (scale, phase, measurements['opsPerSecond'], measurements['peakMemory']))
+            else:
+                print('%-7s %-14s %14.0f ops/s %14.1f ms' % (scale, phase, measurements['opsPerSecond'],
+                                                              measurements['seconds'] * 1000))
+
+    if arguments.save:
+        with open(arguments.save, 'w') as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+
+    if arguments.compare:
+        with open(arguments.compare) as baselineFile:
+            regressions = compareResults(results, json.load(baselineFile), arguments.tolerance)
+        for regression in regressions:
+            print('REGRESSION ' + regression, file=sys.stderr)
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
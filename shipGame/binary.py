@@ -0,0 +1,221 @@
+"""
+A compact binary operation log format, with converters to and from the text input format.
+
+All integers are little-endian. The file is a fixed header followed by columns:
+
+    magic 'SHPG', version (u8), coordinate type (u8), move length type (u8),
+    board size, ship count, operation count, move step count (u32 each)
+    ship x, ship y (coordinate type each), ship directions (one ASCII byte each)
+    operation kinds (u8 each: 0 shoot, 1 move; 2 marked an unparseable line in older files and is rejected)
+    operation x, operation y (coordinate type each)
+    move lengths (move length type, one per move)
+    move steps, packed four to a byte, two bits each (M 0, R 1, L 2), lowest bits first
+
+The coordinate and move length types are array typecodes ('B', 'H' or 'I'), chosen as the smallest
+that fits. As every column is read with a single array.frombytes call and the move steps are
+unpacked through a lookup table, loading needs no per-character parsing.
+Run with: python -m shipGame.binary to-binary input.txt input.shpg
+      or: python -m shipGame.binary to-text input.shpg input.txt
+"""
+import argparse
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from shipGame.utils import isMoveCommand, isShootCommand, tokenizeCommand, tokenizeShipLocations
+
+MAGIC = b'SHPG'
+VERSION = 1
+HEADER = struct.Struct('<4sBBBIIII')
+SHOOT, MOVE, UNPARSEABLE = 0, 1, 2
+STEP_CODES = {'M': 0, 'R': 1, 'L': 2}
+STEPS = 'MRL?'
+UNPACKED_STEPS = [STEPS[byte & 3] + STEPS[byte >> 2 & 3] + STEPS[byte >> 4 & 3] + STEPS[byte >> 6]
+                  for byte in range(256)]
+
+
+def smallestTypecode(largest):
+    """
+    Returns the smallest unsigned array typecode that holds 'largest'.
+    Example input: 300
+    Example output: 'H'
+    """
+    for typecode in ('B', 'H', 'I'):
+        if largest < 1 << 8 * array(typecode).itemsize:
+            return typecode
+    raise ValueError('%d is too large to store.' % largest)
+
+
+def littleEndian(column):
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column.tobytes()
+
+
+def encodeGame(gameInformation):
+    """
+    Returns the binary encoding of a game, given as a dictionary of game parameters. Raises a ValueError
+    for a game without ship locations, which ShipGame cannot initialise, as the format always stores them.
+    Example input: {'boardSize': 10, 'shipLocations': [((0, 0), 'N'), ((9, 2), 'E')],
+                    'movingAndShootingCommands': [((0, 0), 'MRMLMM'), (9, 2)]}
+    Example output: b'SHPG\\x01BB\\x01\\n\\x00\\x00\\x00\\x02\\x00...'
+    """
+    if 'shipLocations' not in gameInformation:
+        raise ValueError('Initialisation failed. Data missing from input file.')
+    shipLocations = gameInformation['shipLocations']
+    commands = gameInformation.get('movingAndShootingCommands', [])
+
+    kinds = array('B')
+    xs = [x for (x, y), direction in shipLocations]
+    ys = [y for (x, y), direction in shipLocations]
+    lengths = []
+    steps = []
+    for command in commands:
+        if isMoveCommand(command):
+            (x, y), moveCommands = command
+            try:
+                steps.extend(STEP_CODES[step] for step in moveCommands)
+            except KeyError:
+                raise ValueError("Move operations must be in 'MRL' to be stored. %s was given." % moveCommands)
+            kinds.append(MOVE)
+            lengths.append(len(moveCommands))
+        elif isShootCommand(command):
+            x, y = command
+            kinds.append(SHOOT)
+        else:
+            raise ValueError("Invalid command. %s was given." % (command,))
+        xs.append(x)
+        ys.append(y)
+
+    steps.extend([0] * (-len(steps) % 4))
+    packedSteps = bytes(steps[index] | steps[index + 1] << 2 | steps[index + 2] << 4 | steps[index + 3] << 6
+                        for index in range(0, len(steps), 4))
+
+    coordinateType = smallestTypecode(max(xs + ys, default=0))
+    lengthType = smallestTypecode(max(lengths, default=0))
+    shipCount = len(shipLocations)
+
+    return b''.join([HEADER.pack(MAGIC, VERSION, ord(coordinateType), ord(lengthType), gameInformation['boardSize'],
+                                 shipCount, len(kinds), sum(lengths)),
+                     littleEndian(array(coordinateType, xs[:shipCount])),
+                     littleEndian(array(coordinateType, ys[:shipCount])),
+                     ''.join(direction for coordinates, direction in shipLocations).encode('ascii'),
+                     kinds.tobytes(),
+                     littleEndian(array(coordinateType, xs[shipCount:])),
+                     littleEndian(array(coordinateType, ys[shipCount:])),
+                     littleEndian(array(lengthType, lengths)),
+                     packedSteps])
+
+
+def decodeGame(data):
+    """
+    Returns the dictionary of game parameters stored in binary encoded 'data', in the same form as
+    ShipGame.assignGameParameters.
+    Example input: b'SHPG\\x01BB\\x01\\n\\x00\\x00\\x00\\x02\\x00...'
+    Example output: {'boardSize': 10, 'shipLocations': [((0, 0), 'N'), ((9, 2), 'E')],
+                     'movingAndShootingCommands': [((0, 0), 'MRMLMM'), (9, 2)]}
+    """
+    data = memoryview(data)
+    magic, version, coordinateType, lengthType, boardSize, shipCount, operationCount, stepCount = \
+        HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Not a version %d binary game.' % VERSION)
+    offset = HEADER.size
+
+    def column(typecode, count):
+        nonlocal offset
+        values = array(typecode)
+        end = offset + count * values.itemsize
+        if end > len(data):
+            raise ValueError('Binary game is truncated.')
+        values.frombytes(data[offset:end])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        offset = end
+        return values
+
+    coordinateType, lengthType = chr(coordinateType), chr(lengthType)
+    shipXs, shipYs = column(coordinateType, shipCount), column(coordinateType, shipCount)
+    directions = column('B', shipCount).tobytes().decode('ascii')
+    kinds = column('B', operationCount)
+    xs, ys = column(coordinateType, operationCount), column(coordinateType, operationCount)
+    lengths = column(lengthType, kinds.count(MOVE))
+    steps = ''.join(map(UNPACKED_STEPS.__getitem__, column('B', (stepCount + 3) // 4)))
+
+    gameInformation = {'boardSize': boardSize, 'shipLocations': list(zip(zip(shipXs, shipYs), directions))}
+
+    if operationCount:
+        ends = iter(accumulate(lengths))
+        start = 0
+        commands = []
+        for kind, x, y in zip(kinds, xs, ys):
+            if kind == SHOOT:
+                commands.append((x, y))
+            elif kind == MOVE:
+                end = next(ends)
+                commands.append(((x, y), steps[start:end]))
+                start = end
+            else:
+                raise ValueError('Binary game has an unparseable operation.')
+        gameInformation['movingAndShootingCommands'] = commands
+
+    return gameInformation
+
+
+def readBinaryInput(fileName):
+    """
+    Reads a binary game file and returns its dictionary of game parameters.
+    Example input: '/data/games/input.shpg'
+    Example output: {'boardSize': 10, 'shipLocations': [((0, 0), 'N'), ((9, 2), 'E')],
+                     'movingAndShootingCommands': [((0, 0), 'MRMLMM'), (9, 2)]}
+    """
+    with open(fileName, 'rb') as inputFile:
+        return decodeGame(inputFile.read())
+
+
+def textToBinary(inputFileName, outputFileName):
+    """
+    Converts a text input file to a binary game file. Raises a ValueError if a line cannot be parsed,
+    or if there is no ship line, so that a game ShipGame would not load is never converted.
+    """
+    with open(inputFileName) as inputFile:
+        gameInformation = {'boardSize': int(inputFile.readline())}
+        shipLine = inputFile.readline()
+        if shipLine:
+            gameInformation['shipLocations'] = tokenizeShipLocations(shipLine)
+        gameInformation['movingAndShootingCommands'] = [tokenizeCommand(line.rstrip('\r\n')) for line in inputFile]
+    with open(outputFileName, 'wb') as output:
+        output.write(encodeGame(gameInformation))
+
+
+def binaryToText(inputFileName, outputFileName):
+    """
+    Converts a binary game file to a text input file.
+    """
+    gameInformation = readBinaryInput(inputFileName)
+    lines = [str(gameInformation['boardSize']),
+             ' '.join('(%d, %d, %s)' % (x, y, direction) for (x, y), direction in gameInformation['shipLocations'])]
+    for command in gameInformation.get('movingAndShootingCommands', []):
+        if isMoveCommand(command):
+            lines.append('(%d, %d) %s' % (command[0][0], command[0][1], command[1]))
+        else:
+            lines.append('(%d, %d)' % command)
+    with open(outputFileName, 'w') as output:
+        output.write('\n'.join(lines) + '\n')
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Convert ship games between the text and binary formats.')
+    parser.add_argument('conversion', choices=['to-binary', 'to-text'])
+    parser.add_argument('input', help='file to convert')
+    parser.add_argument('output', help='file to write')
+    arguments = parser.parse_args(arguments)
+
+    if arguments.conversion == 'to-binary':
+        textToBinary(arguments.input, arguments.output)
+    else:
+        binaryToText(arguments.input, arguments.output)
+
+
+if __name__ == '__main__':
+    main()
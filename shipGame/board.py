@@ -0,0 +1,262 @@
+from collections.abc import MutableMapping
+
+numpy = None
+
+HEADINGS = ('N', 'E', 'S', 'W')
+HEADING_CODES = {'N': 1, 'E': 2, 'S': 3, 'W': 4}
+
+
+def importNumpy():
+    """
+    Imports numpy the first time an ArrayBoard is created, so that games which never use it
+    do not pay for the import.
+    """
+    global numpy
+    if numpy is None:
+        try:
+            import numpy as module
+        except ImportError:
+            raise ImportError('ArrayBoard requires numpy to be installed.')
+        numpy = module
+
+
+class Board(MutableMapping):
+    """
+    A square game board that behaves like the dense {(row, column): 0 or direction} dictionary
+    the game has always used: every in-bounds cell can be read (empty cells read as 0) and
+    out-of-bounds cells raise a KeyError. Subclasses decide how the occupied cells are stored.
+    """
+
+    def __init__(self, size):
+        """
+        Creates an empty board of square 'size' x 'size', where 'size' is a positive integer.
+        """
+        self.size = size
+        self.bounds = range(size)
+
+    @classmethod
+    def fromMapping(cls, mapping):
+        """
+        Creates a board from a dense dictionary of cells, taking the board size from the largest coordinate.
+        Example input: {(0, 0): 0, (0, 1): 'N', (1, 0): 0, (1, 1): 0}
+        Example result: a 2 x 2 board with a single ship at (0, 1) facing 'N'
+        """
+        size = max((max(coordinates) + 1 for coordinates in mapping), default=0)
+        board = cls(size)
+        for coordinates, direction in mapping.items():
+            board[coordinates] = direction
+        return board
+
+    def inBounds(self, coordinates):
+        """
+        Checks to see if the value passed in is a two integer tuple coordinate on the board.
+        Example input: (9, 2)
+        Example output: True
+        """
+        if type(coordinates) is not tuple or len(coordinates) != 2:
+            return False
+        return coordinates[0] in self.bounds and coordinates[1] in self.bounds
+
+    def occupiedCells(self):
+        """
+        Returns the coordinates and directions of every occupied cell.
+        Example output: [((0, 0), 'N'), ((9, 2), 'E')]
+        """
+        raise NotImplementedError
+
+    def relocate(self, origin, destination, direction):
+        """
+        Moves the ship in the 'origin' cell to the empty 'destination' cell, facing 'direction'.
+        Example input: (0, 0), (1, 3), 'N'
+        Example result portion: {(0, 0): 0, (1, 3): 'N'}
+        """
+        self[origin] = 0
+        self[destination] = direction
+
+    def validateCoordinates(self, coordinatesList):
+        """
+        Returns a batch of coordinates, given as an iterable or array, as a list of two integer tuples.
+        Raises a KeyError if any of them is off the board.
+        Example input: [[9, 2], (4, 4)]
+        Example output: [(9, 2), (4, 4)]
+        """
+        if hasattr(coordinatesList, 'tolist'):
+            coordinatesList = coordinatesList.tolist()
+        try:
+            coordinatesList = [tuple(coordinates) for coordinates in coordinatesList]
+        except TypeError:
+            raise KeyError(coordinatesList)
+
+        for coordinates in coordinatesList:
+            if not self.inBounds(coordinates):
+                raise KeyError(coordinates)
+        return coordinatesList
+
+    def sinkCells(self, coordinatesList):
+        """
+        Empties every occupied cell in a batch of coordinates and returns the ships that were there,
+        in the order they were hit. Raises a KeyError without changing the board if any coordinate is off it.
+        Example input: [(9, 2), (4, 4), (9, 2)]
+        Example output: [((9, 2), 'E')]
+        """
+        raise NotImplementedError
+
+    def __getitem__(self, coordinates):
+        raise NotImplementedError
+
+    def __setitem__(self, coordinates, direction):
+        raise NotImplementedError
+
+    def __delitem__(self, coordinates):
+        self[coordinates] = 0
+
+    def __contains__(self, coordinates):
+        return self.inBounds(coordinates)
+
+    def __iter__(self):
+        for row in self.bounds:
+            for column in self.bounds:
+                yield (row, column)
+
+    def __len__(self):
+        return self.size * self.size
+
+
+class SparseBoard(Board):
+    """
+    A board that only stores its occupied cells.
+    Memory and initialisation time scale with the number of ships rather than the board area.
+    """
+
+    def __init__(self, size):
+        super().__init__(size)
+        self.cells = {}
+
+    def occupiedCells(self):
+        """
+        Returns the coordinates and directions of every occupied cell, in placement order.
+        Example output: [((0, 0), 'N'), ((9, 2), 'E')]
+        """
+        return self.cells.items()
+
+    def sinkCells(self, coordinatesList):
+        coordinatesList = self.validateCoordinates(coordinatesList)
+
+        sunkenShips = []
+        for coordinates in coordinatesList:
+            direction = self.cells.pop(coordinates, 0)
+            if direction != 0:
+                sunkenShips.append((coordinates, direction))
+        return sunkenShips
+
+    def __getitem__(self, coordinates):
+        if not self.inBounds(coordinates):
+            raise KeyError(coordinates)
+        return self.cells.get(coordinates, 0)
+
+    def __setitem__(self, coordinates, direction):
+        if not self.inBounds(coordinates):
+            raise KeyError(coordinates)
+        if direction == 0:
+            self.cells.pop(coordinates, None)
+        else:
+            self.cells[coordinates] = direction
+
+
+class ArrayBoard(Board):
+    """
+    A board backed by a 'size' x 'size' numpy uint8 grid of heading codes (0 empty, 1-4 for N, E, S, W).
+    It costs one byte per cell, and extracting or analysing the ships is a vectorised pass over the grid.
+    Requires numpy.
+    """
+
+    def __init__(self, size):
+        importNumpy()
+        super().__init__(size)
+        self.grid = numpy.zeros((size, size), dtype=numpy.uint8)
+
+    def occupiedCells(self):
+        """
+        Returns the coordinates and directions of every occupied cell, ordered by row then column.
+        Example output: [((0, 0), 'N'), ((9, 2), 'E')]
+        """
+        rows, columns = numpy.nonzero(self.grid)
+        codes = self.grid[rows, columns]
+        return [((row, column), HEADINGS[code - 1])
+                for row, column, code in zip(rows.tolist(), columns.tolist(), codes.tolist())]
+
+    def sinkCells(self, coordinatesList):
+        """
+        Sinks a batch of coordinates, given as an iterable of two integer coordinates or an N x 2 integer array,
+        in one vectorised pass. Raises a KeyError for anything else, as well as for coordinates off the board.
+        """
+        try:
+            if not isinstance(coordinatesList, numpy.ndarray):
+                coordinatesList = list(coordinatesList)
+            points = numpy.asarray(coordinatesList)
+        except (TypeError, ValueError):
+            raise KeyError(coordinatesList)
+
+        if points.size == 0:
+            points = points.reshape(0, 2)
+        elif points.ndim != 2 or points.shape[1] != 2 or not numpy.issubdtype(points.dtype, numpy.integer):
+            raise KeyError(coordinatesList)
+        points = points.astype(numpy.int64, copy=False)
+
+        outOfBounds = (points < 0) | (points >= self.size)
+        if outOfBounds.any():
+            raise KeyError(tuple(points[outOfBounds.any(axis=1)][0].tolist()))
+
+        cells, firstHits = numpy.unique(points[:, 0] * self.size + points[:, 1], return_index=True)
+        order = numpy.argsort(firstHits, kind='stable')
+        cells = cells[order]
+        codes = self.grid.ravel()[cells]
+        hits = codes != 0
+        cells, codes = cells[hits], codes[hits]
+        self.grid.ravel()[cells] = 0
+
+        rows, columns = numpy.divmod(cells, self.size)
+        return [((row, column), HEADINGS[code - 1])
+                for row, column, code in zip(rows.tolist(), columns.tolist(), codes.tolist())]
+
+    def occupancyCount(self):
+        """
+        Returns the number of occupied cells on the board.
+        Example output: 2
+        """
+        return int(numpy.count_nonzero(self.grid))
+
+    def headingCounts(self):
+        """
+        Returns the number of ships facing each direction.
+        Example output: {'N': 1, 'E': 1, 'S': 0, 'W': 0}
+        """
+        counts = numpy.bincount(self.grid.ravel(), minlength=len(HEADINGS) + 1)
+        return dict(zip(HEADINGS, counts[1:].tolist()))
+
+    def heatmap(self, tileSize):
+        """
+        Returns a grid counting the occupied cells within each 'tileSize' x 'tileSize' tile of the board.
+        Example input (for a 10 x 10 board with ships at (0, 0) and (9, 2)): 5
+        Example output: array([[1, 0], [1, 0]])
+        """
+        tiles = -(-self.size // tileSize)
+        occupied = numpy.zeros((tiles * tileSize, tiles * tileSize), dtype=bool)
+        occupied[:self.size, :self.size] = self.grid != 0
+        return occupied.reshape(tiles, tileSize, tiles, tileSize).sum(axis=(1, 3))
+
+    def __getitem__(self, coordinates):
+        if not self.inBounds(coordinates):
+            raise KeyError(coordinates)
+        code = int(self.grid[coordinates])
+        return HEADINGS[code - 1] if code else 0
+
+    def __setitem__(self, coordinates, direction):
+        if not self.inBounds(coordinates):
+            raise KeyError(coordinates)
+        if direction == 0:
+            self.grid[coordinates] = 0
+        elif direction in HEADING_CODES:
+            self.grid[coordinates] = HEADING_CODES[direction]
+        else:
+            raise ValueError("Invalid direction. Must be in 'NESW'. %s was given." % direction)
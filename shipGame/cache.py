@@ -0,0 +1,227 @@
+"""
+An on-disk cache of game outputs, keyed by a hash of the input file's contents, the engine version and
+anything else that changes the output, so a resubmitted game costs one hash and one file copy.
+
+Entries are plain output files, named by their key and spread over 256 subdirectories. Each entry is
+written to a temporary file and renamed into place, and a hit touches the entry's modification time,
+which eviction uses as the last time it was used. Several processes can share a cache directory without
+locking: a reader either finds a whole entry or none, and an entry evicted by another process is a miss.
+
+Each ResultCache keeps a running total of the bytes cached, from one scan of the directory on its first
+store, so a store only scans the cache again when the total goes over the limit, and then evicts down to
+EVICTION_TARGET of it. Entries stored by other processes are picked up by that scan. With a maximum age,
+expired entries are also evicted every EVICT_EVERY stores.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+
+# Bump whenever a change to the engine changes any game's output, so older entries are no longer found.
+ENGINE_VERSION = 2
+CHUNK_SIZE = 1 << 20
+MAX_BYTES = 1 << 30
+EVICTION_TARGET = 0.9
+EVICT_EVERY = 1000
+
+
+class ResultCache(object):
+    """
+    A cache of game outputs in 'directory', holding at most 'maxBytes' of entries, each for at most
+    'maxAge' seconds since it was last used when given. The least recently used entries are evicted first.
+    'hits' and 'misses' count the lookups made through this object.
+    """
+
+    def __init__(self, directory, maxBytes=MAX_BYTES, maxAge=None):
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.maxAge = maxAge
+        self.hits = 0
+        self.misses = 0
+        self.totalBytes = None
+        self.storesSinceEviction = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, inputFileName, variant=''):
+        """
+        Returns the key for an input file's output, from its contents, the engine version and 'variant',
+        which names any option that changes the output.
+        Example input: 'games/001.txt', 'sorted'
+        Example output: '3b1f0c...'
+        """
+        digest = hashlib.sha256(('%d:%s:' % (ENGINE_VERSION, variant)).encode())
+        with open(inputFileName, 'rb') as inputFile:
+            for chunk in iter(lambda: inputFile.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def entryPath(self, key):
+        return os.path.join(self.directory, key[:2], key + '.txt')
+
+    def use(self, entry):
+        """
+        Marks an entry as used, returning False if it has expired. Raises FileNotFoundError if it is missing.
+        """
+        if self.maxAge is not None and time.time() - os.stat(entry).st_mtime > self.maxAge:
+            return False
+        os.utime(entry)
+        return True
+
+    def fetch(self, key, outputFileName):
+        """
+        Copies the entry for 'key' to 'outputFileName' and marks it as used. Returns False, without
+        writing anything, if there is no entry or it has expired.
+        """
+        entry = self.entryPath(key)
+        try:
+            found = self.use(entry)
+            if found:
+                shutil.copyfile(entry, outputFileName)
+        except FileNotFoundError:
+            found = False
+        self.count(found)
+        return found
+
+    def read(self, key):
+        """
+        Returns the contents of the entry for 'key' and marks it as used, or None on a miss.
+        """
+        entry = self.entryPath(key)
+        contents = None
+        try:
+            if self.use(entry):
+                with open(entry) as cached:
+                    contents = cached.read()
+        except FileNotFoundError:
+            pass
+        self.count(contents is not None)
+        return contents
+
+    def count(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def store(self, key, contents):
+        """
+        Atomically stores 'contents' as the entry for 'key', then evicts entries if the cache is over its limits.
+        """
+        entry = self.entryPath(key)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        descriptor, temporaryFileName = tempfile.mkstemp(dir=os.path.dirname(entry), prefix='.tmp-')
+        try:
+            with os.fdopen(descriptor, 'w') as output:
+                output.write(contents)
+            size = os.stat(temporaryFileName).st_size
+            try:
+                replacedSize = os.stat(entry).st_size
+            except FileNotFoundError:
+                replacedSize = 0
+            os.replace(temporaryFileName, entry)
+        except BaseException:
+            os.unlink(temporaryFileName)
+            raise
+
+        if self.totalBytes is None:
+            self.totalBytes = sum(entrySize for used, entrySize, path in self.entries())
+        else:
+            self.totalBytes += size - replacedSize
+        self.storesSinceEviction += 1
+        if self.totalBytes > self.maxBytes or (self.maxAge is not None and self.storesSinceEviction >= EVICT_EVERY):
+            self.evict()
+
+    def entries(self):
+        """
+        Returns (last used time, size, path) for every entry, skipping temporary files being written.
+        """
+        entries = []
+        for subdirectory in os.scandir(self.directory):
+            if not subdirectory.is_dir():
+                continue
+            for entry in os.scandir(subdirectory.path):
+                if entry.name.startswith('.'):
+                    continue
+                try:
+                    status = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((status.st_mtime, status.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        """
+        Removes expired entries, then, if the rest do not fit in 'maxBytes', the least recently used ones until
+        they fit in EVICTION_TARGET of it. Returns the number of entries removed.
+        """
+        entries = sorted(self.entries())
+        totalBytes = sum(size for used, size, path in entries)
+        targetBytes = self.maxBytes * EVICTION_TARGET if totalBytes > self.maxBytes else self.maxBytes
+        oldest = time.time() - self.maxAge if self.maxAge is not None else None
+        removed = 0
+
+        for used, size, path in entries:
+            if totalBytes <= targetBytes and (oldest is None or used >= oldest):
+                break
+            try:
+                os.unlink(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            totalBytes -= size
+
+        self.totalBytes = totalBytes
+        self.storesSinceEviction = 0
+        return removed
+
+    def statistics(self):
+        """
+        Example output: {'hits': 3, 'misses': 1, 'entries': 1, 'bytes': 26}
+        """
+        entries = self.entries()
+        return {'hits': self.hits, 'misses': self.misses,
+                'entries': len(entries), 'bytes': sum(size for used, size, path in entries)}
+
+
+def outputVariant(boardClass, sortedOutput=False):
+    """
+    Returns the variant naming the options a game's output was calculated with: the board backend and
+    whether the sunken ships are sorted.
+    Example input: SparseBoard, True
+    Example output: 'SparseBoard:sorted'
+    """
+    return '%s:%s' % (boardClass.__name__, 'sorted' if sortedOutput else 'unsorted')
+
+
+def formatOutput(lines):
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+def cachedOutput(cache, inputFileName, calculate, variant=''):
+    """
+    Returns the output for an input file, from the cache if it holds it, otherwise by calling
+    'calculate', which returns the game's output lines, and storing the result.
+    """
+    key = cache.key(inputFileName, variant)
+    contents = cache.read(key)
+    if contents is None:
+        contents = formatOutput(calculate())
+        cache.store(key, contents)
+    return contents
+
+
+def writeCachedOutput(cache, inputFileName, outputFileName, calculate, variant=''):
+    """
+    Writes the output for an input file to 'outputFileName', copying it from the cache if it holds it,
+    otherwise calling 'calculate', which returns the game's output lines, and storing the result.
+    Returns whether the output came from the cache.
+    """
+    key = cache.key(inputFileName, variant)
+    if cache.fetch(key, outputFileName):
+        return True
+    contents = formatOutput(calculate())
+    with open(outputFileName, 'w') as output:
+        output.write(contents)
+    cache.store(key, contents)
+    return False
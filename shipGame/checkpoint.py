@@ -0,0 +1,117 @@
+"""
+Periodic checkpointing of a game's state while it replays a long operation log, and resuming
+from the latest checkpoint by seeking straight to the next operation in the input file.
+"""
+import gzip
+import json
+import os
+import time
+from shipGame.app import ShipGame
+from shipGame.board import SparseBoard
+from shipGame.utils import tokenizeCommand
+
+CHECKPOINT_VERSION = 1
+
+
+def saveCheckpoint(game, fileName, inputFileName, offset, operationCount):
+    """
+    Atomically writes the game's board, sunken ships and the byte offset of the next operation
+    in the input file to 'fileName' as gzipped JSON.
+    """
+    checkpoint = {'version': CHECKPOINT_VERSION,
+                  'inputFile': inputFileName,
+                  'inputSize': os.path.getsize(inputFileName),
+                  'offset': offset,
+                  'operationCount': operationCount,
+                  'boardSize': game.board.size,
+                  'ships': [[x, y, direction] for (x, y), direction in game.board.occupiedCells()],
+                  'sunkenShips': [[x, y, direction] for (x, y), direction in game.sunkenShips]}
+
+    temporaryFileName = fileName + '.tmp'
+    with gzip.open(temporaryFileName, 'wt') as output:
+        json.dump(checkpoint, output, separators=(',', ':'))
+    os.replace(temporaryFileName, fileName)
+
+
+def loadCheckpoint(fileName):
+    """
+    Reads a checkpoint written by saveCheckpoint.
+    Example output: {'offset': 41, 'operationCount': 2, 'boardSize': 10, 'ships': [[1, 3, 'N']], ...}
+    """
+    with gzip.open(fileName, 'rt') as checkpointFile:
+        checkpoint = json.load(checkpointFile)
+    if checkpoint.get('version') != CHECKPOINT_VERSION:
+        raise ValueError('Unsupported checkpoint version in %s.' % fileName)
+    return checkpoint
+
+
+def restoreCheckpoint(game, checkpoint):
+    """
+    Replaces the game's board and sunken ships with those saved in a checkpoint.
+    """
+    board = game.initialiseBoard(checkpoint['boardSize'])
+    for x, y, direction in checkpoint['ships']:
+        board[(x, y)] = direction
+    game.board = board
+    game.sunkenShips = [((x, y), direction) for x, y, direction in checkpoint['sunkenShips']]
+
+
+def firstOperationOffset(inputFileName):
+    """
+    Returns the byte offset of the first operation in an input file, after the board size and ship lines.
+    Example input: 'input.txt'
+    Example output: 23
+    """
+    with open(inputFileName, 'rb') as inputFile:
+        inputFile.readline()
+        inputFile.readline()
+        return inputFile.tell()
+
+
+def calculateGameWithCheckpoints(inputFileName, checkpointFileName, everyOperations=10000, everySeconds=None,
+                                 resume=True, boardClass=SparseBoard):
+    """
+    Calculates the game in 'inputFileName', writing a checkpoint every 'everyOperations' operations
+    and/or every 'everySeconds' seconds, and once more when the game finishes.
+    When 'resume' is set and a checkpoint for this input exists, the game continues from it
+    instead of starting again from the first operation. Returns the finished ShipGame.
+    """
+    game = ShipGame(inputFileName, stream=True, boardClass=boardClass)
+    game.gameInformation['movingAndShootingCommands'].close()
+    inputFileName = game.resolveFilename(inputFileName)
+    offset = firstOperationOffset(inputFileName)
+    operationCount = 0
+
+    if resume and os.path.exists(checkpointFileName):
+        checkpoint = loadCheckpoint(checkpointFileName)
+        if checkpoint['inputFile'] != inputFileName or checkpoint['inputSize'] != os.path.getsize(inputFileName):
+            raise ValueError('Checkpoint %s does not belong to %s.' % (checkpointFileName, inputFileName))
+        restoreCheckpoint(game, checkpoint)
+        offset = checkpoint['offset']
+        operationCount = checkpoint['operationCount']
+        if offset >= checkpoint['inputSize']:
+            return game
+
+    def checkpointedCommands(offset, operationCount):
+        """
+        Yields each operation from 'offset' onwards, checkpointing once the previous one has run.
+        """
+        lastCheckpoint = time.monotonic()
+        with open(inputFileName, 'rb') as inputFile:
+            inputFile.seek(offset)
+            for line in inputFile:
+                offset += len(line)
+                yield tokenizeCommand(line.decode().rstrip('\r\n'))
+                operationCount += 1
+
+                if everyOperations and operationCount % everyOperations == 0:
+                    saveCheckpoint(game, checkpointFileName, inputFileName, offset, operationCount)
+                    lastCheckpoint = time.monotonic()
+                elif everySeconds and time.monotonic() - lastCheckpoint >= everySeconds:
+                    saveCheckpoint(game, checkpointFileName, inputFileName, offset, operationCount)
+                    lastCheckpoint = time.monotonic()
+
+        saveCheckpoint(game, checkpointFileName, inputFileName, offset, operationCount)
+
+    game.calculateGame(checkpointedCommands(offset, operationCount))
+    return game
@@ -0,0 +1,96 @@
+"""
+Command line entry point for calculating a single game.
+Run with: python -m shipGame input.txt -o output.txt
+      or: cat input.txt | python -m shipGame - > output.txt
+Everything beyond argument parsing is imported lazily, so startup costs little more than the interpreter.
+"""
+import sys
+
+
+def parseArguments(arguments):
+    import argparse
+    parser = argparse.ArgumentParser(prog='shipGame', description='Calculate the final state of a ship game.')
+    parser.add_argument('input', help="input file path, or '-' to read standard input")
+    parser.add_argument('-o', '--output', default='-',
+                        help="output file path, or '-' (the default) for standard output")
+    parser.add_argument('--stream', action='store_true', help='parse and run operations lazily in constant memory')
+    parser.add_argument('--mapped', action='store_true', help='memory-map the input file')
+    parser.add_argument('--binary', action='store_true', help='read an input file in the packed binary format')
+    parser.add_argument('--sorted', action='store_true', help='sort sunken ships by coordinates in the output')
+    parser.add_argument('--array-board', action='store_true', help='use the numpy ArrayBoard backend')
+    parser.add_argument('--optimise', action='store_true',
+                        help='simplify the operation log before running it, reporting what was removed on stderr')
+    parser.add_argument('--instrument', metavar='FILE', help='write phase timings and operation statistics as JSON')
+    parser.add_argument('--cache', metavar='DIRECTORY',
+                        help='reuse the output of an identical input file calculated before, kept in this directory')
+    parser.add_argument('--cache-max-bytes', type=int, metavar='BYTES', help='evict cached outputs beyond this size')
+    parser.add_argument('--cache-max-age', type=float, metavar='SECONDS',
+                        help='evict cached outputs unused for this long')
+    arguments = parser.parse_args(arguments)
+    if arguments.cache and (arguments.input == '-' or arguments.instrument):
+        parser.error('--cache needs an input file, and cannot be used with --instrument')
+    return arguments
+
+
+def main(arguments=None):
+    arguments = parseArguments(arguments)
+
+    import os
+    from shipGame.app import ShipGame
+    from shipGame.board import SparseBoard
+
+    options = {'stream': arguments.stream, 'boardClass': SparseBoard}
+    if arguments.array_board:
+        from shipGame.board import ArrayBoard
+        options['boardClass'] = ArrayBoard
+    if arguments.instrument:
+        from shipGame.instrumentation import Instrumentation
+        options['instrumentation'] = Instrumentation()
+
+    def calculate():
+        if arguments.input == '-':
+            game = ShipGame(lines=(line.rstrip('\r\n') for line in sys.stdin), **options)
+        else:
+            game = ShipGame(os.path.abspath(arguments.input), mapped=arguments.mapped, binary=arguments.binary,
+                            **options)
+
+        if arguments.optimise:
+            report = game.optimiseCommands()
+            sys.stderr.write('Removed %d of %d operations.\n' % (report['removedOperations'], report['operations']))
+
+        game.calculateGame()
+        return game
+
+    if arguments.cache:
+        from shipGame.cache import MAX_BYTES, ResultCache, cachedOutput, outputVariant, writeCachedOutput
+        maxBytes = MAX_BYTES if arguments.cache_max_bytes is None else arguments.cache_max_bytes
+        cache = ResultCache(arguments.cache, maxBytes, arguments.cache_max_age)
+        variant = outputVariant(options['boardClass'], arguments.sorted)
+
+        def outputLines():
+            return calculate().outputLines(arguments.sorted)
+
+        if arguments.output == '-':
+            sys.stdout.write(cachedOutput(cache, arguments.input, outputLines, variant))
+        else:
+            writeCachedOutput(cache, arguments.input, os.path.abspath(arguments.output), outputLines, variant)
+        sys.stderr.write('Cache hits: %d, misses: %d.\n' % (cache.hits, cache.misses))
+        return 0
+
+    game = calculate()
+
+    if arguments.output == '-':
+        lines = game.outputLines(arguments.sorted)
+        if lines:
+            sys.stdout.write('\n'.join(lines) + '\n')
+    else:
+        game.writeOutput(os.path.abspath(arguments.output), arguments.sorted)
+
+    if arguments.instrument:
+        game.instrumentation.writeJson(arguments.instrument)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
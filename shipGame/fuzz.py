@@ -0,0 +1,389 @@
+"""
+Seeded differential fuzzing: random games are run through a frozen copy of the original ShipGame and
+through ShipGame with each engine, board backend and pre-pass, and their full outputs are compared.
+A mismatch is shrunk to a minimal input file that still reproduces it.
+Run with: python -m shipGame.fuzz --games 200 --seed 0 --failures fuzz-failures/
+"""
+import argparse
+import importlib.util
+import os
+import random
+import shutil
+import sys
+import tempfile
+from shipGame.app import ShipGame
+from shipGame.board import SparseBoard
+from shipGame.generator import generateGame
+from shipGame.utils import isMoveCommand, isShootCommand, tokenizeCommand, tokenizeShipLocations
+
+
+class ReferenceGame(object):
+    """
+    A frozen copy of the original ShipGame algorithm, which every engine is compared against: a dense
+    dictionary of every cell, filled row by row, moves applied one step at a time, and the ships afloat
+    listed by walking that dictionary. Only the line tokenizers are shared with ShipGame.
+    It is deliberately slow and must not be changed along with the engines.
+    """
+    compassMapping = ['N', 'E', 'S', 'W']
+
+    def __init__(self, lines):
+        self.sunkenShips = []
+        self.gameInformation = {}
+        movingAndShootingCommands = []
+
+        for index, line in enumerate(lines):
+            if index == 0:
+                self.gameInformation['boardSize'] = int(line)
+            elif index == 1:
+                self.gameInformation['shipLocations'] = tokenizeShipLocations(line)
+            else:
+                movingAndShootingCommands.append(tokenizeCommand(line))
+
+        if movingAndShootingCommands:
+            self.gameInformation['movingAndShootingCommands'] = movingAndShootingCommands
+
+        try:
+            size = self.gameInformation['boardSize']
+            self.board = {(row, column): 0 for row in range(size) for column in range(size)}
+            for coordinates, direction in self.gameInformation['shipLocations']:
+                if self.board[coordinates] == 0 and direction in self.compassMapping:
+                    self.board[coordinates] = direction
+        except KeyError:
+            sys.exit('Initialisation failed. Data missing from input file.')
+
+    def moveShip(self, shipLocation, moveCommands):
+        if not moveCommands:
+            raise TypeError("No move operations given.")
+
+        for moveOperation in moveCommands:
+            if moveOperation not in 'MRL':
+                raise ValueError("Invalid move operations. Must be in 'MRL'. %s was given." % moveOperation)
+
+        direction = self.board[shipLocation]
+
+        if direction == 0:
+            raise ValueError("Attempting to move a ship that does not exist.")
+
+        x, y = shipLocation
+        for moveCommand in moveCommands:
+            if moveCommand == 'M':
+                x, y = {'N': (x, y + 1), 'E': (x + 1, y), 'S': (x, y - 1), 'W': (x - 1, y)}[direction]
+            else:
+                turn = 1 if moveCommand == 'R' else -1
+                direction = self.compassMapping[(self.compassMapping.index(direction) + turn) % 4]
+        location = (x, y)
+
+        if 'M' not in moveCommands:
+            self.board[location] = direction
+        elif self.board[location] == 0:
+            self.board[shipLocation] = 0
+            self.board[location] = direction
+
+    def shootShip(self, shipLocation):
+        if self.board[shipLocation] != 0:
+            self.sunkenShips.append((shipLocation, self.board[shipLocation]))
+            self.board[shipLocation] = 0
+
+    def calculateGame(self):
+        if not self.gameInformation['movingAndShootingCommands']:
+            raise TypeError('No commands to calculate')
+
+        for command in self.gameInformation['movingAndShootingCommands']:
+            if isMoveCommand(command):
+                self.moveShip(command[0], command[1])
+            elif isShootCommand(command):
+                self.shootShip(command)
+
+    def outputLines(self):
+        lines = [formatShip(coordinates, direction) for coordinates, direction in self.board.items() if direction != 0]
+        lines.extend(formatShip(coordinates, direction) + ' SUNK' for coordinates, direction in self.sunkenShips)
+        return lines
+
+
+def runReference(lines, inputFileName):
+    game = ReferenceGame(lines)
+    game.calculateGame()
+    return game.outputLines()
+
+
+def runBoard(boardClass):
+    def runOnBoard(lines, inputFileName):
+        game = ShipGame(lines=lines, boardClass=boardClass)
+        game.calculateGame()
+        return game.outputLines()
+    return runOnBoard
+
+
+def runArrayBoard(lines, inputFileName):
+    from shipGame.board import ArrayBoard
+    return runBoard(ArrayBoard)(lines, inputFileName)
+
+
+def runShipBoard(lines, inputFileName):
+    from shipGame.ships import ShipBoard
+    return runBoard(ShipBoard)(lines, inputFileName)
+
+
+def runIndexedBoard(lines, inputFileName):
+    from shipGame.spatial import IndexedBoard
+    return runBoard(IndexedBoard)(lines, inputFileName)
+
+
+def runVolleys(lines, inputFileName):
+    """
+    Runs the game on an ArrayBoard with each run of consecutive shots batched into one shootShips call.
+    """
+    from shipGame.board import ArrayBoard
+    game = ShipGame(lines=lines, boardClass=ArrayBoard)
+    volley = []
+    for command in game.gameInformation['movingAndShootingCommands']:
+        if isShootCommand(command):
+            volley.append(command)
+            continue
+        if volley:
+            game.shootShips(volley)
+            volley = []
+        game.calculateGame([command])
+    if volley:
+        game.shootShips(volley)
+    return game.outputLines()
+
+
+def runStream(lines, inputFileName):
+    game = ShipGame(inputFileName, stream=True)
+    game.calculateGame()
+    return game.outputLines()
+
+
+def runMapped(lines, inputFileName):
+    game = ShipGame(inputFileName, mapped=True)
+    game.calculateGame()
+    return game.outputLines()
+
+
+def runBinary(lines, inputFileName):
+    """
+    Converts the game to the binary format and runs it from there.
+    """
+    from shipGame.binary import textToBinary
+    binaryFileName = inputFileName + '.shpg'
+    textToBinary(inputFileName, binaryFileName)
+    game = ShipGame(binaryFileName, binary=True)
+    game.calculateGame()
+    return game.outputLines()
+
+
+def runCheckpoint(lines, inputFileName):
+    """
+    Runs the game with frequent checkpoints, then resumes it from the finished checkpoint.
+    """
+    from shipGame.checkpoint import calculateGameWithCheckpoints
+    checkpointFileName = inputFileName + '.checkpoint'
+    calculateGameWithCheckpoints(inputFileName, checkpointFileName, everyOperations=3, resume=False)
+    game = calculateGameWithCheckpoints(inputFileName, checkpointFileName)
+    return game.outputLines()
+
+
+def runOptimiser(lines, inputFileName):
+    game = ShipGame(lines=lines)
+    game.optimiseCommands()
+    game.calculateGame()
+    return game.outputLines()
+
+
+def runParallel(lines, inputFileName):
+    """
+    Runs every batch of independent operations across threads, however small.
+    """
+    from shipGame.scheduler import calculateGameInParallel
+    game = ShipGame(lines=lines)
+    calculateGameInParallel(game, workers=2, threads=True, minimumBatch=1, force=True)
+    return game.outputLines()
+
+
+def runVectorized(lines, inputFileName):
+    """
+    Runs the game as a batch of one in the lockstep numpy engine.
+    """
+    from shipGame.vectorized import BatchedGames
+    batch = BatchedGames.fromLines([lines])
+    batch.run()
+    return batch.outputLines(0)
+
+
+def runTimeline(lines, inputFileName):
+    """
+    Runs the game with a timeline and rebuilds the final state from it rather than reading the game.
+    """
+    from shipGame.timeline import Timeline
+    game = ShipGame(lines=lines)
+    timeline = game.enableTimeline(Timeline(snapshotEvery=5, snapshotBudget=20))
+    game.calculateGame()
+    game.board, game.sunkenShips = game.stateAt(timeline.operationCount)
+    return game.outputLines()
+
+
+ENGINES = {'sparseBoard': runBoard(SparseBoard),
+           'arrayBoard': runArrayBoard,
+           'shipBoard': runShipBoard,
+           'indexedBoard': runIndexedBoard,
+           'volleys': runVolleys,
+           'stream': runStream,
+           'mapped': runMapped,
+           'binary': runBinary,
+           'checkpoint': runCheckpoint,
+           'optimiser': runOptimiser,
+           'parallel': runParallel,
+           'timeline': runTimeline,
+           'vectorized': runVectorized}
+
+# Engines that need numpy, which is optional, and are left out by default when it is not installed.
+NUMPY_ENGINES = ('arrayBoard', 'volleys', 'vectorized')
+
+
+def defaultEngines():
+    """
+    Returns the names of every engine that can run here.
+    """
+    if importlib.util.find_spec('numpy') is None:
+        return sorted(set(ENGINES) - set(NUMPY_ENGINES))
+    return sorted(ENGINES)
+
+
+def formatShip(coordinates, direction):
+    return '(%d, %d, %s)' % (coordinates[0], coordinates[1], direction)
+
+
+def randomGame(generator):
+    """
+    Returns the lines of a random game, small and crowded enough that moves are often rejected,
+    with rotate-only moves and repeated ship cells (where the first ship is kept). One game in ten also has
+    an unparseable line, which every engine must reject.
+    Example output: ['4', '(1, 2, W) (0, 3, N) (1, 2, S)', '(1, 2) LMR', '(0, 3) RR', '(3, 3)']
+    """
+    boardSize = generator.randint(1, 8)
+    shipCount = generator.randint(1, boardSize * boardSize)
+    lines = generateGame(boardSize, shipCount, generator.randint(1, 40), moveLength=generator.randint(1, 6),
+                         moveRatio=generator.random(), hitRatio=generator.random(), seed=generator.randrange(2 ** 32))
+
+    repeatedShips = tokenizeShipLocations(lines[1])[:generator.randint(0, 3)]
+    lines[1] = ' '.join([lines[1]] + [formatShip(coordinates, generator.choice('NESW'))
+                                      for coordinates, direction in repeatedShips])
+
+    if generator.random() < 0.1:
+        lines.insert(generator.randint(3, len(lines)), generator.choice(['', 'not a command', '(1, 2) M M']))
+    return lines
+
+
+def outcome(engine, lines, directory):
+    """
+    Runs a game through an engine, returning its output lines or the name of the error it raised.
+    """
+    inputFileName = os.path.join(directory, 'game.txt')
+    with open(inputFileName, 'w') as inputFile:
+        inputFile.write('\n'.join(lines) + '\n')
+    try:
+        return engine(lines, inputFileName)
+    except (Exception, SystemExit) as error:
+        return type(error).__name__
+
+
+def mismatches(engine, lines, directory):
+    """
+    Checks whether an engine disagrees with the reference on a game: on whether it raises, or on any line
+    of its output, including the order of the lines. An engine may raise a different error than the reference.
+    """
+    expected = outcome(runReference, lines, directory)
+    actual = outcome(engine, lines, directory)
+    if isinstance(expected, str) or isinstance(actual, str):
+        return isinstance(expected, str) != isinstance(actual, str)
+    return actual != expected
+
+
+def shrink(engine, lines, directory):
+    """
+    Returns the smallest game found that still makes 'engine' disagree with the reference, by removing
+    chunks of operations, then single ships, then single move steps, for as long as any removal helps.
+    Example input: runMapped, ['10', '(0, 0, N) (9, 2, E)', '(0, 0) MRMLMM', '(9, 2)', '(5, 5)'], '/tmp/fuzz'
+    Example output: ['10', '(0, 0, N)', '(0, 0) M']
+    """
+    def candidates(lines):
+        operations = len(lines) - 2
+        chunk = operations
+        while chunk >= 1:
+            for start in range(2, len(lines), chunk):
+                yield lines[:start] + lines[start + chunk:]
+            chunk //= 2
+
+        ships = [formatShip(coordinates, direction) for coordinates, direction in tokenizeShipLocations(lines[1])]
+        for index in range(len(ships)):
+            yield [lines[0], ' '.join(ships[:index] + ships[index + 1:])] + lines[2:]
+
+        for index in range(2, len(lines)):
+            command = tokenizeCommand(lines[index])
+            if isMoveCommand(command) and len(command[1]) > 1:
+                (x, y), moveCommands = command
+                for step in range(len(moveCommands)):
+                    shorter = '(%d, %d) %s' % (x, y, moveCommands[:step] + moveCommands[step + 1:])
+                    yield lines[:index] + [shorter] + lines[index + 1:]
+
+    shrunk = True
+    while shrunk:
+        shrunk = False
+        for candidate in candidates(lines):
+            if candidate != lines and mismatches(engine, candidate, directory):
+                lines = candidate
+                shrunk = True
+                break
+    return lines
+
+
+def fuzz(games=100, seed=0, engines=None, failureDirectory=None):
+    """
+    Runs 'games' random games through the reference and each engine named in 'engines' (by default every
+    engine that can run here).
+    Every mismatch is shrunk and, when 'failureDirectory' is given, written there as an input file.
+    Returns a list of (engine name, game number, shrunk lines) for each mismatch.
+    Example input: games=50, seed=3
+    Example output: []
+    """
+    generator = random.Random(seed)
+    engines = engines or defaultEngines()
+    failures = []
+    directory = tempfile.mkdtemp(prefix='shipGame-fuzz-')
+
+    try:
+        for game in range(games):
+            lines = randomGame(generator)
+            for name in engines:
+                if mismatches(ENGINES[name], lines, directory):
+                    shrunk = shrink(ENGINES[name], lines, directory)
+                    failures.append((name, game, shrunk))
+                    if failureDirectory is not None:
+                        os.makedirs(failureDirectory, exist_ok=True)
+                        with open(os.path.join(failureDirectory, '%s-%d-%d.txt' % (name, seed, game)), 'w') as output:
+                            output.write('\n'.join(shrunk) + '\n')
+    finally:
+        shutil.rmtree(directory)
+
+    return failures
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Compare every engine against the original ShipGame on random games.')
+    parser.add_argument('--games', type=int, default=100, help='number of random games')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    parser.add_argument('--engine', action='append', choices=sorted(ENGINES), help='only fuzz these engines')
+    parser.add_argument('--failures', metavar='DIRECTORY', help='write each shrunk failing game here')
+    arguments = parser.parse_args(arguments)
+
+    failures = fuzz(arguments.games, arguments.seed, arguments.engine, arguments.failures)
+    for name, game, lines in failures:
+        print('%s differs on game %d, shrunk to %d lines:' % (name, game, len(lines)))
+        print('\n'.join('    ' + line for line in lines))
+    print('%d games, %d mismatches.' % (arguments.games, len(failures)))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
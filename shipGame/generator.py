@@ -0,0 +1,121 @@
+"""
+Writes seeded, valid synthetic game input files for testing and benchmarking.
+Run with: python -m shipGame.generator game.txt --size 1000 --ships 100 --operations 10000
+"""
+import argparse
+import random
+from shipGame.moves import compileMoves
+
+COMPASS = 'NESW'
+
+
+def generateGame(boardSize, shipCount, operationCount, moveLength=6, moveRatio=0.5, hitRatio=0.1, seed=0):
+    """
+    Generates the lines of a valid input file: the board size, 'shipCount' ships on distinct cells,
+    and 'operationCount' operations, of which roughly 'moveRatio' are moves of 'moveLength' steps.
+    The game is simulated as it is generated, so every move targets a ship that exists and stays on
+    the board, and roughly 'hitRatio' of the shots are aimed at a ship.
+    Example input: 10, 2, 2, seed=1
+    Example output: ['10', '(1, 7, N) (7, 2, S)', '(7, 2) RLRMMR', '(5, 2) LMLRRL']
+    """
+    if shipCount > boardSize * boardSize:
+        raise ValueError('Cannot place %d ships on a %d x %d board.' % (shipCount, boardSize, boardSize))
+
+    generator = random.Random(seed)
+    ships = {}
+    for cell in generator.sample(range(boardSize * boardSize), shipCount):
+        ships[divmod(cell, boardSize)] = generator.choice(COMPASS)
+
+    lines = [str(boardSize), ' '.join('(%d, %d, %s)' % (x, y, direction) for (x, y), direction in ships.items())]
+    shipLocations = list(ships)
+
+    for _ in range(operationCount):
+        if ships and generator.random() < moveRatio:
+            lines.append(generateMove(generator, ships, shipLocations, boardSize, moveLength))
+        else:
+            lines.append(generateShot(generator, ships, shipLocations, boardSize, hitRatio))
+
+    return lines
+
+
+def pickShip(generator, ships, shipLocations):
+    """
+    Returns a random live ship location, lazily discarding stale entries from 'shipLocations'.
+    """
+    while True:
+        index = generator.randrange(len(shipLocations))
+        location = shipLocations[index]
+        if location in ships:
+            return location
+        shipLocations[index] = shipLocations[-1]
+        shipLocations.pop()
+
+
+def generateMove(generator, ships, shipLocations, boardSize, moveLength):
+    """
+    Returns a move command for a random live ship that keeps it on the board, and applies it to 'ships'.
+    """
+    location = pickShip(generator, ships, shipLocations)
+    direction = ships[location]
+
+    for _ in range(10):
+        moveCommands = ''.join(generator.choice('MRL') for _ in range(moveLength))
+        x, y, finalDirection, moved = compileMoves(direction, moveCommands)
+        destination = (location[0] + x, location[1] + y)
+        if 0 <= destination[0] < boardSize and 0 <= destination[1] < boardSize:
+            break
+    else:
+        moveCommands = ''.join(generator.choice('RL') for _ in range(moveLength))
+        x, y, finalDirection, moved = compileMoves(direction, moveCommands)
+        destination = location
+
+    if not moved:
+        ships[location] = finalDirection
+    elif destination not in ships:
+        del ships[location]
+        ships[destination] = finalDirection
+        shipLocations.append(destination)
+
+    return '(%d, %d) %s' % (location[0], location[1], moveCommands)
+
+
+def generateShot(generator, ships, shipLocations, boardSize, hitRatio):
+    """
+    Returns a shoot command, aimed at a live ship 'hitRatio' of the time, and applies it to 'ships'.
+    """
+    if ships and generator.random() < hitRatio:
+        target = pickShip(generator, ships, shipLocations)
+    else:
+        target = (generator.randrange(boardSize), generator.randrange(boardSize))
+    ships.pop(target, None)
+    return '(%d, %d)' % target
+
+
+def writeGame(fileName, *arguments, **keywordArguments):
+    """
+    Generates a game with generateGame and writes it to 'fileName'.
+    """
+    with open(fileName, 'w') as output:
+        for line in generateGame(*arguments, **keywordArguments):
+            output.write(line)
+            output.write('\n')
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Write a seeded synthetic ship game input file.')
+    parser.add_argument('output', help='file to write the game to')
+    parser.add_argument('--size', type=int, default=10, help='board size')
+    parser.add_argument('--ships', type=int, default=2, help='number of ships')
+    parser.add_argument('--operations', type=int, default=2, help='number of move and shoot operations')
+    parser.add_argument('--move-length', type=int, default=6, help='steps in each move string')
+    parser.add_argument('--move-ratio', type=float, default=0.5, help='fraction of operations that are moves')
+    parser.add_argument('--hit-ratio', type=float, default=0.1, help='fraction of shots aimed at a ship')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    arguments = parser.parse_args(arguments)
+
+    writeGame(arguments.output, arguments.size, arguments.ships, arguments.operations,
+              arguments.move_length, arguments.move_ratio, arguments.hit_ratio, arguments.seed)
+
+
+if __name__ == '__main__':
+    main()
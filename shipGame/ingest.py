@@ -0,0 +1,101 @@
+"""
+Memory-mapped input ingestion. The input file is mapped rather than read into a string, and
+the tokenizer runs directly over the mapped bytes, so only the parsed values are ever created.
+"""
+import mmap
+import re
+
+SHIP_LOCATION_PATTERN = re.compile(rb'\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\w)\s*\)')
+SHIP_LOCATIONS_PATTERN = re.compile(rb'\s*(?:%s\s*)*' % SHIP_LOCATION_PATTERN.pattern)
+COMMAND_PATTERN = re.compile(rb'\s*\(\s*(\d+)\s*,\s*(\d+)\s*\)\s*(\S*)\s*')
+
+
+def lineEnd(contents, start):
+    """
+    Returns the index of the newline ending the line that begins at 'start', or the end of the contents.
+    """
+    end = contents.find(b'\n', start)
+    return len(contents) if end == -1 else end
+
+
+def tokenizeMappedCommand(contents, start, end):
+    """
+    Parses and classifies the move or shoot command between 'start' and 'end' of the mapped bytes.
+    Raises a ValueError if the line is neither.
+    Example input: b'(0, 0) MRMLMM\n(9, 2)\n', 0, 13
+    Example output: ((0, 0), 'MRMLMM')
+    """
+    match = COMMAND_PATTERN.fullmatch(contents, start, end)
+    if match is None:
+        raise ValueError("Invalid command. %s was given." % contents[start:end].decode(errors='replace'))
+    x, y, moveOperations = match.groups()
+    if moveOperations:
+        return (int(x), int(y)), moveOperations.decode()
+    return int(x), int(y)
+
+
+def mappedCommands(contents, start, onFinished=None):
+    """
+    Yields each command from 'start' to the end of the mapped bytes, calling 'onFinished' once done.
+    """
+    try:
+        size = len(contents)
+        while start < size:
+            end = lineEnd(contents, start)
+            yield tokenizeMappedCommand(contents, start, end)
+            start = end + 1
+    finally:
+        if onFinished is not None:
+            onFinished()
+
+
+def readMappedInput(fileName, stream=False):
+    """
+    Memory-maps an input file and returns a dictionary of the game parameters, in the same form as
+    ShipGame.assignGameParameters. The file name is used as given; it is not looked up in the package.
+    When streaming, the commands are a generator that keeps the file mapped until it is exhausted.
+    Example input: '/data/games/input.txt'
+    Example output: {'boardSize': 10,
+                     'shipLocations': [((0, 0), 'N'), ((9, 2), 'E')],
+                     'movingAndShootingCommands': [((0, 0), 'MRMLMM'), (9, 2)]}
+    """
+    inputFile = open(fileName, 'rb')
+    try:
+        contents = mmap.mmap(inputFile.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        inputFile.close()
+        return {}
+
+    def close():
+        contents.close()
+        inputFile.close()
+
+    gameInformation = {}
+    try:
+        end = lineEnd(contents, 0)
+        gameInformation['boardSize'] = int(contents[0:end])
+
+        start = end + 1
+        if start < len(contents):
+            end = lineEnd(contents, start)
+            if SHIP_LOCATIONS_PATTERN.fullmatch(contents, start, end) is None:
+                raise ValueError("Invalid ship locations. %s was given." % contents[start:end].decode(errors='replace'))
+            gameInformation['shipLocations'] = [((int(x), int(y)), direction.decode()) for x, y, direction
+                                                in SHIP_LOCATION_PATTERN.findall(contents, start, end)]
+            start = end + 1
+
+        commands = mappedCommands(contents, start, close)
+    except Exception:
+        close()
+        raise
+
+    if stream:
+        gameInformation['movingAndShootingCommands'] = commands
+        return gameInformation
+
+    movingAndShootingCommands = list(commands)
+
+    if movingAndShootingCommands:
+        gameInformation['movingAndShootingCommands'] = movingAndShootingCommands
+
+    return gameInformation
@@ -0,0 +1,104 @@
+import json
+import time
+from collections import Counter
+from functools import partial
+
+TIMED_METHODS = ('parseInputFile', 'mapInputFile', 'readBinaryFile', 'assignGameParameters', 'initialiseBoard',
+                 'initialiseShipLocations', 'calculateGame', 'moveShip', 'shootShip', 'shootShips', 'writeOutput')
+
+
+class Instrumentation(object):
+    """
+    Collects per-phase timers and per-operation statistics for a ShipGame.
+    It works by shadowing the game's methods with timed wrappers on the instance, so a game that
+    is not instrumented runs its plain methods with no extra cost.
+    """
+
+    def __init__(self):
+        self.timers = {}
+        self.moveCount = 0
+        self.shootCount = 0
+        self.rejectedMoveCount = 0
+        self.moveLengthHistogram = Counter()
+
+    def attach(self, game):
+        """
+        Wraps each timed method of the game so that calls to it are recorded here.
+        """
+        wrappers = {name: partial(self.timed, name) for name in TIMED_METHODS}
+        for name in ('moveShip', 'shootShip', 'shootShips'):
+            wrappers[name] = partial(self.counted, name)
+        game.shadowMethods(self, wrappers)
+
+    def detach(self, game):
+        """
+        Removes the wrappers added by attach, leaving any other wrappers on the game in place.
+        """
+        game.unshadowMethods(self)
+
+    def counted(self, name, method):
+        """
+        Returns a timed wrapper around the moveShip, shootShip or shootShips 'method' that also counts operations.
+        """
+        method = self.timed(name, method)
+
+        def countedMoveShip(shipLocation, moveCommands):
+            self.moveCount += 1
+            self.moveLengthHistogram[len(moveCommands)] += 1
+            moved = method(shipLocation, moveCommands)
+            if moved is False:
+                self.rejectedMoveCount += 1
+            return moved
+
+        def countedShootShip(shipLocation):
+            self.shootCount += 1
+            return method(shipLocation)
+
+        def countedShootShips(shipLocations):
+            if not hasattr(shipLocations, '__len__'):
+                shipLocations = list(shipLocations)
+            self.shootCount += len(shipLocations)
+            return method(shipLocations)
+
+        return {'moveShip': countedMoveShip, 'shootShip': countedShootShip, 'shootShips': countedShootShips}[name]
+
+    def timed(self, name, method):
+        """
+        Returns a wrapper around 'method' that adds the time spent in each call to the 'name' timer.
+        """
+        timer = self.timers.setdefault(name, {'calls': 0, 'seconds': 0.0})
+
+        def timedMethod(*arguments, **keywordArguments):
+            start = time.perf_counter()
+            try:
+                return method(*arguments, **keywordArguments)
+            finally:
+                timer['calls'] += 1
+                timer['seconds'] += time.perf_counter() - start
+
+        return timedMethod
+
+    def toDict(self):
+        """
+        Returns the collected statistics as a JSON serialisable dictionary.
+        Example output: {'timers': {'moveShip': {'calls': 1, 'seconds': 1.2e-05}, ...},
+                         'moves': 1, 'shoots': 1, 'rejectedMoves': 0, 'moveLengthHistogram': {'6': 1}}
+        """
+        return {'timers': {name: dict(timer) for name, timer in self.timers.items()},
+                'moves': self.moveCount,
+                'shoots': self.shootCount,
+                'rejectedMoves': self.rejectedMoveCount,
+                'moveLengthHistogram': {str(length): count for length, count in sorted(self.moveLengthHistogram.items())}}
+
+    def toJson(self, **keywordArguments):
+        """
+        Returns the collected statistics as a JSON string.
+        """
+        return json.dumps(self.toDict(), sort_keys=True, **keywordArguments)
+
+    def writeJson(self, fileName):
+        """
+        Writes the collected statistics as JSON to 'fileName'.
+        """
+        with open(fileName, 'w') as output:
+            output.write(self.toJson(indent=2))
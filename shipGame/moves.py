@@ -0,0 +1,42 @@
+from functools import lru_cache
+
+COMPASS = ('N', 'E', 'S', 'W')
+STEPS = {'N': (0, 1), 'E': (1, 0), 'S': (0, -1), 'W': (-1, 0)}
+TURNS = {'L': -1, 'R': 1}
+MOVE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=MOVE_CACHE_SIZE)
+def compileMoves(direction, moveCommands):
+    """
+    Compiles a string of move operations for a ship facing 'direction' into its net effect.
+    Returns the x and y displacement, the final direction, and whether the ship moved forward at all
+    (a move that contains no 'M' only rotates the ship, so it always applies).
+    Results are kept in a bounded LRU cache keyed by (direction, moveCommands).
+    Example input: 'N', 'MRMLMM'
+    Example output: (1, 3, 'N', True)
+    """
+    heading = COMPASS.index(direction)
+    x, y = 0, 0
+    moved = False
+
+    for moveCommand in moveCommands:
+        if moveCommand == 'M':
+            stepX, stepY = STEPS[COMPASS[heading]]
+            x += stepX
+            y += stepY
+            moved = True
+        elif moveCommand in TURNS:
+            heading = (heading + TURNS[moveCommand]) % 4
+        else:
+            raise ValueError("Invalid move operations. Must be in 'MRL'. %s was given." % moveCommand)
+
+    return x, y, COMPASS[heading], moved
+
+
+def moveCacheInfo():
+    """
+    Returns the hit, miss and size statistics of the compiled move cache.
+    Example output: CacheInfo(hits=3, misses=1, maxsize=4096, currsize=1)
+    """
+    return compileMoves.cache_info()
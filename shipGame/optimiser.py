@@ -0,0 +1,174 @@
+"""
+An optional pre-pass that simplifies a game's operations before calculateGame runs them, without
+changing the final board or sunken ships.
+
+The pass tracks which cells are definitely occupied (and by a ship facing which way), which may be
+occupied, and which are definitely empty. With that it can:
+ - rewrite each move string as the shortest equivalent one (dropping LR/RL pairs, LLLL cycles, ...),
+ - drop shots at cells that are definitely empty,
+ - drop moves that are definitely no-ops: turns that end facing the same way, and moves that are
+   certain to be rejected because they end on an occupied cell (including their own starting cell),
+ - merge consecutive moves of the same ship when both are certain to be applied.
+Operations that would raise an error when run are always kept as they are.
+"""
+from shipGame.moves import COMPASS, compileMoves
+from shipGame.utils import isMoveCommand, isShootCommand
+
+TURNS = ('', 'R', 'RR', 'L')
+REMOVED = object()
+
+
+def turn(fromHeading, toHeading):
+    """
+    Returns the shortest rotation from one compass index to another.
+    Example input: 0, 3
+    Example output: 'L'
+    """
+    return TURNS[(toHeading - fromHeading) % 4]
+
+
+def simplifyMoves(moveCommands):
+    """
+    Returns the shortest move string found with the same effect as 'moveCommands' for a ship facing
+    any direction: the same displacement, final direction, and whether the ship moves forward at all.
+    Example input: 'MLRMLLLLM'
+    Example output: 'MMM'
+    """
+    x, y, finalDirection, moved = compileMoves('N', moveCommands)
+    finalHeading = COMPASS.index(finalDirection)
+
+    if not moved:
+        simplified = turn(0, finalHeading) or 'RRRR'
+        return simplified if len(simplified) < len(moveCommands) else moveCommands
+
+    segments = []
+    if y:
+        segments.append((0 if y > 0 else 2, abs(y)))
+    if x:
+        segments.append((1 if x > 0 else 3, abs(x)))
+    if not segments:
+        segments = [(0, 1), (2, 1)]
+
+    candidates = []
+    for ordering in (segments, segments[::-1]):
+        heading = 0
+        candidate = ''
+        for segmentHeading, steps in ordering:
+            candidate += turn(heading, segmentHeading) + 'M' * steps
+            heading = segmentHeading
+        candidates.append(candidate + turn(heading, finalHeading))
+
+    simplified = min(candidates, key=len)
+    return simplified if len(simplified) < len(moveCommands) else moveCommands
+
+
+def optimiseCommands(commands, shipLocations, inBounds):
+    """
+    Simplifies a list of move and shoot commands for a board whose occupied cells are 'shipLocations'
+    ((coordinates, direction) pairs) and whose cells are checked with 'inBounds'. Returns the simplified
+    commands and a report of what was changed. If every operation would be removed the commands are
+    returned unchanged, as calculateGame treats an empty operation log as an error. Commands that are neither
+    a move nor a shot are kept, so calculateGame still rejects them.
+    Example input: [((0, 0), 'MRLM'), (5, 5), (9, 2)], [((0, 0), 'N'), ((9, 2), 'E')], board.inBounds
+    Example output: [((0, 0), 'MM'), (9, 2)], {'operations': 3, 'remainingOperations': 2,
+                                               'removedOperations': 1, 'removedShots': 1, ...}
+    """
+    known = dict(shipLocations)
+    possible = {}
+    optimised = []
+    report = {'operations': 0, 'removedShots': 0, 'removedMoves': 0, 'mergedMoves': 0, 'simplifiedMoves': 0}
+    chain = None
+
+    def simplified(moveCommands):
+        simplifiedCommands = simplifyMoves(moveCommands)
+        if simplifiedCommands != moveCommands:
+            report['simplifiedMoves'] += 1
+        return simplifiedCommands
+
+    for command in commands:
+        report['operations'] += 1
+
+        if isMoveCommand(command):
+            location, moveCommands = command
+            if (not moveCommands or moveCommands.strip('MRL') or not inBounds(location)
+                    or (location not in known and location not in possible)):
+                optimised.append(command)
+                chain = None
+                continue
+
+            if location in possible:
+                headings = possible[location]
+                x, y, finalDirection, moved = compileMoves('N', moveCommands)
+                if not moved:
+                    possible[location] = {compileMoves(heading, moveCommands)[2] for heading in headings}
+                else:
+                    for heading in headings:
+                        x, y, finalDirection, moved = compileMoves(heading, moveCommands)
+                        destination = (location[0] + x, location[1] + y)
+                        if destination != location and inBounds(destination) and destination not in known:
+                            possible.setdefault(destination, set()).add(finalDirection)
+                optimised.append((location, simplified(moveCommands)))
+                chain = None
+                continue
+
+            heading = known[location]
+            x, y, finalDirection, moved = compileMoves(heading, moveCommands)
+            destination = (location[0] + x, location[1] + y)
+
+            if not moved and finalDirection == heading:
+                report['removedMoves'] += 1
+                continue
+            if moved and not inBounds(destination):
+                optimised.append(command)
+                chain = None
+                continue
+            if moved and (destination == location or destination in known):
+                report['removedMoves'] += 1
+                continue
+            if moved and destination in possible:
+                del known[location]
+                possible[location] = {heading}
+                possible[destination].add(finalDirection)
+                optimised.append((location, simplified(moveCommands)))
+                chain = None
+                continue
+
+            del known[location]
+            known[destination] = finalDirection
+
+            if chain is not None and chain[2] == location and (not moved or destination != chain[1]):
+                index, origin, _, chainCommands = chain
+                mergedCommands = simplifyMoves(chainCommands + moveCommands)
+                report['mergedMoves'] += 1
+                if compileMoves('N', mergedCommands)[2:] == ('N', False):
+                    optimised[index] = REMOVED
+                    chain = None
+                else:
+                    optimised[index] = (origin, mergedCommands)
+                    chain = (index, origin, destination, mergedCommands)
+                continue
+
+            simplifiedCommands = simplified(moveCommands)
+            optimised.append((location, simplifiedCommands))
+            chain = (len(optimised) - 1, location, destination, simplifiedCommands)
+
+        elif isShootCommand(command):
+            if inBounds(command) and command not in known and command not in possible:
+                report['removedShots'] += 1
+                continue
+            known.pop(command, None)
+            possible.pop(command, None)
+            optimised.append(command)
+            chain = None
+
+        else:
+            optimised.append(command)
+            chain = None
+
+    optimised = [command for command in optimised if command is not REMOVED]
+    if commands and not optimised:
+        optimised = list(commands)
+
+    report['remainingOperations'] = len(optimised)
+    report['removedOperations'] = report['operations'] - len(optimised)
+    return optimised, report
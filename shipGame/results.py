@@ -0,0 +1,143 @@
+"""
+A results store that keeps every game's final ships and sunken ships in a local SQLite database, so
+questions across many games are answered by an indexed query rather than by re-reading output files.
+Games are buffered and inserted in batches, each batch in a single transaction in which SQLite assigns
+the game ids, so several stores can write to the same database.
+Run with: python -m shipGame.results results.db
+"""
+import argparse
+import sqlite3
+import sys
+import time
+from shipGame.utils import tokenizeShipLocations
+
+BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (id INTEGER PRIMARY KEY, name TEXT NOT NULL, recordedAt REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS ships (game INTEGER NOT NULL REFERENCES games (id), x INTEGER NOT NULL,
+                                  y INTEGER NOT NULL, heading TEXT NOT NULL, sunk INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS gamesName ON games (name);
+CREATE INDEX IF NOT EXISTS shipsGame ON ships (game);
+CREATE INDEX IF NOT EXISTS shipsPosition ON ships (x, y);
+CREATE INDEX IF NOT EXISTS shipsSunkHeading ON ships (sunk, heading);
+CREATE INDEX IF NOT EXISTS shipsHeading ON ships (heading);
+"""
+
+
+def readOutputFile(fileName):
+    """
+    Reads a game's output file back into its ships afloat and its sunken ships.
+    Example input: 'games/001.output.txt'
+    Example output: ([((1, 3), 'N')], [((9, 2), 'E')])
+    """
+    ships = []
+    sunkenShips = []
+    with open(fileName) as outputFile:
+        for line in outputFile:
+            line = line.rstrip()
+            if line.endswith(' SUNK'):
+                sunkenShips.extend(tokenizeShipLocations(line[:-len(' SUNK')]))
+            else:
+                ships.extend(tokenizeShipLocations(line))
+    return ships, sunkenShips
+
+
+class ResultStore(object):
+    """
+    Final game states in the SQLite database 'fileName', created if it does not exist. Each game gets a row
+    in 'games', and each of its ships a row in 'ships' with its position, heading and whether it was sunk.
+    Games are held in memory until 'batchSize' of them are waiting, or flush is called, then written in one
+    transaction. Closing the store, or leaving it as a context manager, flushes any that are left.
+    Game ids are assigned by SQLite as each batch is written, so they are unique across stores.
+    """
+
+    def __init__(self, fileName, batchSize=BATCH_SIZE):
+        self.batchSize = batchSize
+        self.connection = sqlite3.connect(fileName)
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.execute('PRAGMA synchronous = NORMAL')
+        self.connection.executescript(SCHEMA)
+        self.pendingGames = []
+
+    def add(self, name, ships, sunkenShips):
+        """
+        Queues a game's final ships and sunken ships to be stored.
+        Example input: 'games/001.txt', [((1, 3), 'N')], [((9, 2), 'E')]
+        """
+        shipRows = [(x, y, direction, 0) for (x, y), direction in ships]
+        shipRows.extend((x, y, direction, 1) for (x, y), direction in sunkenShips)
+        self.pendingGames.append((name, time.time(), shipRows))
+        if len(self.pendingGames) >= self.batchSize:
+            self.flush()
+
+    def addGame(self, name, game):
+        """
+        Queues a calculated ShipGame's board and sunken ships to be stored.
+        """
+        self.add(name, game.board.occupiedCells(), game.sunkenShips)
+
+    def flush(self):
+        """
+        Writes every queued game in a single transaction and returns the ids SQLite gave them, in the order
+        they were added. If the transaction fails nothing is written and the games stay queued.
+        Example output: [1, 2]
+        """
+        if not self.pendingGames:
+            return []
+        games = []
+        ships = []
+        with self.connection:
+            cursor = self.connection.cursor()
+            for name, recordedAt, shipRows in self.pendingGames:
+                cursor.execute('INSERT INTO games (name, recordedAt) VALUES (?, ?)', (name, recordedAt))
+                game = cursor.lastrowid
+                games.append(game)
+                ships.extend((game,) + shipRow for shipRow in shipRows)
+            cursor.executemany('INSERT INTO ships VALUES (?, ?, ?, ?, ?)', ships)
+        self.pendingGames = []
+        return games
+
+    def query(self, sql, parameters=()):
+        """
+        Flushes any queued games, then returns every row of a query.
+        Example input: 'SELECT COUNT(*) FROM ships WHERE sunk = 1'
+        Example output: [(1,)]
+        """
+        self.flush()
+        return self.connection.execute(sql, parameters).fetchall()
+
+    def summary(self):
+        """
+        Example output: {'games': 1, 'ships': 1, 'sunkenShips': 1}
+        """
+        (games,), = self.query('SELECT COUNT(*) FROM games')
+        ships = dict(self.query('SELECT sunk, COUNT(*) FROM ships GROUP BY sunk'))
+        return {'games': games, 'ships': ships.get(0, 0), 'sunkenShips': ships.get(1, 0)}
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Summarise the games stored in a results database.')
+    parser.add_argument('database', help='SQLite database written by python -m shipGame.batch --results')
+    arguments = parser.parse_args(arguments)
+
+    with ResultStore(arguments.database) as store:
+        summary = store.summary()
+    print('%(games)d games: %(ships)d ships afloat, %(sunkenShips)d sunk.' % summary)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
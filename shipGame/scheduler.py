@@ -0,0 +1,232 @@
+"""
+Runs a game's operations in parallel where they cannot affect each other, with the same result as
+calculateGame running them one after another.
+
+A shot touches only the cell it is aimed at, and a move touches only its ship's cell and the cell it
+would end on, which, as the ship's direction is not known in advance, is taken as the end cell for each
+of the four directions. Operations with no cells in common commute. Each operation is given the level
+one above the latest level that touched any of its cells, so every level is a batch of independent
+operations that only depends on the levels before it. Each batch is split across worker processes (or
+threads), each given just the cells its operations touch.
+
+Working out and scheduling the cells each operation touches costs about as much as running the operation,
+and the workers then only share the rest of the work, so on CPython this rarely beats calculateGame. It therefore
+first runs a sample of operations one after another, and only goes parallel when the cost measured for
+that sample leaves room for a gain.
+"""
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from shipGame.app import ShipGame
+from shipGame.board import SparseBoard
+from shipGame.moves import COMPASS, compileMoves
+from shipGame.utils import isMoveCommand, isShootCommand
+
+MINIMUM_PARALLEL_BATCH = 256
+SAMPLE_OPERATIONS = 1000
+
+
+class RecordingBoard(SparseBoard):
+    """
+    A SparseBoard that notes the operation during which each cell last became occupied.
+    """
+
+    def __init__(self, size):
+        super().__init__(size)
+        self.operation = None
+        self.inserted = {}
+
+    def __setitem__(self, coordinates, direction):
+        occupied = coordinates in self.cells
+        super().__setitem__(coordinates, direction)
+        if direction != 0 and not occupied:
+            self.inserted[coordinates] = self.operation
+
+
+def operationCells(command):
+    """
+    Returns the cells an operation could read or change.
+    Example input: ((0, 0), 'MRMLMM')
+    Example output: {(0, 0), (1, 3), (3, -1), (-1, -3), (-3, 1)}
+    """
+    if isMoveCommand(command):
+        (x, y), moveCommands = command
+        if not moveCommands or moveCommands.strip('MRL'):
+            return {(x, y)}
+        # The displacement facing east, south and west is the one facing north turned a quarter at a time.
+        dx, dy, finalDirection, moved = compileMoves(COMPASS[0], moveCommands)
+        return {(x, y), (x + dx, y + dy), (x + dy, y - dx), (x - dx, y - dy), (x - dy, y + dx)}
+    elif isShootCommand(command):
+        return {command}
+    raise ValueError("Invalid command. %s was given." % (command,))
+
+
+def scheduleOperations(commands):
+    """
+    Groups operations into batches that can each run in parallel, in the order the batches must run.
+    Returns the batches as lists of operation indexes.
+    Example input: [((0, 0), 'M'), (5, 5), ((0, 1), 'M'), (0, 2)]
+    Example output: [[0, 1], [2], [3]]
+    """
+    return scheduleCells([operationCells(command) for command in commands])
+
+
+def scheduleCells(cellsList):
+    """
+    Groups operations, given as the cells each one touches, into batches as scheduleOperations does.
+    """
+    levels = {}
+    batches = []
+    for index, cells in enumerate(cellsList):
+        if not cells:
+            continue
+        level = max((levels.get(cell, -1) for cell in cells), default=-1) + 1
+        for cell in cells:
+            levels[cell] = level
+        if level == len(batches):
+            batches.append([])
+        batches[level].append(index)
+    return batches
+
+
+def runOperations(boardSize, cells, operations):
+    """
+    Runs independent operations against just the cells they touch. Returns the resulting occupied cells,
+    the operation during which each newly occupied cell was filled, and the ships sunk by each operation.
+    Example input: 10, {(0, 0): 'N'}, [(0, ((0, 0), 'MRMLMM'))]
+    Example output: ({(1, 3): 'N'}, {(1, 3): 0}, [])
+    """
+    game = ShipGame(lines=[str(boardSize), ''], boardClass=RecordingBoard)
+    for coordinates, direction in cells.items():
+        game.board[coordinates] = direction
+    game.board.inserted.clear()
+
+    sunkenShips = []
+    for index, command in operations:
+        game.board.operation = index
+        if isMoveCommand(command):
+            game.moveShip(command[0], command[1])
+        else:
+            game.shootShip(command)
+            if game.sunkenShips:
+                sunkenShips.append((index, game.sunkenShips.pop()))
+
+    return dict(game.board.cells), game.board.inserted, sunkenShips
+
+
+def gilEnabled():
+    isGilEnabled = getattr(sys, '_is_gil_enabled', None)
+    return isGilEnabled is None or isGilEnabled()
+
+
+def parallelCanWin(sample, operationSeconds, workers, threads):
+    """
+    Returns whether running operations in parallel could beat running them one after another, given a
+    sample of them and the time one takes to run. Every operation's cells have to be worked out and
+    scheduled here, and sent to a process and back, before the workers can share the rest of the work,
+    so if that alone costs more than the workers could save, calculateGame is faster.
+    Threads save nothing while the GIL is held.
+    """
+    if workers < 2 or (threads and gilEnabled()):
+        return False
+    start = time.perf_counter()
+    scheduleCells([operationCells(command) for command in sample])
+    if not threads:
+        pickle.loads(pickle.dumps(list(enumerate(sample))))
+    overheadSeconds = (time.perf_counter() - start) / len(sample)
+    return overheadSeconds < operationSeconds * (1 - 1 / workers)
+
+
+def calculateGameInParallel(game, commands=None, workers=None, threads=False, minimumBatch=MINIMUM_PARALLEL_BATCH,
+                            force=False):
+    """
+    Runs the move and shoot commands like calculateGame, but with each batch of independent operations split
+    across 'workers' processes, or threads when 'threads' is set. Batches smaller than 'minimumBatch' run in
+    this process. The board, the order its ships are listed in and the sunken ships end up exactly as they
+    would sequentially. The game itself is only updated once every batch has run, so if any operation fails
+    it is calculated sequentially instead, failing at the same point and with the same error as calculateGame.
+    Unless 'force' is set, the first SAMPLE_OPERATIONS operations are run one after another and timed, and
+    the rest are too when parallelCanWin finds that running them in parallel cannot be faster.
+    """
+    if commands is None:
+        commands = game.gameInformation['movingAndShootingCommands']
+    commands = list(commands)
+    if not commands:
+        raise TypeError('No commands to calculate')
+    workers = workers or os.cpu_count() or 1
+
+    if not force:
+        sample, commands = commands[:SAMPLE_OPERATIONS], commands[SAMPLE_OPERATIONS:]
+        start = time.perf_counter()
+        game.calculateGame(sample)
+        operationSeconds = (time.perf_counter() - start) / len(sample)
+        if not commands:
+            return
+        if not parallelCanWin(commands[:SAMPLE_OPERATIONS], operationSeconds, workers, threads):
+            game.calculateGame(commands)
+            return
+
+    try:
+        cells, inserted, sunkenShips = runBatches(game.board.size, list(game.board.occupiedCells()), commands,
+                                                  workers, threads, minimumBatch)
+    except Exception:
+        game.calculateGame(commands)
+        return
+
+    board = game.initialiseBoard(game.board.size)
+    for coordinates in sorted(cells, key=inserted.__getitem__):
+        board[coordinates] = cells[coordinates]
+    game.board = board
+    game.sunkenShips.extend(ship for index, ship in sorted(sunkenShips))
+
+
+def runBatches(boardSize, initialCells, commands, workers, threads, minimumBatch):
+    """
+    Runs every batch of operations, returning the final occupied cells, the operation during which each
+    was last filled (negative for the ships placed before the first operation) and the numbered sunken ships.
+    """
+    cells = dict(initialCells)
+    inserted = {coordinates: index - len(initialCells) for index, (coordinates, direction) in enumerate(initialCells)}
+    sunkenShips = []
+    executorClass = ThreadPoolExecutor if threads else ProcessPoolExecutor
+    executor = None
+
+    cellsList = [operationCells(command) for command in commands]
+
+    try:
+        for batch in scheduleCells(cellsList):
+            chunkCount = workers if len(batch) >= minimumBatch else 1
+            chunkSize = -(-len(batch) // chunkCount)
+            chunks = []
+            for start in range(0, len(batch), chunkSize):
+                operations = [(index, commands[index]) for index in batch[start:start + chunkSize]]
+                touched = set().union(*(cellsList[index] for index, command in operations))
+                chunks.append((touched, operations))
+
+            if len(chunks) == 1:
+                results = [runOperations(boardSize, {cell: cells[cell] for cell in chunks[0][0] if cell in cells},
+                                         chunks[0][1])]
+            else:
+                if executor is None:
+                    executor = executorClass(workers)
+                results = list(executor.map(runOperations, [boardSize] * len(chunks),
+                                            [{cell: cells[cell] for cell in touched if cell in cells}
+                                             for touched, operations in chunks],
+                                            [operations for touched, operations in chunks]))
+
+            for (touched, operations), (chunkCells, chunkInserted, chunkSunkenShips) in zip(chunks, results):
+                for cell in touched:
+                    if cell in chunkCells:
+                        cells[cell] = chunkCells[cell]
+                    else:
+                        cells.pop(cell, None)
+                        inserted.pop(cell, None)
+                inserted.update(chunkInserted)
+                sunkenShips.extend(chunkSunkenShips)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return cells, inserted, sunkenShips
@@ -0,0 +1,134 @@
+"""
+A long-lived asyncio game service that keeps many games in memory and serves a line-based
+protocol over TCP or a Unix socket. Each request is one line, using the input file syntax:
+
+    CREATE <game> <size> (0, 0, N) (9, 2, E)    ->  OK
+    MOVE <game> (0, 0) MRMLMM                   ->  OK MOVED | OK REJECTED
+    SHOOT <game> (9, 2)                         ->  OK SUNK (9, 2, E) | OK MISS
+    SNAPSHOT <game>                             ->  OK <n>, followed by n output lines
+    DROP <game>                                 ->  OK
+
+Any failure is answered with a single 'ERROR <message>' line.
+Run with: python -m shipGame.service --port 7878
+      or: python -m shipGame.service --unix /tmp/shipGame.sock
+"""
+import argparse
+import asyncio
+from shipGame.app import ShipGame
+from shipGame.board import SparseBoard
+from shipGame.utils import formatShipLocationOutput, formatMoveCommandInput, formatShootCommandInput
+
+
+class GameService(object):
+    """
+    Holds the games being served and answers protocol requests against them.
+    """
+
+    def __init__(self, boardClass=SparseBoard):
+        self.boardClass = boardClass
+        self.games = {}
+
+    def handleLine(self, line):
+        """
+        Answers a single protocol request, returning the response lines.
+        Example input: 'MOVE g1 (0, 0) MRMLMM'
+        Example output: ['OK MOVED']
+        """
+        parts = line.strip().split(None, 2)
+        if len(parts) < 2:
+            return ['ERROR Expected a command and a game name.']
+
+        command, gameName = parts[0].upper(), parts[1]
+        arguments = parts[2] if len(parts) == 3 else ''
+
+        try:
+            if command == 'CREATE':
+                return self.create(gameName, arguments)
+
+            game = self.games.get(gameName)
+            if game is None:
+                return ['ERROR No game named %s.' % gameName]
+
+            if command == 'MOVE':
+                shipLocation, moveCommands = formatMoveCommandInput(arguments)
+                return ['OK MOVED' if game.moveShip(shipLocation, moveCommands) else 'OK REJECTED']
+            elif command == 'SHOOT':
+                sunkenShipCount = len(game.sunkenShips)
+                game.shootShip(formatShootCommandInput(arguments))
+                if len(game.sunkenShips) == sunkenShipCount:
+                    return ['OK MISS']
+                return ['OK SUNK ' + formatShipLocationOutput(*game.sunkenShips[-1])]
+            elif command == 'SNAPSHOT':
+                lines = game.outputLines(sortedOutput=arguments.strip().lower() == 'sorted')
+                return ['OK %d' % len(lines)] + lines
+            elif command == 'DROP':
+                del self.games[gameName]
+                return ['OK']
+        except (KeyError, TypeError, ValueError) as error:
+            return ['ERROR %s: %s' % (type(error).__name__, error)]
+
+        return ['ERROR Unknown command %s.' % command]
+
+    def create(self, gameName, arguments):
+        """
+        Creates a game from its board size and ship list, replacing any game with the same name.
+        Example input: 'g1', '10 (0, 0, N) (9, 2, E)'
+        Example output: ['OK']
+        """
+        parts = arguments.split(None, 1)
+        if not parts:
+            return ['ERROR Expected a board size.']
+        try:
+            game = ShipGame(lines=[parts[0], parts[1] if len(parts) == 2 else ''], boardClass=self.boardClass)
+        except SystemExit as error:
+            return ['ERROR %s' % error]
+        self.games[gameName] = game
+        return ['OK']
+
+    async def handleConnection(self, reader, writer):
+        """
+        Answers each request line from a client until it disconnects.
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(('\n'.join(self.handleLine(line.decode())) + '\n').encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def startServer(service, host='127.0.0.1', port=7878, unixPath=None):
+    """
+    Starts serving 'service' over a Unix socket at 'unixPath', or otherwise over TCP, and returns the server.
+    """
+    if unixPath is not None:
+        return await asyncio.start_unix_server(service.handleConnection, path=unixPath)
+    return await asyncio.start_server(service.handleConnection, host, port)
+
+
+async def serve(host, port, unixPath):
+    server = await startServer(GameService(), host, port, unixPath)
+    async with server:
+        await server.serve_forever()
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Serve ship games over a line-based socket protocol.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7878)
+    parser.add_argument('--unix', help='serve on this Unix socket path instead of TCP')
+    arguments = parser.parse_args(arguments)
+
+    try:
+        asyncio.run(serve(arguments.host, arguments.port, arguments.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
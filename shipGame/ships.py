@@ -0,0 +1,149 @@
+from array import array
+from collections import namedtuple
+from shipGame.board import Board, HEADINGS, HEADING_CODES
+
+Ship = namedtuple('Ship', ['shipId', 'location', 'direction', 'sunk'])
+
+
+class ShipBoard(Board):
+    """
+    A board whose cells map to integer ship IDs, so each ship keeps its identity across moves and after
+    it sinks. Ships are stored as columns indexed by their ID: 32-bit x and y positions, a heading code byte
+    (1-4 for N, E, S, W) and a sunk flag byte.
+    This costs more memory than a SparseBoard: each ship's ID is an int object (about 32 bytes once there
+    are more than 256 ships) and its columns take 10 bytes, so a ship takes about 40 bytes more. Use a
+    SparseBoard when ship identity is not needed.
+    Once enableHistory is called, every placement, move and turn is also appended to an event log, in which
+    each event links to the same ship's previous event, so a ship's history costs O(its own events).
+    """
+
+    def __init__(self, size):
+        super().__init__(size)
+        self.cells = {}
+        self.xs = array('i')
+        self.ys = array('i')
+        self.headings = array('b')
+        self.sunk = array('b')
+        self.events = None
+        self.lastEvents = None
+
+    @property
+    def shipCount(self):
+        return len(self.headings)
+
+    def ship(self, shipId):
+        """
+        Returns a snapshot of a ship's location, direction and sunk flag.
+        Example input: 0
+        Example output: Ship(shipId=0, location=(1, 3), direction='N', sunk=False)
+        """
+        return Ship(shipId, (self.xs[shipId], self.ys[shipId]), HEADINGS[self.headings[shipId] - 1],
+                    bool(self.sunk[shipId]))
+
+    def shipAt(self, coordinates):
+        """
+        Returns the ID of the ship in a cell, or None if the cell is empty.
+        Example input: (1, 3)
+        Example output: 0
+        """
+        if not self.inBounds(coordinates):
+            raise KeyError(coordinates)
+        return self.cells.get(coordinates)
+
+    def enableHistory(self):
+        """
+        Starts logging every ship's placements, moves and turns, beginning with where the ships afloat are now.
+        The log is four append-only columns: x, y, heading code and the index of the ship's previous event,
+        or -1 for its first. Each ship's latest event index is kept in 'lastEvents'.
+        """
+        self.events = (array('i'), array('i'), array('b'), array('l'))
+        self.lastEvents = array('l', [-1]) * self.shipCount
+        for coordinates, shipId in self.cells.items():
+            self.logEvent(shipId)
+
+    def logEvent(self, shipId):
+        if self.events is not None:
+            xs, ys, headings, previousEvents = self.events
+            if shipId == len(self.lastEvents):
+                self.lastEvents.append(-1)
+            previousEvents.append(self.lastEvents[shipId])
+            self.lastEvents[shipId] = len(xs)
+            xs.append(self.xs[shipId])
+            ys.append(self.ys[shipId])
+            headings.append(self.headings[shipId])
+
+    def history(self, shipId):
+        """
+        Returns every (x, y, direction) a ship has had since enableHistory was called, oldest first.
+        Example input: 0
+        Example output: [(0, 0, 'N'), (1, 3, 'N')]
+        """
+        if self.events is None:
+            raise ValueError('Ship history is not being recorded. Call enableHistory first.')
+        xs, ys, headings, previousEvents = self.events
+        history = []
+        event = self.lastEvents[shipId]
+        while event >= 0:
+            history.append((xs[event], ys[event], HEADINGS[headings[event] - 1]))
+            event = previousEvents[event]
+        history.reverse()
+        return history
+
+    def occupiedCells(self):
+        """
+        Returns the coordinates and directions of every occupied cell, in placement order.
+        Example output: [((0, 0), 'N'), ((9, 2), 'E')]
+        """
+        headings = self.headings
+        return [(coordinates, HEADINGS[headings[shipId] - 1]) for coordinates, shipId in self.cells.items()]
+
+    def relocate(self, origin, destination, direction):
+        if not self.inBounds(destination):
+            raise KeyError(destination)
+        shipId = self.cells.pop(origin)
+        self.cells[destination] = shipId
+        self.xs[shipId], self.ys[shipId] = destination
+        self.headings[shipId] = HEADING_CODES[direction]
+        self.logEvent(shipId)
+
+    def sinkCells(self, coordinatesList):
+        coordinatesList = self.validateCoordinates(coordinatesList)
+
+        sunkenShips = []
+        for coordinates in coordinatesList:
+            shipId = self.cells.pop(coordinates, None)
+            if shipId is not None:
+                self.sunk[shipId] = 1
+                sunkenShips.append((coordinates, HEADINGS[self.headings[shipId] - 1]))
+        return sunkenShips
+
+    def __getitem__(self, coordinates):
+        if not self.inBounds(coordinates):
+            raise KeyError(coordinates)
+        shipId = self.cells.get(coordinates)
+        return 0 if shipId is None else HEADINGS[self.headings[shipId] - 1]
+
+    def __setitem__(self, coordinates, direction):
+        """
+        Turns the ship already in a cell, places a new ship in an empty cell, or, when 'direction' is 0,
+        sinks the ship in the cell.
+        """
+        if not self.inBounds(coordinates):
+            raise KeyError(coordinates)
+        shipId = self.cells.get(coordinates)
+
+        if direction == 0:
+            if shipId is not None:
+                del self.cells[coordinates]
+                self.sunk[shipId] = 1
+            return
+
+        if shipId is None:
+            shipId = self.cells[coordinates] = len(self.headings)
+            self.xs.append(coordinates[0])
+            self.ys.append(coordinates[1])
+            self.headings.append(HEADING_CODES[direction])
+            self.sunk.append(0)
+        else:
+            self.headings[shipId] = HEADING_CODES[direction]
+        self.logEvent(shipId)
@@ -0,0 +1,112 @@
+"""
+A board with a spatial index over its ships, for asking which ships are inside a rectangle and
+which ship is nearest to a point without scanning the whole board.
+"""
+from shipGame.board import SparseBoard
+
+TILE_SIZE = 16
+
+
+class IndexedBoard(SparseBoard):
+    """
+    A SparseBoard that also buckets its occupied cells into square tiles of 'tileSize' x 'tileSize' cells.
+    Only tiles holding at least one ship are stored. Every change to the board goes through __setitem__ or
+    sinkCells, so placing, moving and shooting ships keeps the index in sync.
+    Use it with ShipGame(..., boardClass=IndexedBoard).
+    """
+
+    def __init__(self, size, tileSize=TILE_SIZE):
+        super().__init__(size)
+        self.tileSize = tileSize
+        self.tiles = {}
+
+    def tileOf(self, coordinates):
+        """
+        Returns the key of the tile holding a cell.
+        Example input: (17, 3)
+        Example output: (1, 0)
+        """
+        return coordinates[0] // self.tileSize, coordinates[1] // self.tileSize
+
+    def sinkCells(self, coordinatesList):
+        sunkenShips = super().sinkCells(coordinatesList)
+        for coordinates, direction in sunkenShips:
+            self.unindex(coordinates)
+        return sunkenShips
+
+    def unindex(self, coordinates):
+        tile = self.tileOf(coordinates)
+        cells = self.tiles[tile]
+        cells.discard(coordinates)
+        if not cells:
+            del self.tiles[tile]
+
+    def __setitem__(self, coordinates, direction):
+        occupied = coordinates in self.cells
+        super().__setitem__(coordinates, direction)
+        if direction == 0:
+            if occupied:
+                self.unindex(coordinates)
+        elif not occupied:
+            self.tiles.setdefault(self.tileOf(coordinates), set()).add(coordinates)
+
+    def shipsInRegion(self, lower, upper):
+        """
+        Returns the ships inside the rectangle between the 'lower' and 'upper' corners, both included,
+        sorted by coordinates. Only the tiles overlapping the rectangle that hold ships are visited.
+        Example input: (0, 0), (4, 4)
+        Example output: [((0, 0), 'N'), ((1, 3), 'N')]
+        """
+        (lowerX, lowerY), (upperX, upperY) = lower, upper
+        lowerTileX, lowerTileY = self.tileOf((max(lowerX, 0), max(lowerY, 0)))
+        upperTileX, upperTileY = self.tileOf((min(upperX, self.size - 1), min(upperY, self.size - 1)))
+        if lowerTileX > upperTileX or lowerTileY > upperTileY:
+            return []
+
+        if (upperTileX - lowerTileX + 1) * (upperTileY - lowerTileY + 1) <= len(self.tiles):
+            tiles = (self.tiles.get((tileX, tileY), ()) for tileX in range(lowerTileX, upperTileX + 1)
+                     for tileY in range(lowerTileY, upperTileY + 1))
+        else:
+            tiles = (cells for (tileX, tileY), cells in self.tiles.items()
+                     if lowerTileX <= tileX <= upperTileX and lowerTileY <= tileY <= upperTileY)
+
+        return sorted((coordinates, self.cells[coordinates]) for cells in tiles for coordinates in cells
+                      if lowerX <= coordinates[0] <= upperX and lowerY <= coordinates[1] <= upperY)
+
+    def nearestShip(self, point):
+        """
+        Returns the ship nearest to 'point' by straight line distance, preferring the lowest coordinates
+        on a tie, or None if the board has no ships. Tiles are searched in rings outwards from the point
+        until no nearer ship can remain, or all tiles with ships are checked once that would be cheaper.
+        Example input: (2, 2)
+        Example output: ((1, 3), 'N')
+        """
+        if not self.tiles:
+            return None
+
+        pointX, pointY = point
+        centreX, centreY = self.tileOf(point)
+        best = None
+
+        def closer(cells, best):
+            for coordinates in cells:
+                candidate = ((coordinates[0] - pointX) ** 2 + (coordinates[1] - pointY) ** 2, coordinates)
+                if best is None or candidate < best:
+                    best = candidate
+            return best
+
+        ring = 0
+        while True:
+            if best is not None and ring and ((ring - 1) * self.tileSize + 1) ** 2 > best[0]:
+                break
+            if (2 * ring + 1) ** 2 > len(self.tiles):
+                for cells in self.tiles.values():
+                    best = closer(cells, best)
+                break
+            for tileX in range(centreX - ring, centreX + ring + 1):
+                for tileY in range(centreY - ring, centreY + ring + 1):
+                    if max(abs(tileX - centreX), abs(tileY - centreY)) == ring and (tileX, tileY) in self.tiles:
+                        best = closer(self.tiles[(tileX, tileY)], best)
+            ring += 1
+
+        return best[1], self.cells[best[1]]
@@ -0,0 +1,64 @@
+import pytest
+from shipGame.batch import findInputFiles, outputFilename, runBatch, main
+
+
+@pytest.fixture
+def gameDirectory(tmpdir):
+    tmpdir.join('001.txt').write('10\n(0, 0, N) (9, 2, E)\n(0, 0) MRMLMM\n(9, 2)\n')
+    tmpdir.join('002.txt').write('10\n(1, 1, E)\n(1, 1) MM\n')
+    tmpdir.join('003.txt').write('10\n')
+    tmpdir.join('000.output.txt').write('stale output\n')
+    return tmpdir
+
+
+def test_findInputFiles(gameDirectory):
+    inputFilenames = findInputFiles(str(gameDirectory))
+    assert [filename.split('/')[-1] for filename in inputFilenames] == ['001.txt', '002.txt', '003.txt']
+    assert findInputFiles(str(gameDirectory.join('00[12].txt'))) == inputFilenames[:2]
+
+
+def test_outputFilename():
+    assert outputFilename('games/001.txt') == 'games/001.output.txt'
+
+
+def test_runBatch_reports_failures(gameDirectory):
+    failures, cacheStatistics = runBatch(findInputFiles(str(gameDirectory)), workers=2)
+
+    assert [filename.split('/')[-1] for filename, error in failures] == ['003.txt']
+    assert gameDirectory.join('001.output.txt').read().splitlines() == ['(1, 3, N)', '(9, 2, E) SUNK']
+    assert gameDirectory.join('002.output.txt').read().splitlines() == ['(3, 1, E)']
+
+
+def test_main(gameDirectory, capsys):
+    assert main([str(gameDirectory.join('00[12].txt')), '--workers', '1', '--stream']) == 0
+    assert '2 games (0 failed)' in capsys.readouterr()[0]
+    assert main([str(gameDirectory.join('00[12].txt')), '--workers', '1', '--mapped']) == 0
+    assert '2 games (0 failed)' in capsys.readouterr()[0]
+
+
+def test_runBatch_counts_cache_hits(gameDirectory, capsys):
+    inputFilenames = findInputFiles(str(gameDirectory))
+    cacheDirectory = str(gameDirectory.join('cache'))
+
+    assert runBatch(inputFilenames, workers=1, cacheDirectory=cacheDirectory)[1] == {'hits': 0, 'misses': 3}
+    assert runBatch(inputFilenames, workers=1, cacheDirectory=cacheDirectory)[1] == {'hits': 2, 'misses': 1}
+    assert gameDirectory.join('001.output.txt').read().splitlines() == ['(1, 3, N)', '(9, 2, E) SUNK']
+
+    main([str(gameDirectory), '--workers', '1', '--cache', cacheDirectory, '--cache-max-age', '3600'])
+    assert 'cache hits: 2, misses: 1' in capsys.readouterr()[0]
+
+
+def test_runBatch_stores_results(gameDirectory):
+    from shipGame.results import ResultStore
+    resultsFile = str(gameDirectory.join('results.db'))
+
+    failures, cacheStatistics = runBatch(findInputFiles(str(gameDirectory)), workers=2, resultsFilename=resultsFile)
+
+    assert len(failures) == 1
+    with ResultStore(resultsFile) as store:
+        assert store.summary() == {'games': 2, 'ships': 2, 'sunkenShips': 1}
+        assert store.query('SELECT x, y, heading FROM ships WHERE sunk = 1') == [(9, 2, 'E')]
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,30 @@
+import pytest
+from shipGame.benchmarks.suite import PHASES, runSuite, compareResults, measureStartup
+
+
+def test_runSuite_records_every_phase():
+    results = runSuite(['small'])
+    assert sorted(results['small']) == sorted(PHASES)
+    for measurements in results['small'].values():
+        assert measurements['opsPerSecond'] > 0
+        assert measurements['peakMemory'] >= 0
+
+
+def test_compareResults():
+    baseline = {'small': {'parse': {'opsPerSecond': 1000.0, 'peakMemory': 1000}}}
+
+    assert compareResults({'small': {'parse': {'opsPerSecond': 900.0, 'peakMemory': 1100}}}, baseline) == []
+    assert len(compareResults({'small': {'parse': {'opsPerSecond': 500.0, 'peakMemory': 2000}}}, baseline)) == 2
+    assert compareResults({'medium': {'parse': {'opsPerSecond': 1.0, 'peakMemory': 1}}}, baseline) == []
+
+
+def test_measureStartup():
+    results = measureStartup(runs=1)
+    assert sorted(results) == ['cli', 'import', 'interpreter']
+    for measurements in results.values():
+        assert measurements['seconds'] > 0
+    assert compareResults({'startup': results}, {'startup': results}) == []
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,86 @@
+import pytest
+from shipGame.app import ShipGame
+from shipGame.binary import encodeGame, decodeGame, textToBinary, smallestTypecode, main
+from shipGame.generator import writeGame
+
+GAME = {'boardSize': 10,
+        'shipLocations': [((0, 0), 'N'), ((9, 2), 'E')],
+        'movingAndShootingCommands': [((0, 0), 'MRMLMM'), (9, 2), ((1, 3), 'LLLLRRRRM')]}
+
+
+def test_smallestTypecode():
+    assert smallestTypecode(0) == 'B'
+    assert smallestTypecode(255) == 'B'
+    assert smallestTypecode(256) == 'H'
+    assert smallestTypecode(70000) == 'I'
+
+
+def test_encodeGame_round_trip():
+    data = encodeGame(GAME)
+    assert decodeGame(data) == GAME
+    assert len(data) < 60
+
+
+def test_encodeGame_without_operations():
+    gameInformation = {'boardSize': 3000, 'shipLocations': [((2999, 0), 'S')]}
+    assert decodeGame(encodeGame(gameInformation)) == gameInformation
+
+
+def test_encodeGame_invalid_moves():
+    with pytest.raises(ValueError):
+        encodeGame({'boardSize': 10, 'shipLocations': [], 'movingAndShootingCommands': [((0, 0), 'MXM')]})
+
+
+def test_encodeGame_invalid_commands():
+    with pytest.raises(ValueError):
+        encodeGame({'boardSize': 10, 'shipLocations': [], 'movingAndShootingCommands': [(0, 0), None]})
+
+
+@pytest.mark.parametrize('contents', ['10\n', '10'])
+def test_textToBinary_without_ship_line(tmpdir, contents):
+    inputFile = tmpdir.join('game.txt')
+    inputFile.write(contents)
+    with pytest.raises(SystemExit):
+        ShipGame(str(inputFile))
+    with pytest.raises(ValueError):
+        textToBinary(str(inputFile), str(tmpdir.join('game.shpg')))
+    with pytest.raises(ValueError):
+        encodeGame({'boardSize': 10})
+
+
+def test_textToBinary_invalid_lines(tmpdir):
+    inputFile = tmpdir.join('game.txt')
+    inputFile.write('10\n(0, 0, N)\n(0, 0) M\nnot a command\n')
+    with pytest.raises(ValueError):
+        textToBinary(str(inputFile), str(tmpdir.join('game.shpg')))
+
+
+def test_decodeGame_invalid_data():
+    with pytest.raises(ValueError):
+        decodeGame(b'NOPE' + bytes(40))
+    with pytest.raises(ValueError):
+        decodeGame(encodeGame(GAME)[:-3])
+
+
+def test_converters(tmpdir):
+    inputFile = tmpdir.join('game.txt')
+    writeGame(str(inputFile), 300, 50, 500, moveLength=7, moveRatio=0.7, seed=4)
+    binaryFile = tmpdir.join('game.shpg')
+    textFile = tmpdir.join('game.copy.txt')
+
+    main(['to-binary', str(inputFile), str(binaryFile)])
+    main(['to-text', str(binaryFile), str(textFile)])
+
+    assert textFile.read() == inputFile.read()
+    assert binaryFile.size() * 2 < inputFile.size()
+
+
+def test_binary_game(tmpdir):
+    binaryFile = tmpdir.join('input.shpg')
+    textToBinary('shipGame/tests/inputs/input.txt', str(binaryFile))
+
+    testGame = ShipGame(str(binaryFile), binary=True)
+    assert testGame.gameInformation == ShipGame('tests/inputs/input.txt').gameInformation
+
+    testGame.calculateGame()
+    assert testGame.outputLines() == ['(1, 3, N)', '(9, 2, E) SUNK']
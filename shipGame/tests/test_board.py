@@ -0,0 +1,118 @@
+import pytest
+from shipGame.app import ShipGame
+from shipGame.board import SparseBoard, ArrayBoard
+
+
+def test_sparseBoard_size_of_float():
+    with pytest.raises(TypeError):
+        SparseBoard(1.5)
+
+
+def test_sparseBoard_empty_cells_read_as_zero():
+    board = SparseBoard(10)
+    assert board[(0, 0)] == 0
+    assert board.get((9, 9)) == 0
+    assert board.cells == {}
+
+
+def test_sparseBoard_out_of_bounds():
+    board = SparseBoard(10)
+
+    with pytest.raises(KeyError):
+        board[(10, 0)]
+
+    with pytest.raises(KeyError):
+        board[(0, -1)] = 'N'
+
+    with pytest.raises(KeyError):
+        board['invalid']
+
+    assert board.get((0, 10)) is None
+
+
+def test_sparseBoard_only_stores_occupied_cells():
+    board = SparseBoard(10 ** 6)
+    board[(999999, 0)] = 'E'
+    board[(5, 5)] = 'N'
+    board[(5, 5)] = 0
+    assert board.cells == {(999999, 0): 'E'}
+    assert list(board.occupiedCells()) == [((999999, 0), 'E')]
+    assert len(board) == 10 ** 12
+
+
+def test_sparseBoard_fromMapping():
+    board = SparseBoard.fromMapping({(0, 0): 0, (0, 1): 'N', (1, 0): 0, (1, 1): 0})
+    assert board.size == 2
+    assert board == {(0, 0): 0, (0, 1): 'N', (1, 0): 0, (1, 1): 0}
+
+
+def test_arrayBoard_cells():
+    pytest.importorskip('numpy')
+    board = ArrayBoard(10)
+    board[(9, 2)] = 'E'
+    board[(0, 0)] = 'N'
+    assert board[(9, 2)] == 'E'
+    assert board.get((5, 5)) == 0
+    assert board.grid.dtype.itemsize == 1
+
+    with pytest.raises(KeyError):
+        board[(10, 0)]
+
+    with pytest.raises(ValueError):
+        board[(1, 1)] = 'T'
+
+
+def test_arrayBoard_occupiedCells_and_analytics():
+    pytest.importorskip('numpy')
+    board = ArrayBoard(10)
+    board[(9, 2)] = 'E'
+    board[(0, 0)] = 'N'
+    board[(4, 4)] = 'E'
+    board[(4, 4)] = 0
+    assert board.occupiedCells() == [((0, 0), 'N'), ((9, 2), 'E')]
+    assert board.occupancyCount() == 2
+    assert board.headingCounts() == {'N': 1, 'E': 1, 'S': 0, 'W': 0}
+    assert board.heatmap(5).tolist() == [[1, 0], [1, 0]]
+    assert board.heatmap(3).sum() == 2
+
+
+def test_arrayBoard_sinkCells():
+    numpy = pytest.importorskip('numpy')
+    board = ArrayBoard(10)
+    board[(9, 2)] = 'E'
+    board[(0, 0)] = 'N'
+    board[(3, 3)] = 'S'
+    assert board.sinkCells(numpy.array([[9, 2], [5, 5], [0, 0], [9, 2]])) == [((9, 2), 'E'), ((0, 0), 'N')]
+    assert board.occupiedCells() == [((3, 3), 'S')]
+
+    with pytest.raises(KeyError):
+        board.sinkCells([(3, 3), (10, 0)])
+    assert board[(3, 3)] == 'S'
+    assert board.sinkCells([]) == []
+    assert board.sinkCells(iter([(5, 5)])) == []
+
+
+@pytest.mark.parametrize('coordinatesList', [[1, 3, 3, 4], [(1, 2, 3), (3, 3, 6)], [(3.2, 3)], [(3, 3), (0,)],
+                                             [[True, True]], 'abcd'])
+def test_arrayBoard_sinkCells_invalid_shapes(coordinatesList):
+    pytest.importorskip('numpy')
+    board = ArrayBoard(10)
+    board[(3, 3)] = 'S'
+    with pytest.raises(KeyError):
+        board.sinkCells(coordinatesList)
+    assert board[(3, 3)] == 'S'
+
+
+def test_arrayBoard_game():
+    pytest.importorskip('numpy')
+    testGame = ShipGame("tests/inputs/input.txt", boardClass=ArrayBoard)
+
+    testGame.calculateGame()
+
+    assert isinstance(testGame.board, ArrayBoard)
+    assert testGame.board.occupiedCells() == [((1, 3), 'N')]
+    assert testGame.sunkenShips == [((9, 2), 'E')]
+
+
+if __name__ == '__main__':
+    pytest.main()
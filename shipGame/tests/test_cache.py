@@ -0,0 +1,126 @@
+import os
+import time
+from multiprocessing import Pool
+from shipGame.board import ArrayBoard, SparseBoard
+from shipGame.cache import ResultCache, cachedOutput, outputVariant, writeCachedOutput
+from shipGame.cli import main
+
+INPUT = '10\n(0, 0, N) (9, 2, E) (4, 4, W)\n(0, 0) MRMLMM\n(9, 2)\n'
+OUTPUT = '(1, 3, N)\n(4, 4, W)\n(9, 2, E) SUNK\n'
+
+
+def countingCalculate(calls, lines=('(1, 3, N)', '(4, 4, W)', '(9, 2, E) SUNK')):
+    def calculate():
+        calls.append(1)
+        return list(lines)
+    return calculate
+
+
+def test_key_depends_on_contents_and_variant(tmpdir):
+    cache = ResultCache(str(tmpdir.join('cache')))
+    first, second = tmpdir.join('first.txt'), tmpdir.join('second.txt')
+    first.write(INPUT)
+    second.write(INPUT)
+
+    assert cache.key(str(first)) == cache.key(str(second))
+    assert cache.key(str(first), outputVariant(SparseBoard)) != cache.key(str(first), outputVariant(ArrayBoard))
+    second.write(INPUT + '(5, 5)\n')
+    assert cache.key(str(first)) != cache.key(str(second))
+
+
+def test_writeCachedOutput_hits_on_repeated_input(tmpdir):
+    cache = ResultCache(str(tmpdir.join('cache')))
+    inputFile = tmpdir.join('input.txt')
+    inputFile.write(INPUT)
+    calls = []
+
+    assert not writeCachedOutput(cache, str(inputFile), str(tmpdir.join('first.txt')), countingCalculate(calls))
+    assert writeCachedOutput(cache, str(inputFile), str(tmpdir.join('second.txt')), countingCalculate(calls))
+    assert cachedOutput(cache, str(inputFile), countingCalculate(calls)) == OUTPUT
+
+    assert len(calls) == 1
+    assert tmpdir.join('first.txt').read() == tmpdir.join('second.txt').read() == OUTPUT
+    assert cache.statistics() == {'hits': 2, 'misses': 1, 'entries': 1, 'bytes': len(OUTPUT)}
+
+
+def test_evict_least_recently_used_over_size(tmpdir):
+    cache = ResultCache(str(tmpdir.join('cache')))
+    for index, key in enumerate(['aa01', 'bb02', 'cc03']):
+        cache.store(key, '0123456789\n')
+        os.utime(cache.entryPath(key), (1000 + index, 1000 + index))
+    cache.maxBytes = 25
+    os.utime(cache.entryPath('aa01'), (2000, 2000))
+
+    assert cache.evict() == 1
+    assert cache.read('aa01') is not None
+    assert cache.read('bb02') is None
+    assert cache.read('cc03') is not None
+
+
+def test_store_only_scans_when_over_the_limit(tmpdir, monkeypatch):
+    cache = ResultCache(str(tmpdir.join('cache')), maxBytes=100)
+    scans = []
+    entries = cache.entries
+    monkeypatch.setattr(cache, 'entries', lambda: scans.append(1) or entries())
+
+    for index in range(9):
+        cache.store('%02x' % index, '0123456789\n')
+    assert len(scans) == 1
+    assert cache.totalBytes == 99
+
+    cache.store('09', '0123456789\n')
+    assert len(scans) == 2
+    assert cache.totalBytes <= 90
+    assert cache.statistics()['bytes'] == cache.totalBytes
+
+
+def test_expired_entries_miss_and_are_evicted(tmpdir):
+    cache = ResultCache(str(tmpdir.join('cache')), maxAge=60)
+    cache.store('aa01', OUTPUT)
+    cache.store('bb02', OUTPUT)
+    stale = time.time() - 120
+    os.utime(cache.entryPath('aa01'), (stale, stale))
+
+    assert not cache.fetch('aa01', str(tmpdir.join('output.txt')))
+    assert not tmpdir.join('output.txt').check()
+    assert cache.evict() == 1
+    assert cache.statistics()['entries'] == 1
+
+
+def storeAndRead(arguments):
+    directory, worker = arguments
+    cache = ResultCache(directory, maxBytes=2000)
+    contents = []
+    for index in range(50):
+        key = '%02x%d' % (index % 4, index)
+        cache.store(key, ('%d\n' % index) * 10)
+        contents.append(cache.read(key))
+    return contents
+
+
+def test_concurrent_processes_only_see_whole_entries(tmpdir):
+    directory = str(tmpdir.join('cache'))
+    with Pool(4) as pool:
+        results = pool.map(storeAndRead, [(directory, worker) for worker in range(4)])
+
+    for contents in results:
+        for index, entry in enumerate(contents):
+            assert entry is None or entry == ('%d\n' % index) * 10
+    cache = ResultCache(directory, maxBytes=2000)
+    cache.evict()
+    assert cache.statistics()['bytes'] <= 2000
+
+
+def test_cli_cache(tmpdir, capsys):
+    inputFile = tmpdir.join('input.txt')
+    inputFile.write(INPUT)
+    cacheDirectory = str(tmpdir.join('cache'))
+
+    assert main([str(inputFile), '--cache', cacheDirectory]) == 0
+    assert capsys.readouterr() == (OUTPUT, 'Cache hits: 0, misses: 1.\n')
+    assert main([str(inputFile), '--cache', cacheDirectory, '--cache-max-bytes', '1000', '--cache-max-age', '60',
+                 '-o', str(tmpdir.join('output.txt'))]) == 0
+
+    assert capsys.readouterr() == ('', 'Cache hits: 1, misses: 0.\n')
+    assert tmpdir.join('output.txt').read() == OUTPUT
+    assert ResultCache(cacheDirectory).statistics()['entries'] == 1
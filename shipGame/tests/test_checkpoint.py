@@ -0,0 +1,66 @@
+import pytest
+from shipGame.app import ShipGame
+from shipGame.checkpoint import calculateGameWithCheckpoints, loadCheckpoint, firstOperationOffset
+from shipGame.generator import writeGame
+
+
+@pytest.fixture
+def gameFile(tmpdir):
+    inputFile = tmpdir.join('game.txt')
+    writeGame(str(inputFile), 30, 40, 1000, moveLength=8, moveRatio=0.8, hitRatio=0.2, seed=5)
+    return str(inputFile)
+
+
+def test_firstOperationOffset(tmpdir):
+    inputFile = tmpdir.join('game.txt')
+    inputFile.write('10\n(0, 0, N) (9, 2, E)\n(0, 0) MRMLMM\n(9, 2)\n')
+    assert firstOperationOffset(str(inputFile)) == len('10\n(0, 0, N) (9, 2, E)\n')
+
+
+def test_calculateGameWithCheckpoints_matches_calculateGame(gameFile, tmpdir):
+    checkpointFile = str(tmpdir.join('game.checkpoint'))
+    expected = ShipGame(gameFile)
+    expected.calculateGame()
+
+    actual = calculateGameWithCheckpoints(gameFile, checkpointFile, everyOperations=100)
+
+    assert actual.outputLines() == expected.outputLines()
+    assert loadCheckpoint(checkpointFile)['operationCount'] == 1000
+
+
+def test_calculateGameWithCheckpoints_resume(gameFile, tmpdir, monkeypatch):
+    checkpointFile = str(tmpdir.join('game.checkpoint'))
+    expected = ShipGame(gameFile)
+    expected.calculateGame()
+
+    class Crash(Exception):
+        pass
+
+    shots = []
+    shootShip = ShipGame.shootShip
+
+    def crashingShootShip(self, shipLocation):
+        shots.append(shipLocation)
+        if len(shots) > 120:
+            raise Crash()
+        return shootShip(self, shipLocation)
+
+    monkeypatch.setattr(ShipGame, 'shootShip', crashingShootShip)
+    with pytest.raises(Crash):
+        calculateGameWithCheckpoints(gameFile, checkpointFile, everyOperations=50)
+    monkeypatch.undo()
+
+    checkpoint = loadCheckpoint(checkpointFile)
+    assert 0 < checkpoint['operationCount'] < 1000
+
+    resumed = calculateGameWithCheckpoints(gameFile, checkpointFile, everyOperations=50)
+
+    assert resumed.outputLines() == expected.outputLines()
+    assert loadCheckpoint(checkpointFile)['operationCount'] == 1000
+
+    again = calculateGameWithCheckpoints(gameFile, checkpointFile)
+    assert again.outputLines() == expected.outputLines()
+
+
+if __name__ == '__main__':
+    pytest.main()
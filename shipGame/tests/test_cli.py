@@ -0,0 +1,57 @@
+import io
+import json
+import sys
+import pytest
+from shipGame.cli import main
+
+INPUT = '10\n(0, 0, N) (9, 2, E) (4, 4, W)\n(0, 0) MRMLMM\n(9, 2)\n'
+
+
+def test_cli_files(tmpdir):
+    inputFile = tmpdir.join('input.txt')
+    inputFile.write(INPUT)
+    outputFile = tmpdir.join('output.txt')
+
+    assert main([str(inputFile), '-o', str(outputFile), '--sorted']) == 0
+
+    assert outputFile.read() == '(1, 3, N)\n(4, 4, W)\n(9, 2, E) SUNK\n'
+
+
+def test_cli_stdin_and_stdout(monkeypatch, capsys):
+    monkeypatch.setattr(sys, 'stdin', io.StringIO(INPUT))
+
+    assert main(['-', '--stream']) == 0
+
+    assert capsys.readouterr()[0] == '(1, 3, N)\n(4, 4, W)\n(9, 2, E) SUNK\n'
+
+
+def test_cli_optimise(monkeypatch, capsys):
+    monkeypatch.setattr(sys, 'stdin', io.StringIO(INPUT + '(5, 5)\n'))
+
+    assert main(['-', '--optimise']) == 0
+
+    output, errors = capsys.readouterr()
+    assert output == '(1, 3, N)\n(4, 4, W)\n(9, 2, E) SUNK\n'
+    assert errors == 'Removed 1 of 3 operations.\n'
+
+
+def test_cli_mapped_and_instrumented(tmpdir, capsys):
+    inputFile = tmpdir.join('input.txt')
+    inputFile.write(INPUT)
+    statisticsFile = tmpdir.join('statistics.json')
+
+    assert main([str(inputFile), '--mapped', '--instrument', str(statisticsFile)]) == 0
+
+    assert capsys.readouterr()[0] == '(1, 3, N)\n(4, 4, W)\n(9, 2, E) SUNK\n'
+    assert json.loads(statisticsFile.read())['moves'] == 1
+
+
+def test_cli_lazy_imports():
+    import subprocess
+    code = 'import sys, shipGame.cli, shipGame.app; print(sorted({"pkg_resources", "numpy"} & set(sys.modules)))'
+    output = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, universal_newlines=True, check=True)
+    assert output.stdout.strip() == '[]'
+
+
+if __name__ == '__main__':
+    pytest.main()
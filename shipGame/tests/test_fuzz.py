@@ -0,0 +1,109 @@
+import random
+from shipGame import fuzz
+from shipGame.app import ShipGame
+from shipGame.moves import compileMoves
+from shipGame.utils import isMoveCommand, isShootCommand
+
+
+def runIgnoringRejections(lines, inputFileName):
+    """
+    A deliberately broken engine that lets a move end on an occupied cell.
+    """
+    game = ShipGame(lines=lines)
+    for command in game.gameInformation['movingAndShootingCommands']:
+        if isMoveCommand(command) and game.moveShip(*command) is False:
+            location, moveCommands = command
+            direction = game.board[location]
+            x, y, finalDirection, moved = compileMoves(direction, moveCommands)
+            game.board[location] = 0
+            game.board[(location[0] + x, location[1] + y)] = finalDirection
+        elif isShootCommand(command):
+            game.shootShip(command)
+    return game.outputLines()
+
+
+def runPlacementOrder(lines, inputFileName):
+    """
+    A deliberately broken engine that lists its ships afloat in placement order rather than row by row.
+    """
+    game = ShipGame(lines=lines)
+    game.calculateGame()
+    return ['(%d, %d, %s)' % (x, y, direction) for (x, y), direction in game.board.occupiedCells()]
+
+
+def runSortedSunkenShips(lines, inputFileName):
+    """
+    A deliberately broken engine that lists its sunken ships by coordinates rather than in the order they sank.
+    """
+    game = ShipGame(lines=lines)
+    game.calculateGame()
+    return game.outputLines(sortedOutput=True)
+
+
+def runIgnoringErrors(lines, inputFileName):
+    """
+    A deliberately broken engine that finishes games the reference raises on.
+    """
+    try:
+        return fuzz.runReference(lines, inputFileName)
+    except (Exception, SystemExit):
+        return []
+
+
+def test_randomGame_is_seeded():
+    assert fuzz.randomGame(random.Random(3)) == fuzz.randomGame(random.Random(3))
+
+
+def test_runReference_input_file():
+    lines = open('shipGame/tests/inputs/input.txt').read().splitlines()
+    assert fuzz.runReference(lines, None) == ['(1, 3, N)', '(9, 2, E) SUNK']
+    assert fuzz.runReference(['10', '(5, 5, N) (1, 1, E) (3, 0, S)', '(5, 5) R', '(9, 9)'], None) == \
+        ['(1, 1, E)', '(3, 0, S)', '(5, 5, E)']
+
+
+def test_fuzz_engines_agree():
+    assert fuzz.fuzz(games=40, seed=11) == []
+
+
+def test_mismatches_checks_order_and_errors(tmpdir):
+    lines = ['10', '(5, 5, N) (0, 0, E)', '(9, 9)']
+    assert fuzz.mismatches(runPlacementOrder, lines, str(tmpdir))
+    assert not fuzz.mismatches(runSortedSunkenShips, lines, str(tmpdir))
+    assert not fuzz.mismatches(runIgnoringErrors, lines, str(tmpdir))
+
+    lines = ['10', '(5, 5, N) (0, 0, E)', '(5, 5)', '(0, 0)']
+    assert fuzz.mismatches(runSortedSunkenShips, lines, str(tmpdir))
+
+    lines = ['10', '(5, 5, N) (0, 0, E)', '(10, 10)']
+    assert fuzz.mismatches(runIgnoringErrors, lines, str(tmpdir))
+    assert not fuzz.mismatches(fuzz.runStream, lines, str(tmpdir))
+
+
+def test_defaultEngines_without_numpy(monkeypatch):
+    monkeypatch.setattr(fuzz.importlib.util, 'find_spec', lambda name: None)
+
+    engines = fuzz.defaultEngines()
+    assert 'stream' in engines
+    assert not set(fuzz.NUMPY_ENGINES) & set(engines)
+
+
+def test_fuzz_shrinks_failures(monkeypatch, tmpdir):
+    monkeypatch.setitem(fuzz.ENGINES, 'broken', runIgnoringRejections)
+
+    failures = fuzz.fuzz(games=30, seed=2, engines=['broken'], failureDirectory=str(tmpdir))
+
+    assert failures
+    for name, game, lines in failures:
+        assert name == 'broken'
+        assert len(lines) <= 4
+        assert len(lines[1].split(') (')) <= 2
+        assert fuzz.mismatches(runIgnoringRejections, lines, str(tmpdir))
+        assert tmpdir.join('broken-2-%d.txt' % game).read().splitlines() == lines
+
+
+def test_main_reports_mismatches(monkeypatch, capsys):
+    monkeypatch.setitem(fuzz.ENGINES, 'broken', runIgnoringRejections)
+
+    assert fuzz.main(['--games', '5', '--engine', 'stream']) == 0
+    assert fuzz.main(['--games', '30', '--seed', '2', '--engine', 'broken']) == 1
+    assert 'broken differs on game' in capsys.readouterr()[0]
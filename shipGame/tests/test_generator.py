@@ -0,0 +1,36 @@
+import pytest
+from shipGame.app import ShipGame
+from shipGame.generator import generateGame, writeGame
+
+
+def test_generateGame_is_seeded():
+    assert generateGame(10, 2, 2, seed=1) == ['10', '(1, 7, N) (7, 2, S)', '(7, 2) RLRMMR', '(5, 2) LMLRRL']
+    assert generateGame(50, 20, 100, seed=7) == generateGame(50, 20, 100, seed=7)
+    assert generateGame(50, 20, 100, seed=7) != generateGame(50, 20, 100, seed=8)
+
+
+def test_generateGame_shape():
+    lines = generateGame(1000, 30, 500, moveLength=9, moveRatio=1.0)
+    assert lines[0] == '1000'
+    assert lines[1].count('(') == 30
+    assert len(lines) == 502
+    assert all(len(line.split()[2]) == 9 for line in lines[2:])
+
+
+def test_generateGame_too_many_ships():
+    with pytest.raises(ValueError):
+        generateGame(2, 5, 1)
+
+
+def test_writeGame_is_valid(tmpdir):
+    inputFile = tmpdir.join('game.txt')
+    writeGame(str(inputFile), 20, 40, 2000, moveLength=12, moveRatio=0.8, hitRatio=0.2, seed=3)
+
+    testGame = ShipGame(str(inputFile))
+    testGame.calculateGame()
+
+    assert len(testGame.board.cells) + len(testGame.sunkenShips) == 40
+
+
+if __name__ == '__main__':
+    pytest.main()
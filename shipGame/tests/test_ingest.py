@@ -0,0 +1,59 @@
+import pytest
+from shipGame.app import ShipGame
+from shipGame.generator import writeGame
+from shipGame.ingest import readMappedInput, tokenizeMappedCommand
+
+
+def test_tokenizeMappedCommand():
+    contents = b'(0, 0) MRMLMM\n(19, 200)\r\ninvalid\n'
+    assert tokenizeMappedCommand(contents, 0, 13) == ((0, 0), 'MRMLMM')
+    assert tokenizeMappedCommand(contents, 14, 24) == (19, 200)
+    with pytest.raises(ValueError):
+        tokenizeMappedCommand(contents, 25, 32)
+
+
+def test_readMappedInput_absolute_path(tmpdir):
+    inputFile = tmpdir.join('input.txt')
+    inputFile.write('10\n(0, 0, N) (9, 2, E)\n(0, 0) MRMLMM\n(9, 2)\n')
+
+    assert readMappedInput(str(inputFile)) == {'boardSize': 10,
+                                               'shipLocations': [((0, 0), 'N'), ((9, 2), 'E')],
+                                               'movingAndShootingCommands': [((0, 0), 'MRMLMM'), (9, 2)]}
+
+
+def test_readMappedInput_incomplete(tmpdir):
+    inputFile = tmpdir.join('input.txt')
+    inputFile.write('')
+    assert readMappedInput(str(inputFile)) == {}
+
+    inputFile.write('10\n')
+    assert readMappedInput(str(inputFile)) == {'boardSize': 10}
+
+    with pytest.raises(SystemExit):
+        ShipGame(str(inputFile), mapped=True)
+
+
+def test_mapped_matches_parsed(tmpdir):
+    inputFile = tmpdir.join('game.txt')
+    writeGame(str(inputFile), 200, 50, 500, moveLength=10, moveRatio=0.7, hitRatio=0.2, seed=2)
+
+    parsedGame = ShipGame(str(inputFile))
+    assert parsedGame.mapInputFile(str(inputFile)) == parsedGame.gameInformation
+    parsedGame.calculateGame()
+
+    mappedGame = ShipGame(str(inputFile), stream=True, mapped=True)
+    mappedGame.calculateGame()
+
+    assert mappedGame.outputLines() == parsedGame.outputLines()
+
+
+@pytest.mark.parametrize('contents', ['10\n(0, 0, N) (x, 2, E)\n(0, 0) M\n', '10\n(0, 0, N)\n(0, 0) M\n\n'])
+def test_readMappedInput_invalid_lines(tmpdir, contents):
+    inputFile = tmpdir.join('input.txt')
+    inputFile.write(contents)
+    with pytest.raises(ValueError):
+        readMappedInput(str(inputFile))
+
+
+if __name__ == '__main__':
+    pytest.main()
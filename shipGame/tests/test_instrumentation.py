@@ -0,0 +1,66 @@
+import json
+import pytest
+from shipGame.app import ShipGame
+from shipGame.instrumentation import Instrumentation
+
+
+def test_instrumentation_from_start():
+    testGame = ShipGame("tests/inputs/input.txt", instrumentation=Instrumentation())
+    testGame.calculateGame()
+
+    statistics = testGame.instrumentation.toDict()
+    assert statistics['moves'] == 1
+    assert statistics['shoots'] == 1
+    assert statistics['rejectedMoves'] == 0
+    assert statistics['moveLengthHistogram'] == {'6': 1}
+    for name in ('parseInputFile', 'assignGameParameters', 'initialiseBoard', 'calculateGame', 'moveShip', 'shootShip'):
+        assert statistics['timers'][name]['calls'] == 1
+
+
+def test_instrumentation_rejected_moves():
+    testGame = ShipGame("tests/inputs/input.txt")
+    instrumentation = testGame.enableInstrumentation()
+    testGame.initialiseShipLocations([((2, 2), 'N')])
+
+    assert testGame.moveShip((0, 0), 'MMRMM') is False
+    assert testGame.moveShip((0, 0), 'R') is True
+    testGame.shootShips([(2, 2), (5, 5)])
+
+    assert instrumentation.rejectedMoveCount == 1
+    assert instrumentation.moveCount == 2
+    assert instrumentation.shootCount == 2
+    assert json.loads(instrumentation.toJson())['moveLengthHistogram'] == {'1': 1, '5': 1}
+
+
+def test_instrumentation_counts_shots_from_a_generator():
+    testGame = ShipGame("tests/inputs/input.txt")
+    instrumentation = testGame.enableInstrumentation()
+    testGame.shootShips(shipLocation for shipLocation in [(2, 2), (5, 5)])
+
+    assert instrumentation.shootCount == 2
+
+
+def test_instrumentation_switched_off():
+    testGame = ShipGame("tests/inputs/input.txt")
+    instrumentation = testGame.enableInstrumentation()
+    assert testGame.disableInstrumentation() is instrumentation
+    assert 'moveShip' not in vars(testGame)
+
+    testGame.calculateGame()
+
+    assert instrumentation.moveCount == 0
+    assert testGame.instrumentation is None
+
+
+def test_instrumentation_writeJson(tmpdir):
+    testGame = ShipGame("tests/inputs/input.txt", instrumentation=Instrumentation())
+    testGame.calculateGame()
+    outputFile = tmpdir.join('statistics.json')
+
+    testGame.instrumentation.writeJson(str(outputFile))
+
+    assert json.loads(outputFile.read())['timers']['calculateGame']['calls'] == 1
+
+
+if __name__ == '__main__':
+    pytest.main()
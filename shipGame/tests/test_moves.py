@@ -0,0 +1,36 @@
+import pytest
+from shipGame.moves import compileMoves, moveCacheInfo
+
+
+def test_compileMoves_valid_input():
+    assert compileMoves('N', 'MRMLMM') == (1, 3, 'N', True)
+    assert compileMoves('E', 'MMLMMRMM') == (4, 2, 'E', True)
+    assert compileMoves('S', 'MMRMLMLLLMMM') == (-4, -3, 'W', True)
+
+
+def test_compileMoves_rotate_only():
+    assert compileMoves('N', 'L') == (0, 0, 'W', False)
+    assert compileMoves('W', 'R') == (0, 0, 'N', False)
+    assert compileMoves('N', 'LLLL') == (0, 0, 'N', False)
+
+
+def test_compileMoves_invalid_input():
+    with pytest.raises(ValueError):
+        compileMoves('N', 'MMX')
+
+    with pytest.raises(ValueError):
+        compileMoves('T', 'MM')
+
+
+def test_compileMoves_cache_hits():
+    compileMoves.cache_clear()
+    compileMoves('N', 'MRMLMM')
+    compileMoves('N', 'MRMLMM')
+    compileMoves('E', 'MRMLMM')
+    info = moveCacheInfo()
+    assert info.hits == 1
+    assert info.misses == 2
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,92 @@
+import random
+import pytest
+from shipGame.app import ShipGame
+from shipGame.generator import generateGame
+from shipGame.moves import COMPASS, compileMoves
+from shipGame.optimiser import simplifyMoves, optimiseCommands
+
+
+def test_simplifyMoves_examples():
+    assert simplifyMoves('MLRMRLLLLM') == 'MMRM'
+    assert simplifyMoves('MLRMLLLLM') == 'MMM'
+    assert simplifyMoves('LLLL') == 'LLLL'
+    assert simplifyMoves('LLLLR') == 'R'
+    assert simplifyMoves('RRR') == 'L'
+    assert simplifyMoves('MRRMRRR') == 'MRRML'
+    assert simplifyMoves('MRMLMM') == 'MRMLMM'
+
+
+def test_simplifyMoves_is_equivalent():
+    generator = random.Random(4)
+    for _ in range(2000):
+        moveCommands = ''.join(generator.choice('MRL') for _ in range(generator.randint(1, 12)))
+        simplified = simplifyMoves(moveCommands)
+        assert len(simplified) <= len(moveCommands)
+        for direction in COMPASS:
+            assert compileMoves(direction, simplified) == compileMoves(direction, moveCommands)
+
+
+def test_optimiseCommands_removes_empty_shots_and_no_ops():
+    ships = [((0, 0), 'N'), ((0, 1), 'E'), ((9, 2), 'E')]
+    commands = [((0, 0), 'MRLM'), (5, 5), ((0, 1), 'LR'), ((9, 2), 'MRRM'), None, (9, 2)]
+    optimised, report = optimiseCommands(commands, ships, lambda cell: 0 <= cell[0] < 10 and 0 <= cell[1] < 10)
+
+    assert optimised == [((0, 0), 'MM'), None, (9, 2)]
+    assert report['removedOperations'] == 3
+    assert report['removedShots'] == 1
+    assert report['removedMoves'] == 2
+    assert report['simplifiedMoves'] == 1
+
+
+def test_optimiseCommands_merges_moves_of_the_same_ship():
+    ships = [((0, 0), 'N')]
+    commands = [((0, 0), 'MM'), ((0, 2), 'RM'), ((1, 2), 'L'), (0, 0)]
+    optimised, report = optimiseCommands(commands, ships, lambda cell: 0 <= cell[0] < 10 and 0 <= cell[1] < 10)
+
+    assert optimised == [((0, 0), 'MMRML')]
+    assert report['mergedMoves'] == 2
+    assert report['removedShots'] == 1
+
+
+def test_optimiseCommands_does_not_merge_a_return_to_the_origin():
+    ships = [((0, 0), 'N')]
+    commands = [((0, 0), 'M'), ((0, 1), 'RRM')]
+    optimised, report = optimiseCommands(commands, ships, lambda cell: 0 <= cell[0] < 10 and 0 <= cell[1] < 10)
+
+    assert optimised == [((0, 0), 'M'), ((0, 1), 'RRM')]
+    assert report['removedOperations'] == 0
+
+
+def test_optimiseCommands_keeps_operations_that_raise():
+    ships = [((0, 0), 'N')]
+    commands = [((0, 0), 'LM'), ((5, 5), 'M'), (10, 10)]
+    optimised, report = optimiseCommands(commands, ships, lambda cell: 0 <= cell[0] < 10 and 0 <= cell[1] < 10)
+
+    assert optimised == commands
+    assert report['removedOperations'] == 0
+
+
+@pytest.mark.parametrize('seed', range(12))
+def test_optimiseCommands_output_is_identical(seed):
+    lines = generateGame(8, 12, 400, moveLength=seed % 5 + 1, moveRatio=0.7, hitRatio=0.3, seed=seed)
+
+    referenceGame = ShipGame(lines=lines)
+    referenceGame.calculateGame()
+
+    optimisedGame = ShipGame(lines=lines)
+    report = optimisedGame.optimiseCommands()
+    optimisedGame.calculateGame()
+
+    assert optimisedGame.outputLines() == referenceGame.outputLines()
+    assert report['remainingOperations'] == len(optimisedGame.gameInformation['movingAndShootingCommands'])
+    assert report['operations'] == 400
+
+
+def test_optimiseCommands_streamed_game(tmpdir):
+    inputFile = tmpdir.join('game.txt')
+    inputFile.write('10\n(0, 0, N) (9, 2, E)\n(0, 0) MRMLMM\n(5, 5)\n(9, 2)\n')
+
+    testGame = ShipGame(str(inputFile), stream=True)
+    assert testGame.optimiseCommands()['removedShots'] == 1
+    testGame.calculateGame()
+    assert testGame.outputLines() == ['(1, 3, N)', '(9, 2, E) SUNK']
@@ -0,0 +1,64 @@
+import pytest
+from shipGame.app import ShipGame
+from shipGame.results import ResultStore, main, readOutputFile
+
+
+def test_readOutputFile(tmpdir):
+    outputFile = tmpdir.join('output.txt')
+    outputFile.write('(4, 4, W)\n(1, 3, N)\n(9, 2, E) SUNK\n')
+
+    assert readOutputFile(str(outputFile)) == ([((4, 4), 'W'), ((1, 3), 'N')], [((9, 2), 'E')])
+
+
+def test_add_flushes_in_batches(tmpdir):
+    store = ResultStore(str(tmpdir.join('results.db')), batchSize=2)
+
+    store.add('001', [((1, 3), 'N')], [((9, 2), 'E')])
+    assert store.connection.execute('SELECT COUNT(*) FROM games').fetchone() == (0,)
+    store.add('002', [((0, 0), 'S'), ((5, 5), 'E')], [])
+    assert store.connection.execute('SELECT id, name FROM games').fetchall() == [(1, '001'), (2, '002')]
+
+    store.add('003', [], [((1, 1), 'W')])
+    assert store.summary() == {'games': 3, 'ships': 3, 'sunkenShips': 2}
+    assert store.query('SELECT g.name FROM ships s JOIN games g ON g.id = s.game WHERE s.x = ? AND s.y = ?',
+                       (5, 5)) == [('002',)]
+    store.close()
+
+
+def test_reopened_store_continues_ids(tmpdir, capsys):
+    fileName = str(tmpdir.join('results.db'))
+    game = ShipGame(lines=['10', '(0, 0, N) (9, 2, E)', '(0, 0) MRMLMM', '(9, 2)'])
+    game.calculateGame()
+
+    with ResultStore(fileName) as store:
+        store.addGame('first', game)
+        assert store.flush() == [1]
+    with ResultStore(fileName) as store:
+        store.addGame('second', game)
+        assert store.flush() == [2]
+        assert store.query('SELECT heading, COUNT(*) FROM ships GROUP BY heading') == [('E', 2), ('N', 2)]
+
+    assert main([fileName]) == 0
+    assert capsys.readouterr()[0] == '2 games: 2 ships afloat, 2 sunk.\n'
+
+
+def test_stores_sharing_a_database(tmpdir):
+    fileName = str(tmpdir.join('results.db'))
+    first = ResultStore(fileName)
+    second = ResultStore(fileName)
+
+    first.add('001', [((1, 3), 'N')], [])
+    second.add('002', [], [((9, 2), 'E')])
+    second.add('003', [((0, 0), 'S')], [])
+    assert second.flush() == [1, 2]
+    assert first.flush() == [3]
+    first.close()
+
+    assert second.query('SELECT g.name, s.heading FROM ships s JOIN games g ON g.id = s.game ORDER BY g.id') == \
+        [('002', 'E'), ('003', 'S'), ('001', 'N')]
+    assert second.summary() == {'games': 3, 'ships': 2, 'sunkenShips': 1}
+    second.close()
+
+
+if __name__ == '__main__':
+    pytest.main()
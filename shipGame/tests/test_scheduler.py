@@ -0,0 +1,70 @@
+import pytest
+from shipGame.app import ShipGame
+from shipGame.generator import generateGame
+from shipGame import scheduler
+from shipGame.scheduler import calculateGameInParallel, operationCells, scheduleOperations
+
+
+def test_operationCells():
+    assert operationCells(((0, 0), 'MRMLMM')) == {(0, 0), (1, 3), (3, -1), (-1, -3), (-3, 1)}
+    assert operationCells(((0, 0), 'RL')) == {(0, 0)}
+    assert operationCells((9, 2)) == {(9, 2)}
+    with pytest.raises(ValueError):
+        operationCells(None)
+
+
+def test_scheduleOperations():
+    assert scheduleOperations([((0, 0), 'M'), (5, 5), ((0, 1), 'M'), (0, 2)]) == [[0, 1], [2], [3]]
+    assert scheduleOperations([(1, 1), (2, 2), (1, 1)]) == [[0, 1], [2]]
+
+
+@pytest.mark.parametrize('threads', [True, False])
+@pytest.mark.parametrize('seed', [3, 6])
+def test_calculateGameInParallel_matches_sequential(threads, seed):
+    lines = generateGame(40, 300, 3000, moveLength=3, moveRatio=0.7, hitRatio=0.3, seed=seed)
+
+    sequentialGame = ShipGame(lines=lines)
+    sequentialGame.calculateGame()
+
+    parallelGame = ShipGame(lines=lines)
+    parallelGame.calculateGame = lambda commands: pytest.fail('Fell back to sequential calculation.')
+    calculateGameInParallel(parallelGame, workers=3, threads=threads, minimumBatch=8, force=True)
+
+    assert parallelGame.outputLines() == sequentialGame.outputLines()
+
+
+def test_calculateGameInParallel_input_file():
+    testGame = ShipGame("tests/inputs/input.txt")
+    calculateGameInParallel(testGame, threads=True)
+    assert testGame.outputLines() == ['(1, 3, N)', '(9, 2, E) SUNK']
+
+
+def test_calculateGameInParallel_fails_like_sequential():
+    lines = ['10', '(0, 0, N) (9, 2, E)', '(9, 2)', '(0, 0) M', '(5, 5) M', '(0, 1) R']
+
+    testGame = ShipGame(lines=lines)
+    with pytest.raises(ValueError):
+        calculateGameInParallel(testGame, threads=True, minimumBatch=1, force=True)
+
+    assert testGame.outputLines() == ['(0, 1, N)', '(9, 2, E) SUNK']
+
+
+@pytest.mark.parametrize('threads', [True, False])
+def test_calculateGameInParallel_falls_back_when_it_cannot_win(monkeypatch, threads):
+    lines = generateGame(100, 1000, 3000, moveLength=3, seed=2)
+    monkeypatch.setattr(scheduler, 'runBatches', lambda *arguments: pytest.fail('Ran in parallel.'))
+    if not threads:
+        monkeypatch.setattr(scheduler, 'parallelCanWin', lambda *arguments: False)
+
+    sequentialGame = ShipGame(lines=lines)
+    sequentialGame.calculateGame()
+    testGame = ShipGame(lines=lines)
+    calculateGameInParallel(testGame, workers=4, threads=threads)
+
+    assert testGame.outputLines() == sequentialGame.outputLines()
+
+
+def test_calculateGameInParallel_without_commands():
+    testGame = ShipGame(lines=['10', '(0, 0, N)'])
+    with pytest.raises(TypeError):
+        calculateGameInParallel(testGame, [])
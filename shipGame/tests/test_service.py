@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+from shipGame.benchmarks.latency import percentile, runLoad
+from shipGame.service import GameService, startServer
+
+
+def test_handleLine_game_lifecycle():
+    service = GameService()
+    assert service.handleLine('CREATE g1 10 (0, 0, N) (9, 2, E) (1, 4, S)\n') == ['OK']
+    assert service.handleLine('MOVE g1 (0, 0) MRMLMM') == ['OK MOVED']
+    assert service.handleLine('MOVE g1 (1, 3) M') == ['OK REJECTED']
+    assert service.handleLine('SHOOT g1 (9, 2)') == ['OK SUNK (9, 2, E)']
+    assert service.handleLine('SHOOT g1 (9, 2)') == ['OK MISS']
+    assert service.handleLine('SNAPSHOT g1') == ['OK 3', '(1, 3, N)', '(1, 4, S)', '(9, 2, E) SUNK']
+    assert service.handleLine('SNAPSHOT g1 sorted') == ['OK 3', '(1, 3, N)', '(1, 4, S)', '(9, 2, E) SUNK']
+    assert service.handleLine('DROP g1') == ['OK']
+    assert service.games == {}
+
+
+def test_handleLine_errors():
+    service = GameService()
+    service.handleLine('CREATE g1 10')
+    assert service.handleLine('') == ['ERROR Expected a command and a game name.']
+    assert service.handleLine('MOVE g2 (0, 0) M')[0].startswith('ERROR')
+    assert service.handleLine('MOVE g1 (0, 0) M')[0].startswith('ERROR ValueError')
+    assert service.handleLine('SHOOT g1 (10, 0)')[0].startswith('ERROR KeyError')
+    assert service.handleLine('CREATE g3 ten')[0].startswith('ERROR ValueError')
+    assert service.handleLine('LAUNCH g1') == ['ERROR Unknown command LAUNCH.']
+
+
+def test_service_over_tcp():
+    async def session():
+        server = await startServer(GameService(), '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        responses = []
+        for request in ('CREATE g1 10 (0, 0, N) (9, 2, E)', 'MOVE g1 (0, 0) MRMLMM', 'SHOOT g1 (9, 2)'):
+            writer.write((request + '\n').encode())
+            responses.append((await reader.readline()).decode().strip())
+        writer.write(b'SNAPSHOT g1\n')
+        count = int((await reader.readline()).split()[1])
+        snapshot = [(await reader.readline()).decode().strip() for _ in range(count)]
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return responses, snapshot
+
+    responses, snapshot = asyncio.run(session())
+
+    assert responses == ['OK', 'OK MOVED', 'OK SUNK (9, 2, E)']
+    assert snapshot == ['(1, 3, N)', '(9, 2, E) SUNK']
+
+
+def test_load_generator():
+    latencies, elapsed = asyncio.run(runLoad(2, '127.0.0.1', None, None, 50, 10, 200, 0))
+    assert len(latencies) == 2 * 201
+    assert percentile(latencies, 0.5) <= percentile(latencies, 0.99) <= latencies[-1]
+    assert percentile([1, 2, 3, 4], 0.5) == 2
+
+
+if __name__ == '__main__':
+    pytest.main()
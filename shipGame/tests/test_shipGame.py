@@ -1,5 +1,8 @@
 import pytest
 from shipGame.app import ShipGame
+from shipGame.board import ArrayBoard, SparseBoard
+from shipGame.ships import ShipBoard
+from shipGame.spatial import IndexedBoard
 
 
 @pytest.fixture
@@ -129,6 +132,34 @@ def test_shootShip_empty_cell(testGame):
     assert ((1, 3), 'N') not in testGame.sunkenShips
 
 
+def test_shootShips_repeated_and_empty_cells(testGame):
+    testGame.initialiseShipLocations([((1, 3), 'N'), ((4, 4), 'W')])
+    testGame.shootShips([(4, 4), (5, 5), (1, 3), (4, 4)])
+    assert testGame.sunkenShips == [((4, 4), 'W'), ((1, 3), 'N')]
+    assert testGame.board.get((4, 4)) == 0
+
+
+def test_shootShips_matches_shootShip():
+    volley = [(9, 2), (0, 0), (9, 2), (3, 3), (0, 0)]
+    batchedGame = ShipGame("tests/inputs/input.txt")
+    sequentialGame = ShipGame("tests/inputs/input.txt")
+
+    batchedGame.shootShips(volley)
+    for shipLocation in volley:
+        sequentialGame.shootShip(shipLocation)
+
+    assert batchedGame.sunkenShips == sequentialGame.sunkenShips == [((9, 2), 'E'), ((0, 0), 'N')]
+
+
+def test_shootShips_invalid_input(testGame):
+    with pytest.raises(KeyError):
+        testGame.shootShips([(0, 0), (10, 0)])
+    with pytest.raises(KeyError):
+        testGame.shootShips([5])
+    assert testGame.board.get((0, 0)) == 'N'
+    assert testGame.sunkenShips == []
+
+
 def test_parseInputFile_no_input(testGame):
     with pytest.raises(TypeError):
         testGame.parseInputFile()
@@ -151,6 +182,10 @@ def test_assignGameParameters_no_input(testGame):
 def test_assignGameParameters_invalid_input(testGame):
     with pytest.raises(ValueError):
         testGame.assignGameParameters('invalid')
+    with pytest.raises(ValueError):
+        testGame.assignGameParameters(['10', '(0, 0, N) (x, 2, E) (3, 3, NE)', '(0, 0) M'])
+    with pytest.raises(ValueError):
+        testGame.assignGameParameters(['10', '(0, 0, N)', '(0, 0) M', 'not a command'])
 
 
 def test_assignGameParameters_valid_input(testGame):
@@ -220,7 +255,7 @@ def test_writeOutput_no_sunken_ships(testGame):
 
     output = open('shipGame/output.txt').read()
     contents = output.splitlines()
-    assert contents == ['(7, 9, N)', '(9, 6, W)', '(6, 8, E)', '(0, 9, S)']
+    assert contents == ['(0, 9, S)', '(6, 8, E)', '(7, 9, N)', '(9, 6, W)']
 
 
 def test_writeOutput_valid_occupied_cells_and_sunken_ships(testGame):
@@ -231,7 +266,37 @@ def test_writeOutput_valid_occupied_cells_and_sunken_ships(testGame):
 
     output = open('shipGame/output.txt').read()
     contents = output.splitlines()
-    assert contents == ['(7, 9, N)', '(9, 6, W)', '(6, 8, E)', '(0, 9, S)', '(0, 0, N) SUNK', '(9, 2, E) SUNK']
+    assert contents == ['(0, 9, S)', '(6, 8, E)', '(7, 9, N)', '(9, 6, W)', '(0, 0, N) SUNK', '(9, 2, E) SUNK']
+
+
+def test_outputLines_sorted(testGame):
+    testGame.board = {(0, 0): 0, (9, 6): 'W', (6, 8): 'E', (0, 9): 'S', (7, 9): 'N', (9, 9): 0}
+    testGame.sunkenShips = [((9, 2), 'E'), ((0, 0), 'N')]
+
+    assert testGame.outputLines() == ['(0, 9, S)', '(6, 8, E)', '(7, 9, N)', '(9, 6, W)',
+                                      '(9, 2, E) SUNK', '(0, 0, N) SUNK']
+    assert testGame.outputLines(sortedOutput=True) == ['(0, 9, S)', '(6, 8, E)', '(7, 9, N)', '(9, 6, W)',
+                                                       '(0, 0, N) SUNK', '(9, 2, E) SUNK']
+
+
+@pytest.mark.parametrize('boardClass', [SparseBoard, ArrayBoard, ShipBoard, IndexedBoard])
+def test_outputLines_row_major(boardClass):
+    if boardClass is ArrayBoard:
+        pytest.importorskip('numpy')
+    testGame = ShipGame(lines=['10', '(5, 5, N) (1, 1, E) (3, 0, S)', '(5, 5) R', '(9, 9)'], boardClass=boardClass)
+    testGame.calculateGame()
+
+    assert testGame.outputLines() == ['(1, 1, E)', '(3, 0, S)', '(5, 5, E)']
+
+
+def test_writeOutput_sorted(testGame, tmpdir):
+    outputFile = tmpdir.join('output.txt')
+    testGame.initialiseShipLocations([((5, 5), 'W'), ((1, 1), 'S')])
+    testGame.shootShip((9, 2))
+
+    testGame.writeOutput(str(outputFile), sortedOutput=True)
+
+    assert outputFile.read() == '(0, 0, N)\n(1, 1, S)\n(5, 5, W)\n(9, 2, E) SUNK\n'
 
 
 def test_calculateGame_no_input(testGame):
@@ -240,6 +305,12 @@ def test_calculateGame_no_input(testGame):
         testGame.calculateGame()
 
 
+def test_calculateGame_invalid_input(testGame):
+    testGame.gameInformation['movingAndShootingCommands'] = [(9, 2), None]
+    with pytest.raises(ValueError):
+        testGame.calculateGame()
+
+
 def test_calculateGame_valid_input(testGame):
     testGame.board[(0, 0)] = 'N'
     testGame.board[(9, 2)] = 'E'
@@ -251,5 +322,34 @@ def test_calculateGame_valid_input(testGame):
     assert testGame.sunkenShips == [((9, 2), 'E')]
 
 
+def test_streamInputFile_valid_input(testGame):
+    lines = testGame.streamInputFile('tests/inputs/input.txt')
+    assert next(lines) == '10'
+    assert list(lines) == ['(0, 0, N) (9, 2, E)', '(0, 0) MRMLMM', '(9, 2)']
+
+
+def test_assignGameParameters_stream(testGame):
+    actual = testGame.assignGameParameters(iter(['10', '(0, 0, N) (9, 2, E)', '(0, 0) MRMLMM', '(9, 2)']), stream=True)
+    assert actual['boardSize'] == 10
+    assert actual['shipLocations'] == [((0, 0), 'N'), ((9, 2), 'E')]
+    assert list(actual['movingAndShootingCommands']) == [((0, 0), 'MRMLMM'), (9, 2)]
+
+
+def test_calculateGame_stream():
+    testGame = ShipGame("tests/inputs/input.txt", stream=True)
+
+    testGame.calculateGame()
+
+    assert testGame.board.get((1, 3)) == 'N'
+    assert testGame.sunkenShips == [((9, 2), 'E')]
+
+
+def test_calculateGame_stream_no_commands():
+    testGame = ShipGame("tests/inputs/input.txt", stream=True)
+    testGame.gameInformation['movingAndShootingCommands'] = iter([])
+    with pytest.raises(TypeError):
+        testGame.calculateGame()
+
+
 if __name__ == '__main__':
     pytest.main()
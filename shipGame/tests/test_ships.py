@@ -0,0 +1,80 @@
+import pytest
+from shipGame.app import ShipGame
+from shipGame.generator import writeGame
+from shipGame.ships import Ship, ShipBoard
+
+
+@pytest.fixture
+def testGame():
+    return ShipGame("tests/inputs/input.txt", boardClass=ShipBoard)
+
+
+def test_shipBoard_identity_across_moves(testGame):
+    testGame.board.enableHistory()
+    shipId = testGame.board.shipAt((0, 0))
+    assert shipId == 0
+
+    testGame.moveShip((0, 0), 'MRMLMM')
+    testGame.moveShip((1, 3), 'R')
+
+    assert testGame.board.shipAt((1, 3)) == shipId
+    assert testGame.board.shipAt((0, 0)) is None
+    assert testGame.board.ship(shipId) == Ship(0, (1, 3), 'E', False)
+    assert testGame.board.history(0) == [(0, 0, 'N'), (1, 3, 'N'), (1, 3, 'E')]
+
+
+def test_shipBoard_rejected_move_keeps_history(testGame):
+    testGame.board.enableHistory()
+    testGame.initialiseShipLocations([((1, 3), 'S')])
+    assert testGame.moveShip((0, 0), 'MRMLMM') is False
+    assert testGame.board.history(0) == [(0, 0, 'N')]
+    assert testGame.board.history(2) == [(1, 3, 'S')]
+
+
+def test_shipBoard_history_links_each_ships_events(testGame):
+    testGame.shootShip((9, 2))
+    testGame.board.enableHistory()
+    testGame.initialiseShipLocations([((5, 5), 'W')])
+    testGame.moveShip((0, 0), 'M')
+    testGame.moveShip((5, 5), 'L')
+    testGame.moveShip((0, 1), 'R')
+
+    assert testGame.board.history(0) == [(0, 0, 'N'), (0, 1, 'N'), (0, 1, 'E')]
+    assert testGame.board.history(1) == []
+    assert testGame.board.history(2) == [(5, 5, 'W'), (5, 5, 'S')]
+    assert testGame.board.lastEvents.tolist() == [4, -1, 3]
+
+
+def test_shipBoard_history_is_optional(testGame):
+    testGame.moveShip((0, 0), 'MRMLMM')
+
+    assert testGame.board.events is None
+    with pytest.raises(ValueError):
+        testGame.board.history(0)
+
+
+def test_shipBoard_sunk_flag(testGame):
+    testGame.shootShip((9, 2))
+    testGame.shootShips([(0, 0), (5, 5)])
+
+    assert [testGame.board.ship(shipId).sunk for shipId in range(testGame.board.shipCount)] == [True, True]
+    assert testGame.sunkenShips == [((9, 2), 'E'), ((0, 0), 'N')]
+    assert testGame.board.occupiedCells() == []
+
+
+def test_shipBoard_matches_sparseBoard(tmpdir):
+    inputFile = tmpdir.join('game.txt')
+    writeGame(str(inputFile), 40, 60, 2000, moveLength=8, moveRatio=0.8, hitRatio=0.2, seed=4)
+
+    expected = ShipGame(str(inputFile))
+    expected.calculateGame()
+    actual = ShipGame(str(inputFile), boardClass=ShipBoard)
+    actual.calculateGame()
+
+    assert actual.outputLines() == expected.outputLines()
+    assert actual.board.shipCount == 60
+    assert sum(actual.board.sunk) == len(actual.sunkenShips)
+
+
+if __name__ == '__main__':
+    pytest.main()
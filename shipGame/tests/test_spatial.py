@@ -0,0 +1,61 @@
+import random
+import pytest
+from shipGame.app import ShipGame
+from shipGame.generator import generateGame
+from shipGame.spatial import IndexedBoard
+
+
+def bruteForceRegion(board, lower, upper):
+    return sorted((coordinates, direction) for coordinates, direction in board.occupiedCells()
+                  if lower[0] <= coordinates[0] <= upper[0] and lower[1] <= coordinates[1] <= upper[1])
+
+
+def bruteForceNearest(board, point):
+    ships = sorted(board.occupiedCells(),
+                   key=lambda ship: ((ship[0][0] - point[0]) ** 2 + (ship[0][1] - point[1]) ** 2, ship[0]))
+    return ships[0] if ships else None
+
+
+def test_indexedBoard_input_file():
+    testGame = ShipGame("tests/inputs/input.txt", boardClass=IndexedBoard)
+    assert testGame.board.shipsInRegion((0, 0), (4, 4)) == [((0, 0), 'N')]
+    assert testGame.board.nearestShip((8, 8)) == ((9, 2), 'E')
+
+    testGame.calculateGame()
+    assert testGame.board.shipsInRegion((0, 0), (9, 9)) == [((1, 3), 'N')]
+    assert testGame.board.nearestShip((9, 2)) == ((1, 3), 'N')
+    assert testGame.board.tiles == {(0, 0): {(1, 3)}}
+
+
+def test_indexedBoard_empty():
+    board = IndexedBoard(100)
+    assert board.nearestShip((5, 5)) is None
+    assert board.shipsInRegion((0, 0), (99, 99)) == []
+    assert board.shipsInRegion((50, 50), (10, 10)) == []
+
+
+@pytest.mark.parametrize('tileSize', [1, 4, 16])
+def test_indexedBoard_matches_brute_force(tileSize):
+    lines = generateGame(60, 80, 2000, moveLength=4, moveRatio=0.8, hitRatio=0.3, seed=tileSize)
+    testGame = ShipGame(lines=lines, boardClass=lambda size: IndexedBoard(size, tileSize))
+    testGame.calculateGame()
+    board = testGame.board
+
+    assert sorted(cell for cells in board.tiles.values() for cell in cells) == sorted(board.cells)
+    generator = random.Random(tileSize)
+    for _ in range(200):
+        lower = (generator.randint(-5, 60), generator.randint(-5, 60))
+        upper = (generator.randint(lower[0], 70), generator.randint(lower[1], 70))
+        assert board.shipsInRegion(lower, upper) == bruteForceRegion(board, lower, upper)
+
+        point = (generator.randint(0, 59), generator.randint(0, 59))
+        assert board.nearestShip(point) == bruteForceNearest(board, point)
+
+
+def test_indexedBoard_shootShips():
+    testGame = ShipGame("tests/inputs/input.txt", boardClass=IndexedBoard)
+    testGame.shootShips([(9, 2), (5, 5)])
+
+    assert testGame.sunkenShips == [((9, 2), 'E')]
+    assert testGame.board.tiles == {(0, 0): {(0, 0)}}
+    assert testGame.board.nearestShip((9, 9)) == ((0, 0), 'N')
@@ -0,0 +1,132 @@
+import pytest
+from shipGame.app import ShipGame
+from shipGame.board import ArrayBoard, SparseBoard
+from shipGame.generator import generateGame
+from shipGame.ships import ShipBoard
+from shipGame.timeline import Timeline
+
+
+def replayedState(lines, operation, boardClass):
+    game = ShipGame(lines=lines, boardClass=boardClass)
+    commands = game.gameInformation['movingAndShootingCommands'][:operation]
+    if commands:
+        game.calculateGame(commands)
+    return sorted(game.board.occupiedCells()), game.sunkenShips
+
+
+def test_stateAt_input_file():
+    testGame = ShipGame("tests/inputs/input.txt")
+    testGame.enableTimeline()
+    testGame.calculateGame()
+
+    board, sunkenShips = testGame.stateAt(0)
+    assert sorted(board.occupiedCells()) == [((0, 0), 'N'), ((9, 2), 'E')]
+    assert sunkenShips == []
+
+    board, sunkenShips = testGame.stateAt(1)
+    assert sorted(board.occupiedCells()) == [((1, 3), 'N'), ((9, 2), 'E')]
+
+    board, sunkenShips = testGame.stateAt(2)
+    assert sorted(board.occupiedCells()) == [((1, 3), 'N')]
+    assert sunkenShips == [((9, 2), 'E')]
+
+    with pytest.raises(IndexError):
+        testGame.stateAt(3)
+
+
+@pytest.mark.parametrize('boardClass', [SparseBoard, ArrayBoard, ShipBoard])
+def test_stateAt_matches_replay(boardClass):
+    if boardClass is ArrayBoard:
+        pytest.importorskip('numpy')
+    lines = generateGame(12, 30, 300, moveLength=3, moveRatio=0.7, hitRatio=0.4, seed=5)
+
+    testGame = ShipGame(lines=lines, boardClass=boardClass)
+    timeline = testGame.enableTimeline(Timeline(snapshotEvery=16))
+    testGame.calculateGame()
+
+    assert timeline.operationCount == 300
+    for operation in (0, 1, 15, 16, 17, 150, 299, 300):
+        board, sunkenShips = testGame.stateAt(operation)
+        assert isinstance(board, boardClass)
+        assert (sorted(board.occupiedCells()), sunkenShips) == replayedState(lines, operation, boardClass)
+
+
+def test_timeline_shootShips_off_board_sinks_nothing():
+    testGame = ShipGame("tests/inputs/input.txt")
+    timeline = testGame.enableTimeline()
+    with pytest.raises(KeyError):
+        testGame.shootShips([(0, 0), (10, 0)])
+
+    assert testGame.board[(0, 0)] == 'N'
+    assert testGame.sunkenShips == []
+    assert timeline.operationCount == 0
+
+
+@pytest.mark.parametrize('boardClass', [SparseBoard, ArrayBoard])
+def test_timeline_shootShips_snapshots_within_volley(boardClass):
+    if boardClass is ArrayBoard:
+        pytest.importorskip('numpy')
+    testGame = ShipGame(lines=['10', '(0, 0, N) (9, 2, E) (4, 4, W) (5, 5, S)', '(0, 0)'], boardClass=boardClass)
+    timeline = testGame.enableTimeline(Timeline(snapshotEvery=2))
+    testGame.shootShips([(9, 2), (1, 1), (9, 2), (4, 4), (0, 0)])
+
+    assert timeline.operationCount == 5
+    assert testGame.sunkenShips == [((9, 2), 'E'), ((4, 4), 'W'), ((0, 0), 'N')]
+    board, sunkenShips = testGame.stateAt(2)
+    assert sorted(board.occupiedCells()) == [((0, 0), 'N'), ((4, 4), 'W'), ((5, 5), 'S')]
+    assert sunkenShips == [((9, 2), 'E')]
+    board, sunkenShips = testGame.stateAt(4)
+    assert sorted(board.occupiedCells()) == [((0, 0), 'N'), ((5, 5), 'S')]
+    assert sunkenShips == [((9, 2), 'E'), ((4, 4), 'W')]
+    assert testGame.stateAt(5)[1] == testGame.sunkenShips
+
+
+@pytest.mark.parametrize('timelineFirst', [True, False])
+def test_timeline_with_instrumentation(timelineFirst):
+    testGame = ShipGame("tests/inputs/input.txt")
+    if timelineFirst:
+        timeline = testGame.enableTimeline()
+        instrumentation = testGame.enableInstrumentation()
+    else:
+        instrumentation = testGame.enableInstrumentation()
+        timeline = testGame.enableTimeline()
+    testGame.calculateGame()
+
+    assert timeline.operationCount == 2
+    assert (instrumentation.moveCount, instrumentation.shootCount) == (1, 1)
+
+    testGame.disableInstrumentation()
+    testGame.shootShips([(1, 3), (5, 5)])
+    assert timeline.operationCount == 4
+    assert instrumentation.shootCount == 1
+    assert sorted(testGame.stateAt(4)[0].occupiedCells()) == []
+
+    testGame.disableTimeline()
+    assert not {'moveShip', 'shootShip', 'shootShips'} & set(testGame.__dict__)
+
+
+def test_timeline_snapshot_budget():
+    lines = generateGame(12, 30, 400, moveLength=3, moveRatio=0.9, seed=2)
+
+    testGame = ShipGame(lines=lines)
+    timeline = testGame.enableTimeline(Timeline(snapshotEvery=4, snapshotBudget=300))
+    testGame.calculateGame()
+
+    assert timeline.snapshotCells <= 300
+    assert timeline.snapshotEvery > 4
+    assert all(operation % timeline.snapshotEvery == 0 for operation in timeline.snapshotOperations)
+    board, sunkenShips = testGame.stateAt(397)
+    assert (sorted(board.occupiedCells()), sunkenShips) == replayedState(lines, 397, testGame.boardClass)
+
+
+def test_timeline_switched_off():
+    testGame = ShipGame("tests/inputs/input.txt")
+    with pytest.raises(ValueError):
+        testGame.stateAt(0)
+
+    timeline = testGame.enableTimeline()
+    testGame.moveShip((0, 0), 'R')
+    assert testGame.disableTimeline() is timeline
+    assert 'moveShip' not in vars(testGame)
+    testGame.moveShip((0, 0), 'R')
+    assert timeline.operationCount == 1
@@ -0,0 +1,54 @@
+import pytest
+from shipGame.utils import (formatShipLocationInput, formatMoveCommandInput, formatShootCommandInput,
+                            tokenizeShipLocations, tokenizeCommand, isMoveCommand, isShootCommand)
+
+
+def test_tokenizeShipLocations_multi_digit():
+    assert tokenizeShipLocations('(0, 0, N) (9, 2, E) (1024, 999999, W)') == [((0, 0), 'N'),
+                                                                             ((9, 2), 'E'),
+                                                                             ((1024, 999999), 'W')]
+
+
+def test_tokenizeCommand_move_and_shoot():
+    assert tokenizeCommand('(0, 0) MRMLMM') == ((0, 0), 'MRMLMM')
+    assert tokenizeCommand('(12, 345) MM') == ((12, 345), 'MM')
+    assert tokenizeCommand('(9, 2)') == (9, 2)
+    assert tokenizeCommand('(90, 20)') == (90, 20)
+
+
+def test_tokenizeShipLocations_invalid_input():
+    assert tokenizeShipLocations('') == []
+    with pytest.raises(ValueError):
+        tokenizeShipLocations('(0, 0, N) (x, 2, E) (3, 3, NE)')
+    with pytest.raises(ValueError):
+        tokenizeShipLocations('(0, 0, N) (3, 3, NE)')
+
+
+@pytest.mark.parametrize('commandString', ['', 'invalid', '(0, 0) MM LL'])
+def test_tokenizeCommand_invalid_input(commandString):
+    with pytest.raises(ValueError):
+        tokenizeCommand(commandString)
+    assert not isMoveCommand(commandString)
+    assert not isShootCommand(commandString)
+
+
+def test_format_inputs_multi_digit():
+    assert formatShipLocationInput('(10, 22, S)') == ((10, 22), 'S')
+    assert formatMoveCommandInput('(10, 22) MRL') == ((10, 22), 'MRL')
+    assert formatShootCommandInput('(10, 22)') == (10, 22)
+
+    with pytest.raises(ValueError):
+        formatShootCommandInput('(10, 22) MRL')
+
+
+def test_command_classification():
+    assert isMoveCommand('(10, 22) MRL')
+    assert not isMoveCommand('(10, 22)')
+    assert isShootCommand('(10, 22)')
+    assert not isShootCommand('(10, 22) MRL')
+    assert isMoveCommand(((10, 22), 'MRL'))
+    assert isShootCommand((10, 22))
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,70 @@
+import random
+import pytest
+from shipGame.app import ShipGame
+from shipGame.fuzz import randomGame
+from shipGame.generator import generateGame
+
+numpy = pytest.importorskip('numpy')
+from shipGame.vectorized import BatchedGames
+
+
+def test_batchedGames_input_file():
+    batch = BatchedGames.fromLines([open('shipGame/tests/inputs/input.txt').read().splitlines()])
+    batch.run()
+    assert batch.outputLines(0) == ['(1, 3, N)', '(9, 2, E) SUNK']
+    assert batch.ships(0) == ([((1, 3), 'N')], [((9, 2), 'E')])
+
+
+def test_batchedGames_match_shipGame():
+    games = [generateGame(10, 6, 40, moveLength=seed % 4 + 1, moveRatio=0.7, hitRatio=0.3, seed=seed)
+             for seed in range(200)]
+    games[0] = games[0][:5]
+
+    batch = BatchedGames.fromLines(games)
+    assert (batch.gameCount, batch.shipCount, batch.stepCount) == (200, 6, 40)
+    batch.run()
+
+    for index, lines in enumerate(games):
+        testGame = ShipGame(lines=lines)
+        testGame.calculateGame()
+        assert batch.outputLines(index) == testGame.outputLines()
+        assert batch.outputLines(index, sortedOutput=True) == testGame.outputLines(sortedOutput=True)
+
+
+def test_batchedGames_quirks():
+    generator = random.Random(5)
+    games = [lines for lines in (randomGame(generator) for _ in range(200)) if lines[0] == '6']
+    batch = BatchedGames.fromLines(games)
+    batch.run()
+
+    for index, lines in enumerate(games):
+        try:
+            testGame = ShipGame(lines=lines)
+            testGame.calculateGame()
+        except ValueError:
+            with pytest.raises(ValueError):
+                batch.outputLines(index)
+            continue
+        assert batch.outputLines(index) == testGame.outputLines()
+
+
+def test_batchedGames_failures():
+    batch = BatchedGames.fromLines([['10', '(0, 0, N)', '(0, 0) M', '(5, 5) M', '(0, 1) M'],
+                                    ['10', '(0, 0, N)', '(0, 0) MXM'],
+                                    ['10', '(0, 0, S)', '(0, 0) M'],
+                                    ['10', '(0, 0, N)'],
+                                    ['10', '(0, 10, N)', '(0, 0)'],
+                                    ['10', '(0, 0, N)', '(10, 0)'],
+                                    ['10', '(0, 0, N)', '(0, 0) L'],
+                                    ['10']])
+    batch.run()
+
+    assert batch.failedAt.tolist() == [1, 0, 0, 0, 0, 0, -1, 0]
+    with pytest.raises(ValueError):
+        batch.outputLines(0)
+    assert batch.outputLines(6) == ['(0, 0, W)']
+
+
+def test_batchedGames_board_sizes():
+    with pytest.raises(ValueError):
+        BatchedGames.fromLines([['10', '(0, 0, N)', '(0, 0)'], ['5', '(0, 0, N)', '(0, 0)']])
@@ -0,0 +1,163 @@
+"""
+Time travel over a game's operations. Once attached, every move and shot is recorded as the cell
+changes it made, and the occupied cells are snapshotted every so many operations, so the board after
+any earlier operation can be rebuilt by replaying the changes since the nearest snapshot.
+"""
+from bisect import bisect_right
+from shipGame.moves import compileMoves
+
+SNAPSHOT_EVERY = 1000
+SNAPSHOT_BUDGET = 1000000
+
+
+class Timeline(object):
+    """
+    Records cell changes from a ShipGame's moveShip, shootShip and shootShips, with periodic snapshots.
+    Snapshots are limited to 'snapshotBudget' stored ship cells in total. When a new snapshot would go
+    over the budget every other snapshot is dropped and the interval between snapshots is doubled, so a
+    lookup never replays more than twice the current interval.
+    Like Instrumentation it shadows the game's methods on the instance, so it costs nothing once detached.
+    """
+
+    def __init__(self, snapshotEvery=SNAPSHOT_EVERY, snapshotBudget=SNAPSHOT_BUDGET):
+        if snapshotEvery < 1:
+            raise ValueError('Snapshots must be taken at least every operation.')
+        self.snapshotEvery = snapshotEvery
+        self.snapshotBudget = snapshotBudget
+        self.events = []
+        self.sunkenShips = []
+        self.snapshots = []
+        self.snapshotOperations = []
+        self.snapshotCells = 0
+        self.game = None
+
+    def attach(self, game):
+        """
+        Starts recording the game's operations, taking the current state as operation 0.
+        """
+        self.game = game
+        self.sunkenShips = list(game.sunkenShips)
+        self.snapshot()
+
+        def recordedMoveShip(moveShip):
+            def recorded(shipLocation, moveCommands):
+                direction = game.board.get(shipLocation, 0)
+                moved = moveShip(shipLocation, moveCommands)
+                changes = ()
+                if moved is not False:
+                    x, y, finalDirection, forward = compileMoves(direction, moveCommands)
+                    if forward:
+                        changes = ((shipLocation, 0), ((shipLocation[0] + x, shipLocation[1] + y), finalDirection))
+                    else:
+                        changes = ((shipLocation, finalDirection),)
+                self.record(changes, None)
+                return moved
+            return recorded
+
+        def recordedShootShip(shootShip):
+            def recorded(shipLocation):
+                sunkenShipCount = len(game.sunkenShips)
+                shootShip(shipLocation)
+                if len(game.sunkenShips) == sunkenShipCount:
+                    self.record((), None)
+                else:
+                    self.record(((shipLocation, 0),), game.sunkenShips[-1])
+            return recorded
+
+        def recordedShootShips(shootShips):
+            def recorded(shipLocations):
+                shipLocations = game.board.validateCoordinates(shipLocations)
+                sunkenShipCount = len(game.sunkenShips)
+                shootShips(shipLocations)
+                self.recordVolley(shipLocations, game.sunkenShips[sunkenShipCount:])
+            return recorded
+
+        game.shadowMethods(self, {'moveShip': recordedMoveShip, 'shootShip': recordedShootShip,
+                                  'shootShips': recordedShootShips})
+
+    def detach(self, game):
+        """
+        Removes the wrappers added by attach, leaving any other wrappers on the game in place.
+        What was recorded stays available.
+        """
+        game.unshadowMethods(self)
+
+    def record(self, changes, sunkenShip):
+        """
+        Appends one operation's cell changes and the ship it sank, if any, snapshotting when one is due.
+        """
+        self.events.append((changes, sunkenShip))
+        if sunkenShip is not None:
+            self.sunkenShips.append(sunkenShip)
+        if len(self.events) % self.snapshotEvery == 0:
+            self.snapshot()
+
+    def recordVolley(self, shipLocations, sunkenShips):
+        """
+        Records a volley that has already been fired as one operation per coordinate, where the first shot
+        at a cell sank the ship there, if any. A snapshot due partway through the volley is rebuilt from the
+        board after it by putting back the ships that the rest of the volley sank.
+        Example input: [(9, 2), (4, 4), (9, 2)], [((9, 2), 'E')]
+        """
+        remaining = {coordinates: (coordinates, direction) for coordinates, direction in sunkenShips}
+        events = []
+        for shipLocation in shipLocations:
+            sunkenShip = remaining.pop(shipLocation, None)
+            events.append((((shipLocation, 0),), sunkenShip) if sunkenShip is not None else ((), None))
+
+        for index, (changes, sunkenShip) in enumerate(events):
+            self.events.append((changes, sunkenShip))
+            if sunkenShip is not None:
+                self.sunkenShips.append(sunkenShip)
+            if len(self.events) % self.snapshotEvery == 0:
+                cells = dict(self.game.board.occupiedCells())
+                cells.update(ship for changes, ship in events[index + 1:] if ship is not None)
+                self.snapshot(cells)
+
+    def snapshot(self, cells=None):
+        """
+        Stores the occupied cells, by default the board's, and sunken ship count after the latest operation,
+        first thinning out the snapshots if storing this one would exceed the budget.
+        """
+        if cells is None:
+            cells = dict(self.game.board.occupiedCells())
+
+        while len(self.snapshots) > 1 and self.snapshotCells + len(cells) > self.snapshotBudget:
+            self.snapshots = self.snapshots[::2]
+            self.snapshotOperations = self.snapshotOperations[::2]
+            self.snapshotCells = sum(len(snapshotCells) for snapshotCells, sunkenShipCount in self.snapshots)
+            self.snapshotEvery *= 2
+
+        if len(self.events) % self.snapshotEvery == 0:
+            self.snapshots.append((cells, len(self.sunkenShips)))
+            self.snapshotOperations.append(len(self.events))
+            self.snapshotCells += len(cells)
+
+    @property
+    def operationCount(self):
+        return len(self.events)
+
+    def stateAt(self, operation):
+        """
+        Returns a new board and the list of sunken ships as they were after 'operation' operations,
+        where 0 is the state when recording started.
+        Example input: 2
+        Example output: (SparseBoard with {(1, 3): 'N'}, [((9, 2), 'E')])
+        """
+        if not 0 <= operation <= len(self.events):
+            raise IndexError('Operation %d has not been recorded.' % operation)
+
+        index = bisect_right(self.snapshotOperations, operation) - 1
+        cells, sunkenShipCount = self.snapshots[index]
+
+        board = self.game.initialiseBoard(self.game.board.size)
+        for coordinates, direction in cells.items():
+            board[coordinates] = direction
+
+        for changes, sunkenShip in self.events[self.snapshotOperations[index]:operation]:
+            for coordinates, direction in changes:
+                board[coordinates] = direction
+            if sunkenShip is not None:
+                sunkenShipCount += 1
+
+        return board, self.sunkenShips[:sunkenShipCount]
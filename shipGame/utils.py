@@ -1,3 +1,9 @@
+import re
+
+SHIP_LOCATION_PATTERN = re.compile(r'\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\w)\s*\)')
+SHIP_LOCATIONS_PATTERN = re.compile(r'\s*(?:%s\s*)*' % SHIP_LOCATION_PATTERN.pattern)
+COMMAND_PATTERN = re.compile(r'\s*\(\s*(\d+)\s*,\s*(\d+)\s*\)\s*(\S*)\s*$')
+
 
 def removeStringCharacters(string):
     """
@@ -24,8 +30,7 @@ def formatShipLocationOutput(coordinates, direction):
     Example input: (1, 3), 'N'
     Example output: '(1, 3, N)'
     """
-    charactersToRemove = str.maketrans("", "", "()")
-    return '(' + str(coordinates).translate(charactersToRemove) + ', ' + direction + ')'
+    return '(%s, %s, %s)' % (coordinates[0], coordinates[1], direction)
 
 
 def formatShipLocationInput(locationString):
@@ -35,10 +40,11 @@ def formatShipLocationInput(locationString):
     Example input: '(0, 0, N)'
     Example output: 0, 0, 'N'
     """
-    strippedShipLocationString = removeStringCharacters(locationString)
-    coordinates = int(strippedShipLocationString[0]), int(strippedShipLocationString[1])
-    direction = strippedShipLocationString[2]
-    return coordinates, direction
+    match = SHIP_LOCATION_PATTERN.match(locationString.strip())
+    if match is None:
+        raise ValueError("Invalid ship location. %s was given." % locationString)
+    x, y, direction = match.groups()
+    return (int(x), int(y)), direction
 
 
 def formatMoveCommandInput(moveCommandString):
@@ -48,10 +54,10 @@ def formatMoveCommandInput(moveCommandString):
     Example input: '(0, 0) MRMLMM'
     Example output: 0, 0, 'MRMLMM'
     """
-    strippedMoveCommandString = removeStringCharacters(moveCommandString)
-    coordinates = (int(strippedMoveCommandString[0]), int(strippedMoveCommandString[1]))
-    moveOperations = strippedMoveCommandString[2:]
-    return coordinates, moveOperations
+    command = tokenizeCommand(moveCommandString)
+    if not isMoveCommand(command):
+        raise ValueError("Invalid move command. %s was given." % moveCommandString)
+    return command
 
 
 def formatShootCommandInput(shootCommandString):
@@ -60,8 +66,41 @@ def formatShootCommandInput(shootCommandString):
     Example input: '(9, 2)'
     Example output: 9, 2
     """
-    strippedShootCommandString = removeStringCharacters(shootCommandString)
-    return int(strippedShootCommandString[0]), int(strippedShootCommandString[1])
+    command = tokenizeCommand(shootCommandString)
+    if not isShootCommand(command):
+        raise ValueError("Invalid shoot command. %s was given." % shootCommandString)
+    return command
+
+
+def tokenizeShipLocations(shipLocationsString):
+    """
+    Parses a string of ship locations in a single scan and returns a list of tuples each
+    containing a two integer tuple location and string direction. Coordinates can have any number of digits.
+    Raises a ValueError if any part of the string is not a ship location.
+    Example input: '(0, 0, N) (19, 12, E)'
+    Example output: [((0, 0), 'N'), ((19, 12), 'E')]
+    """
+    if SHIP_LOCATIONS_PATTERN.fullmatch(shipLocationsString) is None:
+        raise ValueError("Invalid ship locations. %s was given." % shipLocationsString)
+    return [((int(x), int(y)), direction) for x, y, direction in SHIP_LOCATION_PATTERN.findall(shipLocationsString)]
+
+
+def tokenizeCommand(commandString):
+    """
+    Parses and classifies a string of either a move or a shoot command in a single scan.
+    Coordinates can have any number of digits. Raises a ValueError if the string is neither.
+    Example input for move: '(10, 0) MRMLMM'
+    Example output for move: ((10, 0), 'MRMLMM')
+    Example input for shoot: '(9, 12)'
+    Example output for shoot: (9, 12)
+    """
+    match = COMMAND_PATTERN.match(commandString)
+    if match is None:
+        raise ValueError("Invalid command. %s was given." % commandString)
+    x, y, moveOperations = match.groups()
+    if moveOperations:
+        return (int(x), int(y)), moveOperations
+    return int(x), int(y)
 
 
 def isMoveCommand(command):
@@ -71,7 +110,12 @@ def isMoveCommand(command):
     Example output: True
     """
     if type(command) is str:
-        return len(command.split()) == 3
+        try:
+            return isMoveCommand(tokenizeCommand(command))
+        except ValueError:
+            return False
+    elif command is None:
+        return False
     else:
         return type(command[1]) is str
 
@@ -83,6 +127,11 @@ def isShootCommand(command):
     Example output: True
     """
     if type(command) is str:
-        return len(command.split()) == 2
+        try:
+            return isShootCommand(tokenizeCommand(command))
+        except ValueError:
+            return False
+    elif command is None:
+        return False
     else:
         return type(command[1]) is int
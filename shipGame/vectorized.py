@@ -0,0 +1,256 @@
+"""
+Lockstep simulation of many small games with the same board size, for Monte Carlo experiments where
+creating a ShipGame per game would dominate. The games are held as numpy struct-of-arrays data, and each
+step applies every game's next operation at once. Requires numpy.
+"""
+import numpy
+from shipGame.moves import COMPASS, compileMoves
+from shipGame.utils import (formatShipLocationOutput, isMoveCommand, isShootCommand, tokenizeCommand,
+                            tokenizeShipLocations)
+
+NONE, SHOOT, MOVE, INVALID_MOVE = 0, 1, 2, 3
+
+# World displacement for a ship facing each heading, from a displacement compiled facing north:
+# (x, y) = (ROTATE_XX[h] * dx + ROTATE_XY[h] * dy, ROTATE_YX[h] * dx + ROTATE_YY[h] * dy)
+ROTATE_XX = numpy.array([1, 0, -1, 0])
+ROTATE_XY = numpy.array([0, 1, 0, -1])
+ROTATE_YX = numpy.array([0, -1, 0, 1])
+ROTATE_YY = numpy.array([1, 0, -1, 0])
+
+
+class BatchedGames(object):
+    """
+    'gameCount' games on 'boardSize' x 'boardSize' boards, with up to 'shipCount' ships and 'stepCount'
+    operations each. Games with fewer ships or operations leave the rest unused.
+    Ships are columns of (game, ship) arrays: position, heading index into COMPASS, whether they are afloat,
+    the step they were last placed at (for the output order) and the step they sank at. Each game also has
+    a grid of ship number + 1 per cell, 0 when empty, so occupancy checks are a single indexed read.
+    Operations are (game, step) arrays of kind, coordinates, and for moves the displacement and turn compiled
+    facing north, along with whether the ship moves forward at all.
+    A game whose operation would make ShipGame raise stops at that step, which is recorded in 'failedAt'.
+    """
+
+    def __init__(self, boardSize, gameCount, shipCount, stepCount):
+        self.boardSize = boardSize
+        self.gameCount = gameCount
+        self.shipCount = shipCount
+        self.stepCount = stepCount
+
+        ships = (gameCount, shipCount)
+        self.shipX = numpy.zeros(ships, numpy.int64)
+        self.shipY = numpy.zeros(ships, numpy.int64)
+        self.heading = numpy.zeros(ships, numpy.int8)
+        self.afloat = numpy.zeros(ships, bool)
+        self.placedAt = numpy.zeros(ships, numpy.int64)
+        self.sunkAt = numpy.full(ships, -1, numpy.int64)
+        self.grid = numpy.zeros((gameCount, boardSize, boardSize), numpy.int32)
+
+        steps = (gameCount, stepCount)
+        self.kind = numpy.zeros(steps, numpy.int8)
+        self.operationX = numpy.zeros(steps, numpy.int64)
+        self.operationY = numpy.zeros(steps, numpy.int64)
+        self.moveX = numpy.zeros(steps, numpy.int64)
+        self.moveY = numpy.zeros(steps, numpy.int64)
+        self.turn = numpy.zeros(steps, numpy.int8)
+        self.moved = numpy.zeros(steps, bool)
+
+        self.failedAt = numpy.full(gameCount, -1, numpy.int64)
+        self.step = 0
+
+    @classmethod
+    def fromGames(cls, games):
+        """
+        Creates a batch from dictionaries of game parameters, as returned by ShipGame.assignGameParameters,
+        which must all have the same board size. Ships are placed as ShipGame places them: the first ship
+        on a cell is kept and ships with an unknown direction are left out. Games that ShipGame could not
+        initialise or calculate, with a ship off the board or no operations, are marked as failed at step 0.
+        Example input: [{'boardSize': 10, 'shipLocations': [((0, 0), 'N'), ((9, 2), 'E')],
+                         'movingAndShootingCommands': [((0, 0), 'MRMLMM'), (9, 2)]}, ...]
+        Example output: BatchedGames with 'boardSize' 10 and one game per dictionary
+        """
+        sizes = {game['boardSize'] for game in games}
+        if len(sizes) > 1:
+            raise ValueError('Every game in a batch must have the same board size, not %s.' % sorted(sizes))
+
+        size = sizes.pop() if sizes else 0
+        placements = []
+        for game in games:
+            ships = {}
+            for (x, y), direction in game['shipLocations']:
+                if not (0 <= x < size and 0 <= y < size):
+                    ships = None
+                    break
+                if (x, y) not in ships and direction in COMPASS:
+                    ships[(x, y)] = direction
+            placements.append(ships)
+
+        batch = cls(size, len(games), max((len(ships) for ships in placements if ships), default=0),
+                    max((len(game.get('movingAndShootingCommands', ())) for game in games), default=0))
+
+        shipRows = []
+        operationRows = []
+        for index, (game, ships) in enumerate(zip(games, placements)):
+            if ships is None or not game.get('movingAndShootingCommands'):
+                batch.failedAt[index] = 0
+                continue
+            shipRows.extend((index, ship, x, y, COMPASS.index(direction), ship - len(ships))
+                            for ship, ((x, y), direction) in enumerate(ships.items()))
+
+            for step, command in enumerate(game['movingAndShootingCommands']):
+                if isMoveCommand(command):
+                    (x, y), moveCommands = command
+                    if not moveCommands or moveCommands.strip('MRL'):
+                        operationRows.append((index, step, INVALID_MOVE, x, y, 0, 0, 0, False))
+                    else:
+                        moveX, moveY, direction, moved = compileMoves('N', moveCommands)
+                        operationRows.append((index, step, MOVE, x, y, moveX, moveY, COMPASS.index(direction), moved))
+                elif isShootCommand(command):
+                    operationRows.append((index, step, SHOOT, command[0], command[1], 0, 0, 0, False))
+
+        games, ships, x, y, heading, placedAt = numpy.array(shipRows, numpy.int64).reshape(-1, 6).T
+        batch.shipX[games, ships], batch.shipY[games, ships] = x, y
+        batch.heading[games, ships] = heading
+        batch.afloat[games, ships] = True
+        batch.placedAt[games, ships] = placedAt
+        batch.grid[games, x, y] = ships + 1
+
+        games, steps, kind, x, y, moveX, moveY, turn, moved = numpy.array(operationRows, numpy.int64).reshape(-1, 9).T
+        batch.kind[games, steps] = kind
+        batch.operationX[games, steps], batch.operationY[games, steps] = x, y
+        batch.moveX[games, steps], batch.moveY[games, steps] = moveX, moveY
+        batch.turn[games, steps] = turn
+        batch.moved[games, steps] = moved
+
+        return batch
+
+    @classmethod
+    def fromLines(cls, gamesLines):
+        """
+        Creates a batch from the lines of each game's input file. A game that ShipGame would not load, with
+        no ship line or a line that cannot be parsed, is marked as failed at step 0.
+        Example input: [['10', '(0, 0, N) (9, 2, E)', '(0, 0) MRMLMM', '(9, 2)'], ...]
+        """
+        games = []
+        for lines in gamesLines:
+            lines = iter(lines)
+            boardSize = int(next(lines))
+            shipLine = next(lines, None)
+            try:
+                if shipLine is not None:
+                    games.append({'boardSize': boardSize,
+                                  'shipLocations': tokenizeShipLocations(shipLine),
+                                  'movingAndShootingCommands': [tokenizeCommand(line) for line in lines]})
+                    continue
+            except ValueError:
+                pass
+            games.append({'boardSize': boardSize, 'shipLocations': []})
+        return cls.fromGames(games)
+
+    def fail(self, games):
+        self.failedAt[games] = self.step
+
+    def inBounds(self, x, y):
+        return (x >= 0) & (x < self.boardSize) & (y >= 0) & (y < self.boardSize)
+
+    def runStep(self):
+        """
+        Applies every running game's operation for the next step.
+        """
+        step = self.step
+        running = self.failedAt < 0
+        kind = self.kind[:, step]
+
+        games = numpy.flatnonzero(running & (kind == INVALID_MOVE))
+        self.fail(games)
+
+        games = numpy.flatnonzero(running & (kind == SHOOT))
+        x, y = self.operationX[games, step], self.operationY[games, step]
+        inBounds = self.inBounds(x, y)
+        self.fail(games[~inBounds])
+        games, x, y = games[inBounds], x[inBounds], y[inBounds]
+        ship = self.grid[games, x, y] - 1
+        hit = ship >= 0
+        games, x, y, ship = games[hit], x[hit], y[hit], ship[hit]
+        self.afloat[games, ship] = False
+        self.sunkAt[games, ship] = step
+        self.grid[games, x, y] = 0
+
+        games = numpy.flatnonzero(running & (kind == MOVE))
+        x, y = self.operationX[games, step], self.operationY[games, step]
+        inBounds = self.inBounds(x, y)
+        self.fail(games[~inBounds])
+        games, x, y = games[inBounds], x[inBounds], y[inBounds]
+        ship = self.grid[games, x, y] - 1
+        exists = ship >= 0
+        self.fail(games[~exists])
+        games, x, y, ship = games[exists], x[exists], y[exists], ship[exists]
+
+        heading = self.heading[games, ship]
+        moveX, moveY = self.moveX[games, step], self.moveY[games, step]
+        finalHeading = (heading + self.turn[games, step]) % 4
+        moved = self.moved[games, step]
+
+        turned = ~moved
+        self.heading[games[turned], ship[turned]] = finalHeading[turned]
+
+        games, x, y, ship, heading, moveX, moveY, finalHeading = (
+            values[moved] for values in (games, x, y, ship, heading, moveX, moveY, finalHeading))
+        destinationX = x + ROTATE_XX[heading] * moveX + ROTATE_XY[heading] * moveY
+        destinationY = y + ROTATE_YX[heading] * moveX + ROTATE_YY[heading] * moveY
+        inBounds = self.inBounds(destinationX, destinationY)
+        self.fail(games[~inBounds])
+        games, x, y, ship, finalHeading, destinationX, destinationY = (
+            values[inBounds] for values in (games, x, y, ship, finalHeading, destinationX, destinationY))
+
+        empty = self.grid[games, destinationX, destinationY] == 0
+        games, x, y, ship, finalHeading, destinationX, destinationY = (
+            values[empty] for values in (games, x, y, ship, finalHeading, destinationX, destinationY))
+        self.grid[games, x, y] = 0
+        self.grid[games, destinationX, destinationY] = ship + 1
+        self.shipX[games, ship], self.shipY[games, ship] = destinationX, destinationY
+        self.heading[games, ship] = finalHeading
+        self.placedAt[games, ship] = step
+
+        self.step += 1
+
+    def run(self):
+        """
+        Applies every remaining step to every game.
+        """
+        while self.step < self.stepCount:
+            self.runStep()
+
+    def ships(self, game):
+        """
+        Returns a game's ships afloat, in the order they were last placed, and its sunken ships, in the order
+        they sank, as ShipGame's default board and sunkenShips would list them.
+        Raises a ValueError for a game that stopped at an operation ShipGame would raise on.
+        Example input: 0
+        Example output: ([((1, 3), 'N')], [((9, 2), 'E')])
+        """
+        if self.failedAt[game] >= 0:
+            raise ValueError('Game %d failed at operation %d.' % (game, self.failedAt[game]))
+
+        def located(ships, order):
+            return [((int(self.shipX[game, ship]), int(self.shipY[game, ship])), COMPASS[self.heading[game, ship]])
+                    for ship in ships[numpy.argsort(order[game, ships], kind='stable')]]
+
+        return (located(numpy.flatnonzero(self.afloat[game]), self.placedAt),
+                located(numpy.flatnonzero(self.sunkAt[game] >= 0), self.sunkAt))
+
+    def outputLines(self, game, sortedOutput=False):
+        """
+        Returns a game's output lines exactly as ShipGame.outputLines would.
+        Example input: 0
+        Example output: ['(1, 3, N)', '(9, 2, E) SUNK']
+        """
+        ships, sunkenShips = self.ships(game)
+        ships = sorted(ships)
+
+        if sortedOutput:
+            sunkenShips = sorted(sunkenShips)
+
+        lines = [formatShipLocationOutput(coordinates, direction) for coordinates, direction in ships]
+        lines.extend(formatShipLocationOutput(coordinates, direction) + ' SUNK'
+                     for coordinates, direction in sunkenShips)
+        return lines